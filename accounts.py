@@ -0,0 +1,245 @@
+import argparse
+import hashlib
+import hmac
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+from db import Database
+
+SIGNUP_BONUS = 150
+PBKDF2_ITERATIONS = 200_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    name TEXT NOT NULL,
+    phone TEXT NOT NULL DEFAULT '',
+    address TEXT NOT NULL DEFAULT '',
+    password_hash TEXT NOT NULL,
+    join_date TEXT NOT NULL,
+    points INTEGER NOT NULL DEFAULT 0 CHECK (points >= 0)
+);
+
+CREATE TABLE IF NOT EXISTS points_ledger (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    delta INTEGER NOT NULL,
+    balance INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_points_ledger_user ON points_ledger(user_id, id);
+CREATE INDEX IF NOT EXISTS idx_points_ledger_reason ON points_ledger(reason);
+
+-- Users who may run the admin pages; a table of its own so existing databases pick it up
+CREATE TABLE IF NOT EXISTS admins (
+    user_id INTEGER PRIMARY KEY REFERENCES users(id),
+    granted_at TEXT NOT NULL
+);
+"""
+
+PROFILE_FIELDS = ('name', 'email', 'phone', 'address')
+
+
+class AccountError(Exception):
+    pass
+
+
+class InsufficientPoints(AccountError):
+    pass
+
+
+class NotAuthorized(AccountError):
+    pass
+
+
+def hash_password(password, salt=None):
+    salt = salt or os.urandom(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, PBKDF2_ITERATIONS)
+    return f"{salt.hex()}${digest.hex()}"
+
+
+def verify_password(password, stored):
+    salt, _, _ = stored.partition('$')
+    return hmac.compare_digest(hash_password(password, bytes.fromhex(salt)), stored)
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class AccountStore:
+    def __init__(self, db=None):
+        self.db = db or Database()
+        self.db.ensure_schema(SCHEMA)
+
+    def register(self, name, email, phone, address, password):
+        try:
+            with self.db.transaction() as conn:
+                cur = conn.execute(
+                    "INSERT INTO users (email, name, phone, address, password_hash, join_date) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (email.strip(), name, phone, address, hash_password(password),
+                     datetime.now().strftime('%Y-%m-%d')),
+                )
+                self._apply(conn, cur.lastrowid, SIGNUP_BONUS, "Welcome bonus")
+                return cur.lastrowid
+        except sqlite3.IntegrityError:
+            raise AccountError("An account with this email already exists") from None
+
+    def authenticate(self, email, password):
+        with self.db.connection() as conn:
+            row = conn.execute("SELECT * FROM users WHERE email = ?", (email.strip(),)).fetchone()
+        if row is None or not verify_password(password, row['password_hash']):
+            return None
+        return self._user(row)
+
+    def get_user(self, user_id):
+        with self.db.connection() as conn:
+            row = conn.execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
+        return self._user(row) if row else None
+
+    def is_admin(self, user_id):
+        with self.db.connection() as conn:
+            return conn.execute("SELECT 1 FROM admins WHERE user_id = ?", (user_id,)).fetchone() is not None
+
+    def require_admin(self, user_id):
+        if not self.is_admin(user_id):
+            raise NotAuthorized("Only administrators can do this")
+
+    def set_admin(self, email, admin=True):
+        # Grants or revokes admin rights; returns the user's id
+        with self.db.transaction() as conn:
+            row = conn.execute("SELECT id FROM users WHERE email = ?", (email.strip(),)).fetchone()
+            if row is None:
+                raise AccountError(f"No account with email {email}")
+            if admin:
+                conn.execute("INSERT OR IGNORE INTO admins (user_id, granted_at) VALUES (?, ?)", (row['id'], _now()))
+            else:
+                conn.execute("DELETE FROM admins WHERE user_id = ?", (row['id'],))
+        return row['id']
+
+    def update_profile(self, user_id, **fields):
+        fields = {k: v for k, v in fields.items() if k in PROFILE_FIELDS}
+        if not fields:
+            return
+        assignments = ", ".join(f"{k} = ?" for k in fields)
+        try:
+            with self.db.transaction() as conn:
+                conn.execute(f"UPDATE users SET {assignments} WHERE id = ?", (*fields.values(), user_id))
+        except sqlite3.IntegrityError:
+            raise AccountError("An account with this email already exists") from None
+
+    def balance(self, user_id):
+        with self.db.connection() as conn:
+            row = conn.execute("SELECT points FROM users WHERE id = ?", (user_id,)).fetchone()
+        return row['points'] if row else 0
+
+    def add_points(self, user_id, delta, reason):
+        with self.db.transaction() as conn:
+            return self._apply(conn, user_id, delta, reason)
+
+    def redeem(self, user_id, cost, reason):
+        # The conditional UPDATE makes the balance check and debit one atomic step
+        with self.db.transaction() as conn:
+            cur = conn.execute(
+                "UPDATE users SET points = points - ? WHERE id = ? AND points >= ?", (cost, user_id, cost)
+            )
+            if cur.rowcount == 0:
+                raise InsufficientPoints("Not enough points!")
+            return self._record(conn, user_id, -cost, reason)
+
+    def ledger(self, user_id, limit=20):
+        with self.db.connection() as conn:
+            rows = conn.execute(
+                "SELECT delta, balance, reason, created_at FROM points_ledger "
+                "WHERE user_id = ? ORDER BY id DESC LIMIT ?", (user_id, limit)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def user_counts(self, since_date):
+        # (all users, users who joined on or after ``since_date``)
+        with self.db.connection() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(join_date >= ?), 0) FROM users", (since_date,)
+            ).fetchone()
+        return row[0], row[1]
+
+    def ledger_counts(self, patterns):
+        # {pattern: ledger entries whose reason matches it}; patterns are GLOBs such as 'Redeemed *'
+        with self.db.connection() as conn:
+            return {pattern: conn.execute("SELECT COUNT(*) FROM points_ledger WHERE reason GLOB ?",
+                                          (pattern,)).fetchone()[0]
+                    for pattern in patterns}
+
+    def balances_since(self, ledger_id):
+        # (newest ledger id, {user_id: balance}) for users whose balance changed
+        # after ``ledger_id``; 0 returns every user's balance
+        with self.db.connection() as conn:
+            # One read transaction so the id and the balances are the same snapshot
+            conn.execute("BEGIN")
+            try:
+                last = conn.execute("SELECT COALESCE(MAX(id), 0) FROM points_ledger").fetchone()[0]
+                if ledger_id == 0:
+                    rows = conn.execute("SELECT id, points FROM users").fetchall()
+                else:
+                    rows = conn.execute(
+                        "SELECT user_id, balance FROM points_ledger WHERE id > ? AND id <= ? ORDER BY id",
+                        (ledger_id, last),
+                    ).fetchall()
+            finally:
+                conn.execute("COMMIT")
+        return last, {user_id: balance for user_id, balance in rows}
+
+    def addresses(self):
+        # {user_id: address} for every user
+        with self.db.connection() as conn:
+            return dict(conn.execute("SELECT id, address FROM users").fetchall())
+
+    def display_names(self, user_ids):
+        user_ids = list(user_ids)
+        if not user_ids:
+            return {}
+        placeholders = ", ".join("?" * len(user_ids))
+        with self.db.connection() as conn:
+            rows = conn.execute(f"SELECT id, name FROM users WHERE id IN ({placeholders})", user_ids).fetchall()
+        return {row['id']: row['name'] for row in rows}
+
+    def _apply(self, conn, user_id, delta, reason):
+        conn.execute("UPDATE users SET points = points + ? WHERE id = ?", (delta, user_id))
+        return self._record(conn, user_id, delta, reason)
+
+    def _record(self, conn, user_id, delta, reason):
+        balance = conn.execute("SELECT points FROM users WHERE id = ?", (user_id,)).fetchone()['points']
+        conn.execute(
+            "INSERT INTO points_ledger (user_id, delta, balance, reason, created_at) VALUES (?, ?, ?, ?, ?)",
+            (user_id, delta, balance, reason, _now()),
+        )
+        return balance
+
+    @staticmethod
+    def _user(row):
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'email': row['email'],
+            'phone': row['phone'],
+            'address': row['address'],
+            'join_date': row['join_date'],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grant or revoke admin rights")
+    parser.add_argument('action', choices=['grant-admin', 'revoke-admin'])
+    parser.add_argument('email')
+    args = parser.parse_args()
+    user_id = AccountStore().set_admin(args.email, admin=args.action == 'grant-admin')
+    print(f"{args.email} (user {user_id}): {'granted' if args.action == 'grant-admin' else 'revoked'}")
+
+
+if __name__ == '__main__':
+    main()
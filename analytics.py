@@ -0,0 +1,116 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from db import Database
+
+WASTE_TYPES = ['Organic', 'Recyclable', 'Hazardous']
+
+# Rollup grain -> strftime pattern of the bucket start (UTC)
+ROLLUPS = {
+    'hourly': '%Y-%m-%d %H:00',
+    'daily': '%Y-%m-%d',
+    'monthly': '%Y-%m',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS collections (
+    id INTEGER PRIMARY KEY,
+    collected_at INTEGER NOT NULL,
+    ward TEXT NOT NULL,
+    waste_type TEXT NOT NULL,
+    weight_kg REAL NOT NULL,
+    truck_id TEXT NOT NULL DEFAULT ''
+);
+""" + "".join(f"""
+CREATE TABLE IF NOT EXISTS rollup_{grain} (
+    bucket TEXT NOT NULL,
+    ward TEXT NOT NULL,
+    waste_type TEXT NOT NULL,
+    weight_kg REAL NOT NULL,
+    collections INTEGER NOT NULL,
+    PRIMARY KEY (bucket, ward, waste_type)
+) WITHOUT ROWID;
+""" for grain in ROLLUPS)
+
+
+class CollectionAnalytics:
+    """Collection records with hourly, daily and monthly rollups.
+
+    Every insert batch is pre-aggregated in pandas and upserted into the
+    rollup tables in the same transaction as the raw rows, so dashboards
+    read a few hundred rollup rows instead of scanning raw records.
+    """
+
+    def __init__(self, db=None):
+        self.db = db or Database()
+        self.db.ensure_schema(SCHEMA)
+
+    def is_empty(self):
+        with self.db.connection() as conn:
+            return conn.execute("SELECT 1 FROM collections LIMIT 1").fetchone() is None
+
+    def record(self, records):
+        # records: DataFrame with collected_at (datetime or epoch seconds),
+        # ward, waste_type, weight_kg and optionally truck_id
+        records = pd.DataFrame(records)
+        if records.empty:
+            return 0
+        when = pd.to_datetime(records['collected_at'], utc=True,
+                              unit='s' if pd.api.types.is_numeric_dtype(records['collected_at']) else None)
+        records = records.assign(collected_at=when.astype('int64') // 10 ** 9)
+        if 'truck_id' not in records:
+            records['truck_id'] = ''
+
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO collections (collected_at, ward, waste_type, weight_kg, truck_id) VALUES (?, ?, ?, ?, ?)",
+                records[['collected_at', 'ward', 'waste_type', 'weight_kg', 'truck_id']].itertuples(index=False, name=None),
+            )
+            for grain, pattern in ROLLUPS.items():
+                grouped = (records.assign(bucket=when.dt.strftime(pattern).to_numpy())
+                           .groupby(['bucket', 'ward', 'waste_type'])['weight_kg']
+                           .agg(['sum', 'count']).reset_index())
+                conn.executemany(
+                    f"INSERT INTO rollup_{grain} (bucket, ward, waste_type, weight_kg, collections) "
+                    "VALUES (?, ?, ?, ?, ?) ON CONFLICT (bucket, ward, waste_type) DO UPDATE SET "
+                    "weight_kg = weight_kg + excluded.weight_kg, collections = collections + excluded.collections",
+                    ((b, w, t, float(s), int(c)) for b, w, t, s, c in grouped.itertuples(index=False, name=None)),
+                )
+        return len(records)
+
+    def rollup(self, grain, start=None, end=None, ward=None):
+        """Rollup rows for buckets in [start, end] (datetimes or bucket strings)."""
+        pattern = ROLLUPS[grain]
+        clauses, params = [], []
+        for op, bound in (('>=', start), ('<=', end)):
+            if bound is not None:
+                clauses.append(f"bucket {op} ?")
+                params.append(bound if isinstance(bound, str) else bound.strftime(pattern))
+        if ward is not None:
+            clauses.append("ward = ?")
+            params.append(ward)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.db.connection() as conn:
+            rows = conn.execute(
+                f"SELECT bucket, ward, waste_type, weight_kg, collections FROM rollup_{grain} {where} ORDER BY bucket",
+                params,
+            ).fetchall()
+        return pd.DataFrame([tuple(r) for r in rows],
+                            columns=['Bucket', 'Ward', 'Waste_Type', 'Weight_kg', 'Collections'])
+
+    def totals_by_type(self, grain, start=None, end=None):
+        # Bucket x waste type weights, in kg
+        frame = self.rollup(grain, start, end)
+        table = frame.pivot_table(index='Bucket', columns='Waste_Type', values='Weight_kg', aggfunc='sum', fill_value=0.0)
+        return table.reindex(columns=WASTE_TYPES, fill_value=0.0)
+
+    def day_summary(self, day=None):
+        # (total kg, recyclable share) for one UTC day
+        day = day or datetime.now(timezone.utc)
+        by_type = self.totals_by_type('daily', day, day)
+        if by_type.empty:
+            return 0.0, 0.0
+        totals = by_type.iloc[0]
+        total = float(totals.sum())
+        return total, (float(totals['Recyclable']) / total if total else 0.0)
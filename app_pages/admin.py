@@ -0,0 +1,103 @@
+import streamlit as st
+
+import data_layer
+from metrics import timed
+from resources import get_accounts
+from tickets import PRIORITIES, STATUSES
+
+
+def admin_panel():
+    st.markdown("## 👨‍💼 Admin Dashboard")
+    # The menu only lists this page for admins; a bookmarked URL still lands here
+    if not get_accounts().is_admin(st.session_state.user_data['id']):
+        st.error("This page is only available to administrators.")
+        return
+
+    # Admin metrics
+    col1, col2, col3, col4 = st.columns(4)
+
+    metrics = data_layer.load_admin_metrics()
+    with col1:
+        st.metric("👥 Total Users", f"{metrics['users']:,}", f"+{metrics['new_users']} today")
+    with col2:
+        st.metric("🚛 Active Trucks", len(data_layer.get_fleet()))
+    with col3:
+        st.metric("🗑️ Waste Collected (Today)", f"{metrics['waste_today_kg'] / 1000:,.1f} tons",
+                  f"{metrics['waste_change']:+.0%} vs yesterday")
+    with col4:
+        st.metric("♻️ Recycling Rate", f"{metrics['recycling_rate']:.0%}",
+                  f"{metrics['recycling_rate_change'] * 100:+.0f} pts")
+
+    # Charts
+    st.markdown("### 📊 Analytics")
+
+    # Waste collection trend
+    chart_range = st.selectbox("Chart Range", list(data_layer.CHART_RANGES), index=1)
+    st.plotly_chart(data_layer.waste_figure(data_layer.CHART_RANGES[chart_range]), use_container_width=True)
+
+    # Ward breakdown
+    st.plotly_chart(data_layer.ward_figure(), use_container_width=True)
+
+    # User engagement
+    st.plotly_chart(data_layer.engagement_figure(), use_container_width=True)
+
+    # Service tickets
+    st.markdown("### 📋 Service Tickets")
+    ticket_queue()
+
+
+@st.fragment
+@timed('fragment')
+def ticket_queue():
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        status = st.selectbox("Status", list(STATUSES), format_func=STATUSES.get)
+    with col2:
+        ward = st.selectbox("Ward", ["All"] + data_layer.get_schedule().wards)
+    with col3:
+        priority = st.selectbox("Priority", ["All"] + list(PRIORITIES), format_func=lambda p: PRIORITIES.get(p, p))
+    ward = None if ward == "All" else ward
+    priority = None if priority == "All" else priority
+
+    counts = data_layer.get_tickets().active_counts(ward)
+    for col, (name, count) in zip(st.columns(len(counts)), counts.items()):
+        col.metric(STATUSES[name], count)
+
+    # Cursors of the pages seen so far, restarted whenever the filters change
+    filters = (status, ward, priority)
+    if st.session_state.get('ticket_filters') != filters:
+        st.session_state.ticket_filters = filters
+        st.session_state.ticket_cursors = [None]
+    cursors = st.session_state.ticket_cursors
+
+    page, next_cursor = data_layer.load_ticket_page(status, ward, priority, cursors[-1])
+    st.dataframe(page, use_container_width=True, hide_index=True)
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("← Previous", disabled=len(cursors) == 1, use_container_width=True):
+            cursors.pop()
+            st.rerun(scope="fragment")
+    with col2:
+        st.caption(f"Page {len(cursors)}")
+    with col3:
+        if st.button("Next →", disabled=next_cursor is None, use_container_width=True):
+            cursors.append(next_cursor)
+            st.rerun(scope="fragment")
+
+    if page.empty:
+        return
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        ticket_id = st.selectbox("Ticket", page['Ticket'].tolist(), format_func=lambda t: f"#{t}")
+    with col2:
+        new_status = st.selectbox("New Status", [s for s in STATUSES if s != status], format_func=STATUSES.get)
+    with col3:
+        st.write("")
+        if st.button("Update Ticket", use_container_width=True):
+            data_layer.update_ticket(ticket_id, new_status, st.session_state.user_data['id'])
+            st.rerun(scope="fragment")
+
+
+if __name__ == "__main__":
+    admin_panel()
@@ -0,0 +1,118 @@
+from io import BytesIO
+
+import pandas as pd
+import streamlit as st
+
+import data_layer
+from classifier import RECYCLING_TIPS, ClassifierUnavailable, bulk_items, classify_stream
+from thumbnails import DISPLAY_SIZE, MODEL_SIZE
+from resources import get_jobs
+from ui import award_points, get_text, job_status, session_data, upload_thumbnail
+
+# Latest bulk predictions, kept on disk per session rather than in session_state
+BULK_RESULTS_BLOB = 'bulk_predictions.csv'
+# A single image usually classifies within this, so its result shows without a polling round trip
+CLASSIFY_WAIT_SECONDS = 0.3
+
+
+def ai_sorting_page():
+    st.markdown(f"## 🤖 {get_text('ai_sorting')}")
+
+    tab1, tab2 = st.tabs(["📸 Single Image", "🗂️ Bulk Upload"])
+
+    with tab1:
+        single_image_classification()
+
+    with tab2:
+        bulk_classification()
+
+
+def single_image_classification():
+    st.markdown("### 📸 Upload Waste Image for AI Classification")
+
+    uploaded_file = st.file_uploader("Choose an image...", type=['jpg', 'jpeg', 'png'])
+
+    if uploaded_file is not None:
+        st.image(upload_thumbnail(uploaded_file, DISPLAY_SIZE), caption="Uploaded Image", use_column_width=True)
+
+        if st.button("🔍 Classify Waste"):
+            try:
+                classifier = data_layer.get_classifier()
+            except ClassifierUnavailable as e:
+                st.error(f"AI classification is unavailable: {e}")
+                return
+
+            # Classify the model-resolution variant rather than the full upload
+            with open(upload_thumbnail(uploaded_file, MODEL_SIZE), 'rb') as f:
+                st.session_state.classify_job = get_jobs().submit(classifier.classify, f.read())
+
+    status = job_status('classify_job', "AI is analyzing your image...", wait=CLASSIFY_WAIT_SECONDS)
+    if status is None or status['state'] == 'pending':
+        return
+    if status['state'] == 'failed':
+        st.error(f"Classification failed: {status['error']}")
+        return
+
+    predicted_type, confidence, _ = status['result']
+    st.success(f"🎯 Prediction: **{predicted_type}**")
+    st.info(f"Confidence: {confidence:.2%}")
+
+    st.markdown(f"### 💡 Recycling Tip")
+    st.info(RECYCLING_TIPS.get(predicted_type, "Follow local recycling guidelines."))
+
+    # Award points
+    award_points(5, "AI sorting")
+    st.success("🏆 You earned 5 points for using AI sorting!")
+
+
+def bulk_classification():
+    st.markdown("### 🗂️ Classify Photos in Bulk")
+    st.write("Upload many photos at once, or zip archives of photos from collection points.")
+
+    uploaded_files = st.file_uploader("Choose images or zip archives...", type=['jpg', 'jpeg', 'png', 'zip'],
+                                      accept_multiple_files=True, key="bulk_upload")
+
+    if uploaded_files and st.button("🔍 Classify All"):
+        try:
+            classifier = data_layer.get_classifier()
+        except ClassifierUnavailable as e:
+            st.error(f"AI classification is unavailable: {e}")
+            return
+
+        st.session_state.bulk_job = get_jobs().submit(classify_uploads, classifier, uploaded_files, session_data(),
+                                                      report_progress=True)
+
+    status = job_status('bulk_job', "Classifying images...")
+    if status is not None and status['state'] == 'pending':
+        return
+    if status is not None and status['state'] == 'failed':
+        st.error(f"Bulk classification failed: {status['error']}")
+
+    # Read back on every rerun so the results survive the download click
+    csv = session_data().get_blob(BULK_RESULTS_BLOB)
+    if csv is None:
+        return
+    results = pd.read_csv(BytesIO(csv), keep_default_na=False)
+    failed = int((results['Error'] != '').sum())
+    st.success(f"Classified {len(results) - failed} images" + (f", {failed} could not be read" if failed else ""))
+    st.dataframe(results['Prediction'].value_counts().rename_axis('Waste Type').reset_index(name='Images'),
+                 use_container_width=True, hide_index=True)
+    st.download_button("⬇️ Download Predictions (CSV)", csv, file_name="waste_predictions.csv", mime="text/csv")
+
+
+def classify_uploads(classifier, uploaded_files, store, progress):
+    # Runs as a background job; results go to the session's blob store rather than session_state
+    total, items = bulk_items(uploaded_files)
+    progress(0.0, f"Classifying 0 of {total} images...")
+    rows = []
+    for done, (name, label, confidence, error) in enumerate(classify_stream(classifier, items), start=1):
+        rows.append((name, label, confidence, error))
+        progress(done / max(total, 1), f"Classifying {done} of {total} images...")
+
+    results = pd.DataFrame(rows, columns=['File', 'Prediction', 'Confidence', 'Error'])
+    store.put_blob(BULK_RESULTS_BLOB, results.to_csv(index=False).encode('utf-8'))
+    return total
+
+
+if __name__ == "__main__":
+    ai_sorting_page()
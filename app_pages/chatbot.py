@@ -0,0 +1,49 @@
+import streamlit as st
+
+from data_layer import describe_pickup, get_intent_engine, user_next_pickup
+from metrics import timed
+from ui import get_text, session_data
+
+
+def chatbot_page():
+    st.markdown(f"## 🤖 {get_text('chatbot')}")
+
+    st.markdown("""
+    <div class="chatbot-container">
+        <h3>🤖 WasteBot Assistant</h3>
+        <p>Hello! I'm here to help you with waste management queries.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    chat_panel()
+
+
+@st.fragment
+@timed('fragment')
+def chat_panel():
+    # Chat history is kept per session outside session_state and capped
+    chat = session_data()
+
+    # Display chat history
+    for message in chat.items('chat_history'):
+        if message['role'] == 'user':
+            st.markdown(f"**You:** {message['content']}")
+        else:
+            st.markdown(f"**🤖 WasteBot:** {message['content']}")
+
+    # Chat input
+    user_input = st.text_input("Ask me anything about waste management:")
+
+    if st.button("Send") and user_input:
+        chat.append('chat_history', {"role": "user", "content": user_input})
+
+        ward, pickup = user_next_pickup(st.session_state.user_data.get('address', ''))
+        response = get_intent_engine().answer(user_input, st.session_state.language,
+                                              points=st.session_state.user_points,
+                                              ward=ward or "-", next_pickup=describe_pickup(pickup))
+        chat.append('chat_history', {"role": "bot", "content": response})
+        st.rerun(scope="fragment")
+
+
+if __name__ == "__main__":
+    chatbot_page()
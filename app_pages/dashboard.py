@@ -0,0 +1,87 @@
+import random
+
+import streamlit as st
+
+import data_layer
+from ui import get_text
+
+
+def dashboard_page():
+    st.markdown(f"## 🏠 {get_text('dashboard')}")
+    # Most sessions land here, so this starts notification delivery early
+    data_layer.get_notification_worker()
+
+    # User greeting
+    st.markdown(f"### {get_text('welcome')}, {st.session_state.user_data['name']}! 👋")
+
+    # Key metrics
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>🗑️ {random.randint(5, 15)} kg</h3>
+            <p>{get_text('waste_collected')}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>⭐ {st.session_state.user_points}</h3>
+            <p>{get_text('points_earned')}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col3:
+        rank_class = st.session_state.recycling_rank
+        rank_text = get_text(st.session_state.recycling_rank)
+        st.markdown(f"""
+        <div class="metric-card">
+            <span class="rank-badge {rank_class}">{rank_text}</span>
+            <p>{get_text('recycling_rank')}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col4:
+        _, next_pickup = data_layer.user_next_pickup(st.session_state.user_data.get('address', ''))
+        st.markdown(f"""
+        <div class="metric-card">
+            <h3>📅 {next_pickup.date.strftime('%d/%m') if next_pickup else '-'}</h3>
+            <p>{get_text('next_pickup')}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    # Quick actions
+    st.markdown("### 🚀 Quick Actions")
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        if st.button(f"📞 {get_text('report_missed')}", use_container_width=True):
+            ticket_id, created = data_layer.file_ticket('missed_pickup', st.session_state.user_data)
+            if created:
+                st.success(f"Missed pickup reported as ticket #{ticket_id}. Our team will contact you soon.")
+            else:
+                st.success(f"Your report was added to ticket #{ticket_id}, which is already open.")
+
+    with col2:
+        if st.button(f"➕ {get_text('request_service')}", use_container_width=True):
+            ticket_id, created = data_layer.file_ticket('service', st.session_state.user_data)
+            if created:
+                st.success(f"Additional service requested as ticket #{ticket_id}. We'll schedule it for you.")
+            else:
+                st.info(f"You already have an open request, ticket #{ticket_id}.")
+
+    with col3:
+        if st.button(f"🎮 {get_text('play_games')}", use_container_width=True):
+            st.session_state.show_games = True
+            st.rerun()
+
+    # Recent activity
+    st.markdown("### 📊 Recent Activity")
+    fig = data_layer.activity_figure(st.session_state.user_data.get('email', ''))
+    st.plotly_chart(fig, use_container_width=True)
+
+
+if __name__ == "__main__":
+    dashboard_page()
@@ -0,0 +1,76 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from config import DATA_DIR
+from metrics import TIMINGS
+from resources import get_session_store
+from session_store import state_size
+
+# Snapshots are written per process, since every app worker keeps its own timings
+SNAPSHOT_DIR = os.path.join(DATA_DIR, 'metrics')
+
+
+def diagnostics_page():
+    st.markdown("## ⏱️ Diagnostics")
+    st.caption(f"Timings of this app process (pid {os.getpid()}) since "
+               f"{datetime.fromtimestamp(TIMINGS.started).strftime('%d/%m %H:%M:%S')}. "
+               "Loader and chart timings count cache misses only.")
+
+    timings = pd.DataFrame(TIMINGS.summary(),
+                           columns=['kind', 'name', 'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms'])
+    kinds = st.multiselect("Show", ['page', 'fragment', 'loader', 'chart'], default=['page', 'fragment'])
+    st.dataframe(
+        timings[timings['kind'].isin(kinds)].round(1).rename(columns={
+            'kind': 'Kind', 'name': 'Name', 'count': 'Runs', 'mean_ms': 'Mean (ms)',
+            'p50_ms': 'p50 (ms)', 'p95_ms': 'p95 (ms)', 'p99_ms': 'p99 (ms)'
+        }),
+        use_container_width=True, hide_index=True
+    )
+
+    st.markdown("### 📤 Export")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button("⬇️ Prometheus text", TIMINGS.to_prometheus(), file_name="swms.prom", mime="text/plain")
+    with col2:
+        st.download_button("⬇️ JSON", TIMINGS.to_json(), file_name="swms-timings.json", mime="application/json")
+    with col3:
+        if st.button("🗑️ Reset Timings"):
+            TIMINGS.reset()
+            st.rerun()
+
+    if st.button("💾 Save Snapshot"):
+        paths = [TIMINGS.write(os.path.join(SNAPSHOT_DIR, f"swms-{os.getpid()}{ext}")) for ext in ('.prom', '.json')]
+        st.success("Saved " + ", ".join(paths))
+
+    session_memory()
+
+
+def session_memory():
+    st.markdown("### 🧠 Session Memory")
+    store = get_session_store()
+    usage = pd.DataFrame(store.usage(), columns=['session', 'idle_s', 'items', 'memory_bytes', 'disk_bytes'])
+    st.caption(f"{len(usage)} sessions seen in the last {store.idle_ttl // 60} minutes hold "
+               f"{usage['memory_bytes'].sum() / 1024:,.0f} KB of lists and {usage['disk_bytes'].sum() / 1024:,.0f} KB "
+               "of blobs on disk.")
+    st.dataframe(
+        usage.assign(session=usage['session'].str[:8], idle_s=usage['idle_s'].round(),
+                     memory_kb=usage['memory_bytes'] / 1024, disk_kb=usage['disk_bytes'] / 1024)
+        [['session', 'idle_s', 'items', 'memory_kb', 'disk_kb']].round(1)
+        .rename(columns={'session': 'Session', 'idle_s': 'Idle (s)', 'items': 'List Items',
+                         'memory_kb': 'Memory (KB)', 'disk_kb': 'Disk (KB)'}),
+        use_container_width=True, hide_index=True
+    )
+    if st.button("🧹 Evict Idle Sessions"):
+        st.success(f"Evicted {store.evict_idle()} idle sessions")
+
+    with st.expander("This session's state"):
+        sizes = state_size(st.session_state)
+        st.dataframe(pd.DataFrame(sorted(sizes.items(), key=lambda kv: -(kv[1] or 0)), columns=['Key', 'Bytes']),
+                     use_container_width=True, hide_index=True)
+
+
+if __name__ == "__main__":
+    diagnostics_page()
@@ -0,0 +1,40 @@
+import streamlit as st
+
+from ui import award_points, get_text
+
+
+def feedback_page():
+    st.markdown(f"## 📝 {get_text('feedback')}")
+
+    st.markdown("### Rate Our Service")
+    rating = st.slider("Overall Rating", 1, 5, 4)
+
+    # Star display
+    stars = "⭐" * rating + "☆" * (5 - rating)
+    st.markdown(f"**{stars}**")
+
+    # Feedback categories
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("### Service Quality")
+        pickup_rating = st.slider("Pickup Timeliness", 1, 5, 4)
+        driver_rating = st.slider("Driver Courtesy", 1, 5, 5)
+        app_rating = st.slider("App Experience", 1, 5, 4)
+
+    with col2:
+        st.markdown("### Suggestions")
+        feedback_text = st.text_area("Your Feedback", height=150)
+        category = st.selectbox("Feedback Category",
+                                ["General", "Pickup Service", "App Issues", "Billing", "Other"])
+
+    if st.button("Submit Feedback"):
+        st.balloons()
+        st.success("Thank you for your feedback! We'll use it to improve our service.")
+        # Award points for feedback
+        award_points(10, "Feedback")
+        st.info("You earned 10 points for providing feedback!")
+
+
+if __name__ == "__main__":
+    feedback_page()
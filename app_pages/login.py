@@ -0,0 +1,57 @@
+import streamlit as st
+
+from accounts import AccountError
+from resources import get_accounts
+from ui import get_text, set_user_points
+
+
+def login_page():
+    st.markdown("### 🔐 Login / Register")
+
+    tab1, tab2 = st.tabs([get_text('login'), get_text('register')])
+
+    with tab1:
+        with st.form("login_form"):
+            email = st.text_input("Email")
+            password = st.text_input("Password", type="password")
+            submit = st.form_submit_button(get_text('login'))
+
+            if submit:
+                if email and password:
+                    user = get_accounts().authenticate(email, password)
+                    if user:
+                        st.session_state.logged_in = True
+                        st.session_state.user_data = user
+                        set_user_points(get_accounts().balance(user['id']))
+                        st.rerun()
+                    else:
+                        st.error("Invalid email or password")
+                else:
+                    st.error("Please fill all fields")
+
+    with tab2:
+        with st.form("register_form"):
+            name = st.text_input("Full Name")
+            email = st.text_input("Email")
+            phone = st.text_input("Phone Number")
+            address = st.text_area("Address")
+            password = st.text_input("Password", type="password")
+            confirm_password = st.text_input("Confirm Password", type="password")
+            submit = st.form_submit_button(get_text('register'))
+
+            if submit:
+                if all([name, email, phone, address, password, confirm_password]):
+                    if password == confirm_password:
+                        try:
+                            get_accounts().register(name, email, phone, address, password)
+                            st.success("Registration successful! Please login.")
+                        except AccountError as e:
+                            st.error(str(e))
+                    else:
+                        st.error("Passwords don't match")
+                else:
+                    st.error("Please fill all fields")
+
+
+if __name__ == "__main__":
+    login_page()
@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+
+import streamlit as st
+
+import data_layer
+from metrics import timed
+from resources import get_notifications
+from ui import get_text
+
+# Inbox entries shown per page; "Show older" reveals another page
+PAGE_SIZE = 10
+
+
+def time_ago(created_at):
+    seconds = (datetime.now(timezone.utc) - datetime.fromisoformat(created_at)).total_seconds()
+    for unit, length in (('day', 86400), ('hour', 3600), ('minute', 60)):
+        if seconds >= length:
+            count = int(seconds // length)
+            return f"{count} {unit}{'s' if count > 1 else ''} ago"
+    return "just now"
+
+
+def notifications_page():
+    st.markdown(f"## 🔔 {get_text('notifications')}")
+
+    # Pickup reminders and bin alerts are fanned out to inboxes in the background
+    data_layer.get_notification_worker()
+
+    notification_list()
+
+
+@st.fragment
+@timed('fragment')
+def notification_list():
+    service = get_notifications()
+    user_id = st.session_state.user_data['id']
+    shown = st.session_state.setdefault('notifications_shown', PAGE_SIZE)
+    # One row past the page tells whether older entries exist
+    items = service.inbox(user_id, limit=shown + 1)
+    has_older = len(items) > shown
+    items = items[:shown]
+
+    if not items:
+        st.info("No notifications yet. Pickup reminders, bin alerts and points updates will appear here.")
+        return
+
+    icon = {"info": "ℹ️", "success": "✅", "reward": "🎁", "warning": "⚠️"}
+    for notification in items:
+        new = "" if notification['read'] else " 🆕"
+        st.markdown(f"""
+        <div class="notification-item">
+            <strong>{icon.get(notification['kind'], '📢')} {notification['title']}{new}</strong><br>
+            {notification['message']}<br>
+            <small style="color: #666;">{time_ago(notification['created_at'])}</small>
+        </div>
+        """, unsafe_allow_html=True)
+    service.mark_read(user_id, items[0]['id'])
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if has_older and st.button("Show older"):
+            st.session_state.notifications_shown += PAGE_SIZE
+            st.rerun(scope="fragment")
+    with col2:
+        if st.button("Clear All Notifications"):
+            service.clear(user_id)
+            st.session_state.notifications_shown = PAGE_SIZE
+            st.rerun(scope="fragment")
+
+
+if __name__ == "__main__":
+    notifications_page()
@@ -0,0 +1,54 @@
+import streamlit as st
+
+import data_layer
+from accounts import AccountError
+from thumbnails import AVATAR_SIZE
+from ui import get_text, upload_thumbnail
+
+
+def profile_page():
+    st.markdown(f"## 👤 {get_text('profile')}")
+
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        st.markdown("### Profile Picture")
+        uploaded_file = st.file_uploader("Upload Profile Picture", type=['jpg', 'jpeg', 'png'])
+        if uploaded_file:
+            st.image(upload_thumbnail(uploaded_file, AVATAR_SIZE), width=200)
+        else:
+            st.markdown("👤", unsafe_allow_html=True)
+
+    with col2:
+        st.markdown("### Personal Information")
+        with st.form("profile_form"):
+            name = st.text_input("Name", value=st.session_state.user_data.get('name', ''))
+            email = st.text_input("Email", value=st.session_state.user_data.get('email', ''))
+            phone = st.text_input("Phone", value=st.session_state.user_data.get('phone', ''))
+            address = st.text_area("Address", value=st.session_state.user_data.get('address', ''))
+
+            if st.form_submit_button("Update Profile"):
+                try:
+                    data_layer.get_accounts().update_profile(
+                        st.session_state.user_data['id'], name=name, email=email, phone=phone, address=address)
+                    st.session_state.user_data.update({
+                        'name': name, 'email': email, 'phone': phone, 'address': address
+                    })
+                    st.success("Profile updated successfully!")
+                except AccountError as e:
+                    st.error(str(e))
+
+    # Statistics
+    st.markdown("### 📊 Your Statistics")
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric("Total Points", st.session_state.user_points)
+    with col2:
+        st.metric("Waste Recycled", "45.2 kg")
+    with col3:
+        st.metric("Carbon Saved", "12.3 kg CO₂")
+
+
+if __name__ == "__main__":
+    profile_page()
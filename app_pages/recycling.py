@@ -0,0 +1,225 @@
+import random
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+import data_layer
+from accounts import InsufficientPoints
+from leaderboard import tier_progress
+from metrics import timed
+from resources import get_jobs
+from ui import award_points, credit_points, get_text, job_status, set_user_points
+
+# The wheel spins this long before its result shows; no thread waits meanwhile
+SPIN_SECONDS = 2.0
+SPIN_PRIZES = [5, 10, 15, 20, 25, 30]
+
+
+def recycling_page():
+    st.markdown(f"## ♻️ {get_text('recycling')}")
+
+    # User rank and points
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"""
+        <div class="metric-card">
+            <h2>⭐ {st.session_state.user_points} Points</h2>
+            <span class="rank-badge {st.session_state.recycling_rank}">{get_text(st.session_state.recycling_rank)}</span>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        # Progress to next rank
+        next_tier, progress = tier_progress(st.session_state.user_points)
+        st.progress(progress)
+        if next_tier:
+            st.write(f"Progress to {get_text(next_tier)}: {int(progress * 100)}%")
+        else:
+            st.write("You have reached the top rank!")
+
+        board = data_layer.get_leaderboard()
+        position = board.position(st.session_state.user_data['id'])
+        if position:
+            st.write(f"🏅 City rank: **#{position:,}** of {len(board):,} residents")
+
+    # Leaderboard
+    st.markdown("### 🏆 Bhavnagar Leaderboard")
+    st.dataframe(data_layer.load_leaderboard(), use_container_width=True, hide_index=True)
+
+    # Games section
+    st.markdown("### 🎮 Earn Points Through Games")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("""
+        <div class="game-card">
+            <h3>🧠 Recycling Quiz</h3>
+            <p>Test your knowledge and earn 10-20 points!</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        st.button("Play Quiz", key="quiz_btn", on_click=open_game, args=('quiz',))
+
+    with col2:
+        st.markdown("""
+        <div class="game-card">
+            <h3>🎯 Lucky Spinner</h3>
+            <p>Spin the wheel to win bonus points!</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        st.button("Spin Wheel", key="spin_btn", on_click=open_game, args=('spinner',))
+
+    # The open game is a fragment, so playing it only reruns the game itself
+    if st.session_state.get('active_game') == 'quiz':
+        play_quiz()
+    elif st.session_state.get('active_game') == 'spinner':
+        play_spinner()
+        spin_result()
+
+    # Rewards section
+    st.markdown("### 🎁 Redeem Rewards")
+
+    rewards = [
+        {"name": "₹10 Grocery Voucher", "points": 100, "desc": "Valid at local stores"},
+        {"name": "₹25 Fuel Voucher", "points": 200, "desc": "Valid at any petrol pump"},
+        {"name": "₹50 Shopping Voucher", "points": 350, "desc": "Valid at major retailers"},
+        {"name": "Free Movie Ticket", "points": 150, "desc": "Valid at Bhavnagar cinemas"}
+    ]
+
+    for reward in rewards:
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            st.write(f"**{reward['name']}**")
+            st.write(reward['desc'])
+        with col2:
+            st.write(f"**{reward['points']} points**")
+        with col3:
+            if st.button(f"Redeem", key=f"redeem_{reward['name']}"):
+                try:
+                    user_id = st.session_state.user_data['id']
+                    set_user_points(data_layer.get_accounts().redeem(
+                        user_id, reward['points'], f"Redeemed {reward['name']}"))
+                    coupon_code, valid_until = generate_coupon(reward['name'])
+                    # The coupon card is gone after the rerun, so the code is kept in the inbox
+                    data_layer.get_notifications().notify(
+                        user_id, 'rewards', "Reward Redeemed",
+                        f"{reward['name']}: coupon code {coupon_code}, valid until {valid_until}", kind='reward')
+                    st.rerun()
+                except InsufficientPoints as e:
+                    st.error(str(e))
+
+
+def open_game(game):
+    st.session_state.active_game = game
+
+
+@st.fragment
+@timed('fragment')
+def play_quiz():
+    st.markdown("### 🧠 Recycling Quiz")
+
+    questions = [
+        {
+            "question": "Which material takes the longest to decompose?",
+            "options": ["Paper", "Plastic", "Glass", "Aluminum"],
+            "correct": 2,
+            "explanation": "Glass can take up to 1 million years to decompose!"
+        },
+        {
+            "question": "What percentage of plastic waste is recycled globally?",
+            "options": ["50%", "25%", "9%", "75%"],
+            "correct": 2,
+            "explanation": "Only about 9% of plastic waste is recycled globally."
+        }
+    ]
+
+    if 'quiz_started' not in st.session_state:
+        st.session_state.quiz_started = False
+        st.session_state.quiz_score = 0
+        st.session_state.current_question = 0
+
+    feedback = st.session_state.pop('quiz_feedback', None)
+    if feedback:
+        getattr(st, feedback[0])(feedback[1])
+
+    if not st.session_state.quiz_started:
+        if st.button("Start Quiz"):
+            st.session_state.quiz_started = True
+            st.rerun(scope="fragment")
+    else:
+        if st.session_state.current_question < len(questions):
+            q = questions[st.session_state.current_question]
+            st.write(f"**Question {st.session_state.current_question + 1}:** {q['question']}")
+
+            answer = st.radio("Choose your answer:", q['options'], key=f"q_{st.session_state.current_question}")
+
+            if st.button("Submit Answer"):
+                # Feedback shows above the next question instead of pausing the script thread
+                if q['options'].index(answer) == q['correct']:
+                    st.session_state.quiz_feedback = ('success', "Correct! +10 points")
+                    st.session_state.quiz_score += 10
+                    award_points(10, "Recycling quiz")
+                else:
+                    st.session_state.quiz_feedback = ('error', f"Wrong! {q['explanation']}")
+
+                st.session_state.current_question += 1
+                st.rerun(scope="fragment")
+        else:
+            st.balloons()
+            st.success(f"Quiz completed! You earned {st.session_state.quiz_score} points!")
+            st.session_state.quiz_started = False
+            st.session_state.current_question = 0
+            st.session_state.quiz_score = 0
+
+
+@st.fragment
+@timed('fragment')
+def play_spinner():
+    st.markdown("### 🎯 Lucky Spinner")
+
+    spinning = get_jobs().status(st.session_state.get('spin_job'))['state'] == 'pending'
+    if st.button("🎯 SPIN THE WHEEL!", key="spin_action", disabled=spinning):
+        st.session_state.spin_job = get_jobs().submit(spin_wheel, st.session_state.user_data['id'],
+                                                      reveal_after=SPIN_SECONDS)
+        # A full rerun, so the page starts polling for the result
+        st.rerun()
+
+
+def spin_wheel(user_id):
+    # Runs as a background job: (points won, new balance)
+    points_won = random.choice(SPIN_PRIZES)
+    return points_won, credit_points(user_id, points_won, "Lucky spinner")
+
+
+def spin_result():
+    status = job_status('spin_job', "Spinning...")
+    if status is None or status['state'] == 'pending':
+        return
+    if status['state'] == 'done':
+        points_won, balance = status['result']
+        set_user_points(balance)
+        st.balloons()
+        st.success(f"🎉 You won {points_won} points!")
+    else:
+        st.error("The wheel got stuck. Please spin again.")
+
+
+def generate_coupon(reward_name):
+    coupon_code = f"WASTE{random.randint(1000, 9999)}"
+    valid_until = (datetime.now() + timedelta(days=30)).strftime('%d/%m/%Y')
+    st.markdown(f"""
+    <div class="reward-coupon">
+        <h3>🎫 Reward Coupon</h3>
+        <h4>{reward_name}</h4>
+        <p><strong>Coupon Code: {coupon_code}</strong></p>
+        <p>Valid until: {valid_until}</p>
+        <p>Present this coupon at participating outlets</p>
+    </div>
+    """, unsafe_allow_html=True)
+    return coupon_code, valid_until
+
+
+if __name__ == "__main__":
+    recycling_page()
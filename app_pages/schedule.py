@@ -0,0 +1,82 @@
+import html
+from datetime import date, timedelta
+
+import streamlit as st
+
+import data_layer
+from collection_schedule import format_time
+from data_layer import BIN_STATUSES
+from ui import get_text
+
+BINS_PER_PAGE = 50
+
+
+def render_bin_rows(bin_data):
+    # One HTML block for the whole page of bins instead of one element per bin
+    if bin_data.empty:
+        return ''
+    rows = (
+        '<div style="display: flex; align-items: center; padding: 0.5rem; background: white; margin: 0.5rem 0; border-radius: 5px;">'
+        '<span class="bin-status bin-' + bin_data['Status'].str.lower() + '"></span>'
+        '<strong>' + bin_data['Location'].map(html.escape) + '</strong> - '
+        + bin_data['Bin_ID'].map(html.escape) + ' - '
+        + bin_data['Fill_Level'].astype(str) + '% full</div>'
+    )
+    return ''.join(rows)
+
+
+def schedule_page():
+    st.markdown(f"## 📅 {get_text('schedule')}")
+
+    # The coming week in the user's ward, or any other ward
+    schedule = data_layer.get_schedule()
+    wards = schedule.wards
+    home = data_layer.user_ward(st.session_state.user_data.get('address', ''))
+    ward = st.selectbox("Ward", wards, index=wards.index(home) if home in wards else 0)
+
+    next_pickup = schedule.next_pickup(ward)
+    if next_pickup:
+        st.info(f"Next pickup in {ward}: {next_pickup.waste_type} on "
+                f"{next_pickup.date:%A %d/%m} at {format_time(next_pickup.minute)}")
+
+    today = date.today()
+    schedule_data = data_layer.load_schedule(ward, today)
+    st.dataframe(schedule_data, use_container_width=True, hide_index=True)
+
+    holidays = schedule.holidays(today, today + timedelta(days=30))
+    for day, holiday_ward, name, shift in holidays:
+        if holiday_ward in ('', ward):
+            change = f"moved {shift} day{'s' if shift > 1 else ''} later" if shift else "cancelled"
+            st.caption(f"🎉 {name} ({day:%d/%m}): collections {change}")
+
+    # Smart bin status
+    st.markdown("### 🗑️ Smart Bin Status")
+    bin_data = data_layer.load_bin_status()
+
+    location = data_layer.user_location(st.session_state.user_data.get('address', ''))
+    if location:
+        status = bin_data.set_index('Bin_ID')['Status']
+        nearby = [f"**{b['location']}** ({b['bin_id']}, {status.get(b['bin_id'], 'No reading')}) - {km:.1f} km"
+                  for b, km in data_layer.nearest_bins(*location)]
+        st.markdown("Bins near you: " + " · ".join(nearby))
+
+    counts = bin_data['Status'].value_counts()
+    col1, col2, col3 = st.columns(3)
+    for col, status in zip((col1, col2, col3), BIN_STATUSES):
+        col.metric(f"{status} Bins", int(counts.get(status, 0)))
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        status_filter = st.multiselect("Show bins", list(BIN_STATUSES), default=list(BIN_STATUSES))
+    bin_data = bin_data[bin_data['Status'].isin(status_filter)]
+
+    pages = max(1, -(-len(bin_data) // BINS_PER_PAGE))
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1)
+    start = (page - 1) * BINS_PER_PAGE
+    st.markdown(render_bin_rows(bin_data.iloc[start:start + BINS_PER_PAGE]), unsafe_allow_html=True)
+    st.caption(f"Showing {min(start + 1, len(bin_data))}-{min(start + BINS_PER_PAGE, len(bin_data))} of {len(bin_data)} bins")
+
+
+if __name__ == "__main__":
+    schedule_page()
@@ -0,0 +1,51 @@
+import streamlit as st
+
+from i18n import LANGUAGES
+from notifier import TOPICS
+from resources import get_notifications
+
+
+def apply_setting(name):
+    # Widget callbacks run before the rerun they trigger, so no second st.rerun() is needed
+    value = st.session_state[f"settings_{name}"]
+    st.session_state[name] = value.lower() if name == 'theme' else value
+
+
+def save_preference(topic):
+    get_notifications().set_preference(st.session_state.user_data['id'], topic,
+                                       st.session_state[f"notify_{topic}"])
+
+
+def settings_page():
+    st.markdown("## ⚙️ Settings")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("### 🌐 Language")
+        st.selectbox("Select Language", list(LANGUAGES),
+                     index=list(LANGUAGES).index(st.session_state.language),
+                     key="settings_language", on_change=apply_setting, args=('language',))
+
+    with col2:
+        st.markdown("### 🎨 Theme")
+        st.selectbox("Select Theme", ["Light", "Dark"],
+                     index=0 if st.session_state.theme == 'light' else 1,
+                     key="settings_theme", on_change=apply_setting, args=('theme',))
+
+    st.markdown("### 🔔 Notification Preferences")
+    preferences = get_notifications().preferences(st.session_state.user_data['id'])
+    for topic, (label, _) in TOPICS.items():
+        st.checkbox(label, value=preferences[topic], key=f"notify_{topic}",
+                    on_change=save_preference, args=(topic,))
+
+    st.markdown("### 📊 Data & Privacy")
+    if st.button("Download My Data"):
+        st.info("Your data export will be sent to your email address.")
+
+    if st.button("Delete Account"):
+        st.error("Are you sure? This action cannot be undone.")
+
+
+if __name__ == "__main__":
+    settings_page()
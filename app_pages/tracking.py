@@ -0,0 +1,50 @@
+import streamlit as st
+
+import data_layer
+from metrics import timed
+from ui import get_text
+
+LIVE_MAP_REFRESH_SECONDS = 5
+
+
+def tracking_page():
+    st.markdown(f"## 🚛 {get_text('tracking')}")
+
+    truck_data = data_layer.load_truck_etas()
+    # Describe each truck by the bin nearest its latest fix rather than its rostered area
+    positions = data_layer.get_fleet().latest().set_index('Truck_ID')
+    truck_data = truck_data.assign(Location=[
+        data_layer.describe_location(*positions.loc[truck, ['Lat', 'Lon']]) if truck in positions.index else location
+        for truck, location in zip(truck_data['Truck_ID'], truck_data['Location'])
+    ])
+
+    # Display truck information as a single table
+    st.dataframe(
+        truck_data[['Truck_ID', 'Driver', 'Location', 'Status', 'Stops', 'ETA']].rename(columns={
+            'Truck_ID': '🚛 Truck', 'Driver': '👨‍✈️ Driver', 'Location': '📍 Location',
+            'Status': '🚦 Status', 'Stops': '🗑️ Stops', 'ETA': '⏱️ ETA'
+        }),
+        use_container_width=True, hide_index=True
+    )
+
+    with st.expander("🧭 Planned Collection Routes"):
+        st.dataframe(data_layer.load_route_plan(), use_container_width=True, hide_index=True)
+
+    st.markdown("### 🗺️ Live Map")
+    live_truck_map()
+
+
+@st.fragment(run_every=LIVE_MAP_REFRESH_SECONDS)
+@timed('fragment')
+def live_truck_map():
+    # Reruns on its own timer without re-executing the rest of the page
+    positions = data_layer.get_fleet().latest()
+    if positions.empty:
+        st.info("Waiting for the first GPS fixes...")
+        return
+    st.map(positions, latitude='Lat', longitude='Lon', size=40)
+    st.caption(f"{len(positions)} trucks · last fix {positions['Updated'].max().strftime('%H:%M:%S')} UTC")
+
+
+if __name__ == "__main__":
+    tracking_page()
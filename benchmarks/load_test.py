@@ -0,0 +1,297 @@
+"""Load test: concurrent browser sessions against a local app server.
+
+Starts ``streamlit run swms.py`` headless, then drives N concurrent
+sessions over the same websocket protocol the browser uses. Each session
+logs in, opens every page, redeems a reward and uploads a photo on the
+profile and AI sorting pages. Reports throughput, rerun latency
+percentiles per step and the server memory added per session:
+
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/load_test.py --users 20 --rounds 2
+
+AppTest cannot do this: it swaps a process-global runtime on every run,
+so instances cannot run concurrently.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import numpy as np
+import requests
+import websockets
+from PIL import Image
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PASSWORD = 'load-test'
+# url paths of the signed-in pages, in menu order
+PAGES = ['dashboard', 'schedule', 'tracking', 'recycling', 'ai-sorting', 'admin',
+         'profile', 'notifications', 'feedback', 'assistant', 'settings']
+UPLOAD_PAGES = ('profile', 'ai-sorting')
+
+
+class ScriptError(Exception):
+    pass
+
+
+class BrowserSession:
+    """One websocket session that reruns the app like the browser would."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.session_id = None
+        self.pages = {}
+        self.default_page = None
+        self.page_hash = ''
+        self.elements = []
+        self.errors = []
+        # Fragments the server asked to rerun on a timer: fragment id -> interval in seconds
+        self.auto_reruns = {}
+        self._widget_values = {}
+        self._widget_fragments = {}
+
+    async def connect(self):
+        url = self.base_url.replace('http', 'ws', 1) + '/_stcore/stream'
+        self._ws = await websockets.connect(url, subprotocols=['streamlit'], max_size=None)
+
+    async def close(self):
+        await self._ws.close()
+
+    async def _receive(self):
+        msg = ForwardMsg()
+        msg.ParseFromString(await self._ws.recv())
+        return msg
+
+    async def rerun(self, triggers=(), page=None, fragment_id=None, auto=False):
+        # Send every widget value the session has set, as the browser does, plus any triggers
+        if page is not None:
+            self.page_hash = self.pages.get(page, self.default_page)
+        back = BackMsg()
+        back.rerun_script.page_script_hash = self.page_hash
+        back.rerun_script.widget_states.widgets.extend(list(self._widget_values.values()) + list(triggers))
+        if fragment_id:
+            back.rerun_script.fragment_id = fragment_id
+            back.rerun_script.is_auto_rerun = auto
+        await self._ws.send(back.SerializeToString())
+
+        while True:
+            msg = await self._receive()
+            kind = msg.WhichOneof('type')
+            if kind == 'new_session':
+                # A fragment rerun only redraws its fragment; a full run redraws everything
+                if not msg.new_session.fragment_ids_this_run:
+                    self.elements = []
+                    self.auto_reruns = {}
+                if msg.new_session.HasField('initialize'):
+                    self.session_id = msg.new_session.initialize.session_id
+            elif kind == 'auto_rerun':
+                self.auto_reruns[msg.auto_rerun.fragment_id] = msg.auto_rerun.interval
+            elif kind == 'stop_auto_rerun':
+                self.auto_reruns.pop(msg.stop_auto_rerun.fragment_id, None)
+            elif kind == 'navigation':
+                # The default page has an empty url path; it is also reachable by its own name
+                self.pages = {p.url_pathname: p.page_script_hash for p in msg.navigation.app_pages}
+                self.default_page = self.pages.get('')
+                self.page_hash = msg.navigation.page_script_hash
+            elif kind == 'delta' and msg.delta.WhichOneof('type') == 'new_element':
+                element = msg.delta.new_element
+                element_type = element.WhichOneof('type')
+                widget = getattr(element, element_type)
+                self.elements.append((element_type, widget))
+                if msg.delta.fragment_id and 'id' in widget.DESCRIPTOR.fields_by_name:
+                    # Widgets inside a fragment rerun only their fragment when used
+                    self._widget_fragments[widget.id] = msg.delta.fragment_id
+                if element_type == 'exception':
+                    self.errors.append(element.exception.message)
+            elif kind == 'script_finished':
+                if msg.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise ScriptError("the app failed to compile")
+                if msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return
+
+    async def follow_auto_reruns(self, timeout=30):
+        # Rerun timed fragments as the browser would until the server stops asking
+        deadline = time.monotonic() + timeout
+        while self.auto_reruns and time.monotonic() < deadline:
+            fragment_id, interval = min(self.auto_reruns.items(), key=lambda item: item[1])
+            await asyncio.sleep(interval)
+            await self.rerun(fragment_id=fragment_id, auto=True)
+
+    def find(self, element_type, label):
+        return [e for t, e in self.elements if t == element_type and e.label == label]
+
+    def set_value(self, widget, **value):
+        state = WidgetState(id=widget.id, **value)
+        self._widget_values[widget.id] = state
+
+    async def click(self, button):
+        await self.rerun([WidgetState(id=button.id, trigger_value=True)],
+                         fragment_id=self._widget_fragments.get(button.id))
+
+    async def upload(self, uploader, name, data, mime='image/jpeg'):
+        request = BackMsg()
+        request.file_urls_request.request_id = uuid.uuid4().hex
+        request.file_urls_request.file_names.append(name)
+        request.file_urls_request.session_id = self.session_id
+        await self._ws.send(request.SerializeToString())
+        while (msg := await self._receive()).WhichOneof('type') != 'file_urls_response':
+            pass
+        urls = msg.file_urls_response.file_urls[0]
+        response = await asyncio.to_thread(requests.put, self.base_url + urls.upload_url,
+                                           files={'file': (name, data, mime)}, timeout=60)
+        response.raise_for_status()
+
+        state = WidgetState(id=uploader.id)
+        info = state.file_uploader_state_value.uploaded_file_info.add()
+        info.file_id, info.name, info.size = urls.file_id, name, len(data)
+        info.file_urls.CopyFrom(urls)
+        self._widget_values[uploader.id] = state
+        await self.rerun()
+
+
+def photo(seed, size=(1600, 1200)):
+    # A phone-sized JPEG, different per user so uploads are not deduplicated
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, (size[1] // 8, size[0] // 8, 3), dtype=np.uint8)
+    buffer = BytesIO()
+    Image.fromarray(pixels).resize(size).save(buffer, format='JPEG', quality=85)
+    return buffer.getvalue()
+
+
+async def simulate_user(base_url, email, seed, rounds, samples, sessions):
+    async def step(name, action):
+        started = time.perf_counter()
+        await action
+        samples.setdefault(name, []).append((time.perf_counter() - started) * 1000)
+
+    session = BrowserSession(base_url)
+    await session.connect()
+    sessions.append(session)
+    await step('login page', session.rerun())
+    email_input, password_input = session.find('text_input', 'Email')[0], session.find('text_input', 'Password')[0]
+    session.set_value(email_input, string_value=email)
+    session.set_value(password_input, string_value=PASSWORD)
+    await step('log in', session.click(session.find('button', 'Login')[0]))
+    if len(session.pages) < 2:
+        raise ScriptError(f"{email} could not log in")
+
+    image = photo(seed)
+    for _ in range(rounds):
+        for page in PAGES:
+            await step(page, session.rerun(page=page))
+            if page == 'recycling' and session.find('button', 'Redeem'):
+                await step('redeem', session.click(session.find('button', 'Redeem')[0]))
+            elif page in UPLOAD_PAGES:
+                uploader = [e for t, e in session.elements if t == 'file_uploader'][0]
+                await step(f'upload ({page})', session.upload(uploader, f'{seed}.jpg', image))
+
+
+def server_rss_mb(pid):
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except OSError:
+        return None
+
+
+def start_server(port, data_dir, app=os.path.join(ROOT, 'swms.py')):
+    env = dict(os.environ, SWMS_DATA_DIR=data_dir, SWMS_DEMO_DATA='1')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', app,
+         '--server.headless', 'true', '--server.port', str(port),
+         '--server.enableXsrfProtection', 'false', '--browser.gatherUsageStats', 'false'],
+        env=env, cwd=os.path.dirname(app), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f'http://localhost:{port}/_stcore/health', timeout=1)
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("app server did not start")
+
+
+def percentiles(samples):
+    return np.percentile(samples, [50, 95, 99])
+
+
+async def run(args, base_url, server_pid):
+    # A warm-up session with its own account loads modules and builds the shared caches
+    await simulate_user(base_url, f'load{args.users}@example.com', args.users, 1, {}, [])
+    baseline_mb = server_rss_mb(server_pid)
+
+    samples, sessions = {}, []
+    started = time.perf_counter()
+    await asyncio.gather(*(simulate_user(base_url, f'load{i}@example.com', i, args.rounds, samples, sessions)
+                           for i in range(args.users)))
+    wall = time.perf_counter() - started
+    # Sessions are still connected, so their state counts toward server memory
+    total_mb = server_rss_mb(server_pid)
+    for session in sessions:
+        await session.close()
+
+    every = [ms for step_samples in samples.values() for ms in step_samples]
+    p50, p95, p99 = percentiles(every)
+    print(f"{args.users} users x {args.rounds} rounds: {len(every)} reruns in {wall:.1f} s "
+          f"({len(every) / wall:.1f} reruns/s)")
+    print(f"rerun latency: p50 {p50:.0f} ms, p95 {p95:.0f} ms, p99 {p99:.0f} ms")
+    if total_mb is not None:
+        print(f"server memory: {(total_mb - baseline_mb) / args.users:.1f} MB RSS per session "
+              f"({total_mb:.0f} MB total)")
+    print()
+    print(f"{'step':<20}{'runs':>6}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for step, step_samples in sorted(samples.items(), key=lambda item: -np.percentile(item[1], 95)):
+        p50, p95, p99 = percentiles(step_samples)
+        print(f"{step:<20}{len(step_samples):>6}{statistics.fmean(step_samples):>8.0f}ms"
+              f"{p50:>8.0f}ms{p95:>8.0f}ms{p99:>8.0f}ms")
+
+    errors = [error for session in sessions for error in session.errors]
+    if errors:
+        print(f"\n{len(errors)} reruns raised; first: {errors[0]}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=10, help='concurrent sessions')
+    parser.add_argument('--rounds', type=int, default=1, help='passes over every page per user')
+    parser.add_argument('--port', type=int, default=8599)
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix='swms-load-')
+    os.environ['SWMS_DATA_DIR'] = data_dir
+    os.environ['SWMS_DEMO_DATA'] = '1'
+    from accounts import AccountStore
+    accounts = AccountStore()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: accounts.register('Load Tester', f'load{i}@example.com', '', '', PASSWORD),
+                      range(args.users + 1)))
+    # Every session opens the admin page too
+    for i in range(args.users + 1):
+        accounts.set_admin(f'load{i}@example.com')
+
+    server = start_server(args.port, data_dir)
+    try:
+        asyncio.run(run(args, f'http://localhost:{args.port}', server.pid))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Rerun latency of fragment-scoped widgets versus a full script rerun.
+
+Before fragments, every click in the quiz, spinner, chatbot or
+notification list re-executed the whole app (sidebar, header and the
+selected page). Now only the fragment reruns. This script measures both
+with Streamlit's AppTest:
+
+    python benchmarks/rerun_latency.py --runs 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('SWMS_DATA_DIR', tempfile.mkdtemp(prefix='swms-bench-'))
+# Pages render the demo bins, wards and collections as they would in a populated deployment
+os.environ.setdefault('SWMS_DEMO_DATA', '1')
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from accounts import AccountStore  # noqa: E402
+
+# Page script that hosts each fragment
+FRAGMENTS = {
+    'chat_panel': 'chatbot',
+    'notification_list': 'notifications',
+    'play_quiz': 'recycling',
+    'play_spinner': 'recycling',
+}
+
+
+def fragment_script(name, page):
+    import importlib
+
+    import streamlit as st
+    st.session_state.setdefault('user_points', 150)
+    getattr(importlib.import_module(f'app_pages.{page}'), name)()
+
+
+def timed_runs(app, runs):
+    app.run()
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        app.run()
+        samples.append((time.perf_counter() - started) * 1000)
+        if app.exception:
+            raise RuntimeError(app.exception)
+    return statistics.median(samples), max(samples)
+
+
+def full_app(user, page):
+    app = AppTest.from_file(os.path.join(ROOT, 'swms.py'), default_timeout=60)
+    app.session_state.logged_in = True
+    app.session_state.user_data = user
+    app.run()
+    return app.switch_page(f'app_pages/{page}.py')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    accounts = AccountStore()
+    user_id = accounts.register('Bench', 'bench@example.com', '', '', 'bench')
+    user = accounts.get_user(user_id)
+
+    print(f"{'widget':<20}{'full rerun p50':>16}{'fragment p50':>15}{'speedup':>10}")
+    for name, page in FRAGMENTS.items():
+        full, _ = timed_runs(full_app(user, page), args.runs)
+        fragment_app = AppTest.from_function(fragment_script, args=(name, page), default_timeout=60)
+        fragment_app.session_state.user_data = user
+        fragment, _ = timed_runs(fragment_app, args.runs)
+        print(f"{name:<20}{full:>13.1f} ms{fragment:>12.1f} ms{full / fragment:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Time-to-first-render of the login page in a cold Python process.
+
+Each sample starts a fresh interpreter, so nothing the app imports is
+already loaded, and times the first AppTest run of the entrypoint (which
+renders the login page for a new session). It also lists the heavy
+libraries that run pulled in:
+
+    python benchmarks/startup_time.py --runs 5
+    python benchmarks/startup_time.py --app /path/to/older/checkout/swms.py
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries the login page should not need
+HEAVY_MODULES = ('pandas', 'plotly.express', 'PIL.Image', 'onnxruntime', 'classifier', 'data_layer')
+
+
+def first_render(app):
+    # Runs in the child process
+    from streamlit.testing.v1 import AppTest
+
+    loaded_before = {m for m in HEAVY_MODULES if m in sys.modules}
+    test = AppTest.from_file(app, default_timeout=60)
+    started = time.perf_counter()
+    test.run()
+    elapsed = (time.perf_counter() - started) * 1000
+    if test.exception:
+        raise RuntimeError(test.exception)
+    loaded = [m for m in HEAVY_MODULES if m in sys.modules and m not in loaded_before]
+    print(json.dumps({'ms': elapsed, 'loaded': loaded}))
+
+
+def sample(app, data_dir):
+    env = dict(os.environ, SWMS_DATA_DIR=data_dir, SWMS_DEMO_DATA='1')
+    out = subprocess.run([sys.executable, __file__, '--child', app], env=env, cwd=os.path.dirname(app),
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--app', default=os.path.join(ROOT, 'swms.py'))
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(args.child)))
+        first_render(args.child)
+        return
+
+    app = os.path.abspath(args.app)
+    data_dir = tempfile.mkdtemp(prefix='swms-bench-')
+    # Warm-up run creates the database so samples measure rendering, not setup
+    sample(app, data_dir)
+    results = [sample(app, data_dir) for _ in range(args.runs)]
+    timings = sorted(r['ms'] for r in results)
+    print(f"login first render over {args.runs} cold starts: "
+          f"p50 {statistics.median(timings):.0f} ms, min {timings[0]:.0f} ms, max {timings[-1]:.0f} ms")
+    print(f"heavy modules imported: {', '.join(results[-1]['loaded']) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""Server threads held by the recycling games under concurrent users.
+
+Starts the app headless (see load_test.py) and has N users each play the
+lucky spinner and the quiz at the same time, following the fragment polls
+a browser would make. While they play, the server's thread count is
+sampled from /proc; threads above the idle baseline are script runs
+still executing, such as a spin sleeping on its script thread. Needs
+benchmarks/requirements.txt, like load_test.py.
+
+The "before" numbers for moving spins and classification to background
+jobs come from the checkout just before that change, the commit adding
+the queued notification service. Pass that checkout's entrypoint with
+--app. Sessions reach the games through the st.navigation pages, so the
+script only drives checkouts from the multipage split onwards; the
+single-script app that predates it is not supported.
+
+    python benchmarks/thread_occupancy.py --users 20
+    python benchmarks/thread_occupancy.py --users 20 --app /path/to/older/checkout/swms.py
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from load_test import PASSWORD, ROOT, BrowserSession, ScriptError, start_server
+
+SAMPLE_SECONDS = 0.01
+QUIZ_QUESTIONS = 2
+# Pause before each click, as a person would; an instant click can land while the
+# previous run is still resetting its button triggers, and be lost
+THINK_SECONDS = 0.3
+
+
+def server_threads(pid):
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('Threads:'):
+                return int(line.split()[1])
+
+
+async def sample_threads(pid, samples, stop):
+    while not stop.is_set():
+        samples.append(server_threads(pid))
+        await asyncio.sleep(SAMPLE_SECONDS)
+
+
+def alerts(session, text):
+    return [e for t, e in session.elements if t == 'alert' and text in e.body]
+
+
+async def join(base_url, email):
+    session = BrowserSession(base_url)
+    await session.connect()
+    await session.rerun()
+    if not session.pages:
+        raise ScriptError("The app sends no st.navigation pages; checkouts before the multipage split are not supported")
+    session.set_value(session.find('text_input', 'Email')[0], string_value=email)
+    session.set_value(session.find('text_input', 'Password')[0], string_value=PASSWORD)
+    await session.click(session.find('button', 'Login')[0])
+    if len(session.pages) < 2:
+        raise ScriptError(f"{email} could not log in")
+    await session.rerun(page='recycling')
+    return session
+
+
+async def click(session, label):
+    await asyncio.sleep(THINK_SECONDS)
+    await session.click(session.find('button', label)[-1])
+
+
+async def play(session, spins, latencies):
+    await click(session, 'Spin Wheel')
+    for _ in range(spins):
+        started = time.perf_counter()
+        await click(session, '🎯 SPIN THE WHEEL!')
+        await session.follow_auto_reruns()
+        if not alerts(session, 'You won'):
+            latencies.setdefault('spins with no result', []).append(1)
+            continue
+        latencies.setdefault('spin', []).append((time.perf_counter() - started) * 1000 - THINK_SECONDS * 1000)
+
+    await click(session, 'Play Quiz')
+    await click(session, 'Start Quiz')
+    for _ in range(QUIZ_QUESTIONS):
+        started = time.perf_counter()
+        # Submits the default option; radio values are serialised differently across Streamlit releases
+        await click(session, 'Submit Answer')
+        latencies.setdefault('quiz answer', []).append((time.perf_counter() - started) * 1000 - THINK_SECONDS * 1000)
+    return session.errors
+
+
+async def run(args, base_url, server_pid):
+    # A warm-up player loads the page modules and starts any worker pools
+    await play(await join(base_url, f'threads{args.users}@example.com'), 1, {})
+    # Everyone signs in first, so only the games are measured
+    sessions = await asyncio.gather(*(join(base_url, f'threads{i}@example.com') for i in range(args.users)))
+    await asyncio.sleep(1)
+    baseline = server_threads(server_pid)
+
+    samples, latencies, stop = [], {}, asyncio.Event()
+    sampler = asyncio.create_task(sample_threads(server_pid, samples, stop))
+    started = time.perf_counter()
+    errors = await asyncio.gather(*(play(session, args.spins, latencies) for session in sessions))
+    wall = time.perf_counter() - started
+    stop.set()
+    await sampler
+    for session in sessions:
+        await session.close()
+
+    busy = np.maximum(np.array(samples) - baseline, 0)
+    print(f"{args.users} users x ({args.spins} spins + {QUIZ_QUESTIONS} quiz answers) in {wall:.1f} s, "
+          f"{THINK_SECONDS:.1f} s think time before each click")
+    print(f"server threads: {baseline} idle; above idle while playing: mean {busy.mean():.1f}, "
+          f"p95 {np.percentile(busy, 95):.0f}, peak {busy.max()}")
+    print(f"thread-seconds held: {busy.mean() * wall:.1f}")
+    lost = len(latencies.pop('spins with no result', []))
+    for action, values in latencies.items():
+        p50, p95 = np.percentile(values, [50, 95])
+        print(f"{action:<12} click to result: mean {statistics.fmean(values):.0f} ms, "
+              f"p50 {p50:.0f} ms, p95 {p95:.0f} ms")
+    if lost:
+        print(f"spins that showed no result: {lost}")
+
+    errors = [error for session_errors in errors for error in session_errors]
+    if errors:
+        print(f"\n{len(errors)} reruns raised; first: {errors[0]}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=20, help='concurrent players')
+    parser.add_argument('--spins', type=int, default=2, help='spins per player')
+    parser.add_argument('--app', default=os.path.join(ROOT, 'swms.py'))
+    parser.add_argument('--port', type=int, default=8598)
+    args = parser.parse_args()
+
+    app = os.path.abspath(args.app)
+    data_dir = tempfile.mkdtemp(prefix='swms-threads-')
+    os.environ['SWMS_DATA_DIR'] = data_dir
+    os.environ['SWMS_DEMO_DATA'] = '1'
+    sys.path.insert(0, os.path.dirname(app))
+    from accounts import AccountStore
+    accounts = AccountStore()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: accounts.register('Thread Tester', f'threads{i}@example.com', '', '', PASSWORD),
+                      range(args.users + 1)))
+
+    server = start_server(args.port, data_dir, app)
+    try:
+        asyncio.run(run(args, f'http://localhost:{args.port}', server.pid))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from config import DATA_DIR
+
+# Column layout of a day partition: one raw little-endian file per column,
+# appended to in lockstep so row i of every column is the same reading
+COLUMNS = {
+    'ts': np.dtype('<i8'),    # epoch seconds (UTC)
+    'bin': np.dtype('<i4'),   # position of the bin in the registry
+    'fill': np.dtype('<f4'),  # fill level in percent
+}
+
+SECONDS_PER_DAY = 86400
+
+
+def time_now():
+    return datetime.now(timezone.utc).timestamp()
+
+
+def to_epoch(value):
+    if value is None:
+        return int(time_now())
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        # Epoch seconds, such as time.time(); pandas would read a bare number as nanoseconds
+        return int(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    return int(pd.Timestamp(value).timestamp())
+
+
+def _day_name(day):
+    return datetime.fromtimestamp(int(day) * SECONDS_PER_DAY, timezone.utc).strftime('%Y-%m-%d')
+
+
+class BinStore:
+    """Append-only, day-partitioned store for smart bin fill readings.
+
+    Readings are written to ``<root>/<YYYY-MM-DD>/<column>.bin`` and read back
+    through ``np.memmap``. The latest reading of every bin is kept in a small
+    in-memory index (persisted to ``latest.npz``) so status views never have
+    to scan partitions.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or os.path.join(DATA_DIR, 'bins')
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._registry_path = os.path.join(self.root, 'registry.json')
+        self._latest_path = os.path.join(self.root, 'latest.npz')
+        self._load_registry()
+        self._load_latest()
+
+    # Bin registry
+
+    def _load_registry(self):
+        if os.path.exists(self._registry_path):
+            with open(self._registry_path, encoding='utf-8') as f:
+                self.bins = json.load(f)
+        else:
+            self.bins = []
+        self._index = {b['bin_id']: i for i, b in enumerate(self.bins)}
+
+    def _save_registry(self):
+        tmp = self._registry_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.bins, f, ensure_ascii=False)
+        os.replace(tmp, self._registry_path)
+
+    def register_bins(self, bins):
+        # bins: iterable of dicts with at least 'bin_id' and 'location'
+        with self._lock:
+            added = False
+            for b in bins:
+                if b['bin_id'] in self._index:
+                    continue
+                self._index[b['bin_id']] = len(self.bins)
+                self.bins.append(dict(b))
+                added = True
+            if added:
+                self._save_registry()
+                self._grow_latest()
+
+    def __len__(self):
+        return len(self.bins)
+
+    # Latest-reading index
+
+    def _load_latest(self):
+        if os.path.exists(self._latest_path):
+            with np.load(self._latest_path) as data:
+                self._latest_ts = data['ts']
+                self._latest_fill = data['fill']
+        else:
+            self._latest_ts = np.empty(0, dtype=COLUMNS['ts'])
+            self._latest_fill = np.empty(0, dtype=COLUMNS['fill'])
+        self._grow_latest()
+
+    def _grow_latest(self):
+        missing = len(self.bins) - len(self._latest_ts)
+        if missing > 0:
+            self._latest_ts = np.concatenate([self._latest_ts, np.full(missing, -1, dtype=COLUMNS['ts'])])
+            self._latest_fill = np.concatenate([self._latest_fill, np.zeros(missing, dtype=COLUMNS['fill'])])
+
+    def _save_latest(self):
+        tmp = self._latest_path + '.tmp.npz'
+        np.savez(tmp, ts=self._latest_ts, fill=self._latest_fill)
+        os.replace(tmp, self._latest_path)
+
+    # Ingest
+
+    def bin_positions(self, bin_ids):
+        try:
+            return np.fromiter((self._index[b] for b in bin_ids), dtype=COLUMNS['bin'])
+        except KeyError as e:
+            raise KeyError(f"Unknown bin {e.args[0]!r}; register it before recording readings") from None
+
+    def append(self, bin_ids, fill_levels, timestamps=None):
+        bin_pos = self.bin_positions(bin_ids)
+        fill = np.asarray(fill_levels, dtype=COLUMNS['fill'])
+        if timestamps is None:
+            ts = np.full(len(bin_pos), int(time_now()), dtype=COLUMNS['ts'])
+        else:
+            ts = np.fromiter((to_epoch(t) for t in timestamps), dtype=COLUMNS['ts'])
+        if not (len(bin_pos) == len(fill) == len(ts)):
+            raise ValueError("bin_ids, fill_levels and timestamps must have the same length")
+        if len(ts) == 0:
+            return 0
+
+        with self._lock:
+            days = ts // SECONDS_PER_DAY
+            for day in np.unique(days):
+                mask = days == day
+                part = os.path.join(self.root, _day_name(day))
+                os.makedirs(part, exist_ok=True)
+                for name, values in (('ts', ts), ('bin', bin_pos), ('fill', fill)):
+                    with open(os.path.join(part, f'{name}.bin'), 'ab') as f:
+                        f.write(values[mask].astype(COLUMNS[name], copy=False).tobytes())
+
+            # Newest reading per bin within this batch, then merge into the index
+            order = np.lexsort((ts, bin_pos))
+            last = np.r_[bin_pos[order][1:] != bin_pos[order][:-1], True]
+            pos, new_ts, new_fill = bin_pos[order][last], ts[order][last], fill[order][last]
+            newer = new_ts >= self._latest_ts[pos]
+            self._latest_ts[pos[newer]] = new_ts[newer]
+            self._latest_fill[pos[newer]] = new_fill[newer]
+            self._save_latest()
+        return len(ts)
+
+    # Queries
+
+    def latest(self):
+        # Latest reading per bin, for bins that have reported at least once
+        with self._lock:
+            ts = self._latest_ts.copy()
+            fill = self._latest_fill.copy()
+        seen = np.flatnonzero(ts >= 0)
+        return pd.DataFrame({
+            'Location': [self.bins[i]['location'] for i in seen],
+            'Bin_ID': [self.bins[i]['bin_id'] for i in seen],
+            'Lat': np.array([self.bins[i].get('lat', np.nan) for i in seen], dtype=np.float64),
+            'Lon': np.array([self.bins[i].get('lon', np.nan) for i in seen], dtype=np.float64),
+            'Fill_Level': np.rint(fill[seen]).astype(int),
+            'Updated': pd.to_datetime(ts[seen], unit='s', utc=True),
+        })
+
+    def _read_partition(self, day):
+        part = os.path.join(self.root, _day_name(day))
+        columns = {}
+        for name, dtype in COLUMNS.items():
+            path = os.path.join(part, f'{name}.bin')
+            if not os.path.exists(path) or os.path.getsize(path) < dtype.itemsize:
+                return None
+            columns[name] = np.memmap(path, dtype=dtype, mode='r')
+        # A concurrent append may have landed in some columns only
+        rows = min(len(c) for c in columns.values())
+        return {name: c[:rows] for name, c in columns.items()}
+
+    def readings(self, start, end=None, bin_pos=None):
+        # Raw columns for every reading in [start, end], optionally for one bin
+        start_ts = to_epoch(start)
+        end_ts = to_epoch(end)
+        parts = {name: [] for name in COLUMNS}
+        for day in range(start_ts // SECONDS_PER_DAY, end_ts // SECONDS_PER_DAY + 1):
+            part = self._read_partition(day)
+            if part is None:
+                continue
+            mask = (part['ts'] >= start_ts) & (part['ts'] <= end_ts)
+            if bin_pos is not None:
+                mask &= part['bin'] == bin_pos
+            for name in COLUMNS:
+                parts[name].append(np.asarray(part[name][mask]))
+        return {
+            name: np.concatenate(parts[name]) if parts[name] else np.empty(0, dtype=dtype)
+            for name, dtype in COLUMNS.items()
+        }
+
+    def history(self, bin_id, start, end=None):
+        pos = self.bin_positions([bin_id])[0]
+        rows = self.readings(start, end, bin_pos=pos)
+        order = np.argsort(rows['ts'], kind='stable')
+        return pd.DataFrame({
+            'Time': pd.to_datetime(rows['ts'][order], unit='s', utc=True),
+            'Fill_Level': rows['fill'][order],
+        })
+
+    def partitions(self):
+        return sorted(d for d in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, d)))
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+# Width assumed for a full-width chart, and the closest two plotted points may sit;
+# together they cap the points per series sent to the browser
+CHART_WIDTH_PX = 1200
+MIN_POINT_SPACING_PX = 2
+
+
+def point_budget(span, resolution, width_px=CHART_WIDTH_PX):
+    """Points per series worth plotting for ``span`` of data at ``resolution`` (timedeltas).
+
+    Every point while they fit the chart at MIN_POINT_SPACING_PX apart, so
+    a week of hourly data is drawn in full and a quarter is downsampled.
+    """
+    return int(min(span / resolution, width_px / MIN_POINT_SPACING_PX))
+
+
+def lttb_indices(x, y, target):
+    """Largest-Triangle-Three-Buckets: indices of ``target`` representative points.
+
+    Keeps the first and last points and, for every bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket, which preserves peaks and troughs.
+    """
+    n = len(x)
+    if target >= n or target < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, target - 1).astype(np.int64)
+    # Averages of every bucket, used as the third vertex for the bucket before it
+    avg_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / np.diff(edges)
+    avg_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / np.diff(edges)
+    avg_x = np.r_[avg_x[1:], x[-1]]
+    avg_y = np.r_[avg_y[1:], y[-1]]
+
+    picked = np.empty(target, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(target - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - avg_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        picked[i + 1] = a
+    return picked
+
+
+def minmax_indices(y, target):
+    # Min and max of each of target/2 buckets, in original order; cheaper than LTTB
+    n = len(y)
+    if target >= n or target < 4:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    buckets = target // 2
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    width = int((ends - starts).max())
+    # Pad buckets to a common width so argmin/argmax run on a 2-D view
+    offsets = starts[:, None] + np.arange(width)[None, :]
+    valid = offsets < ends[:, None]
+    offsets = np.minimum(offsets, n - 1)
+    values = y[offsets]
+    lo = np.where(valid, values, np.inf).argmin(axis=1)
+    hi = np.where(valid, values, -np.inf).argmax(axis=1)
+    rows = np.arange(buckets)
+    return np.unique(np.r_[offsets[rows, lo], offsets[rows, hi]])
+
+
+def prepare_series(frame, x, columns, target_points, method='lttb'):
+    """Downsample each of ``columns`` against ``x`` into a long frame.
+
+    Returns columns [x, 'Series', 'Value'] with at most ``target_points``
+    rows per series, ready for ``px.line(..., color='Series')``. ``method``
+    'minmax' keeps every bucket's extremes, for spiky series whose peaks
+    must survive; 'lttb' keeps the overall shape.
+    """
+    frame = frame.sort_values(x)
+    xs = frame[x]
+    x_numeric = xs.astype('int64').to_numpy() if pd.api.types.is_datetime64_any_dtype(xs) else xs.to_numpy()
+    parts = []
+    for column in columns:
+        y = frame[column].to_numpy()
+        if method == 'minmax':
+            idx = minmax_indices(y, target_points)
+        else:
+            idx = lttb_indices(x_numeric, y, target_points)
+        parts.append(pd.DataFrame({x: xs.to_numpy()[idx], 'Series': column, 'Value': y[idx]}))
+    return pd.concat(parts, ignore_index=True)
@@ -0,0 +1,216 @@
+import hashlib
+import os
+import threading
+import zipfile
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from queue import Empty, Queue
+
+import numpy as np
+from PIL import Image
+
+MODEL_PATH = os.environ.get(
+    'SWMS_MODEL_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'waste_classifier.onnx')
+)
+
+# Output order of the model's logits
+WASTE_TYPES = ["Organic", "Recyclable Plastic", "Glass", "Metal", "Paper", "Hazardous"]
+
+RECYCLING_TIPS = {
+    "Organic": "🌱 Compost this waste to create nutrient-rich soil!",
+    "Recyclable Plastic": "♻️ Clean and put in recyclable bin. Remove caps and labels.",
+    "Glass": "🥃 Rinse and recycle. Glass can be recycled indefinitely!",
+    "Metal": "🔧 Metal is valuable! Clean and recycle for cash rewards.",
+    "Paper": "📄 Keep dry and clean. Paper can be recycled 5-7 times.",
+    "Hazardous": "⚠️ Take to special disposal center. Don't put in regular bins!"
+}
+
+# ImageNet normalisation used when the model was trained
+MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+INPUT_SIZE = 224
+
+MAX_BATCH = 16
+MAX_WAIT_SECONDS = 0.02
+RESULT_CACHE_SIZE = 4096
+
+# Bulk mode: decode workers and the most images held in memory at once
+BULK_WORKERS = 4
+BULK_MAX_IN_FLIGHT = 32
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+class ClassifierUnavailable(RuntimeError):
+    pass
+
+
+def image_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def preprocess(image, size=INPUT_SIZE):
+    # PIL image -> normalised float32 CHW array at the model resolution.
+    # draft() lets JPEGs decode at a reduced scale before the final resample
+    image.draft('RGB', (size, size))
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    image = image.resize((size, size), Image.BILINEAR, reducing_gap=2.0)
+    pixels = np.asarray(image, dtype=np.float32) / 255.0
+    return ((pixels - MEAN) / STD).transpose(2, 0, 1)
+
+
+def decode(data, size=INPUT_SIZE):
+    return preprocess(Image.open(BytesIO(data)), size)
+
+
+def softmax(logits):
+    z = logits - logits.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+class WasteClassifier:
+    """CPU ONNX Runtime classifier fed by a micro-batching queue.
+
+    Concurrent ``classify`` calls from different sessions are collected for
+    up to ``max_wait`` seconds (or ``max_batch`` images) and run as one
+    batch. Results are cached by the SHA-256 of the uploaded bytes.
+    """
+
+    def __init__(self, model_path=MODEL_PATH, max_batch=MAX_BATCH, max_wait=MAX_WAIT_SECONDS,
+                 cache_size=RESULT_CACHE_SIZE):
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ClassifierUnavailable("onnxruntime is not installed") from None
+        if not os.path.exists(model_path):
+            raise ClassifierUnavailable(f"Model file not found: {model_path}")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        height, width = model_input.shape[2:4]
+        self.input_size = height if isinstance(height, int) else INPUT_SIZE
+        # Models exported with a fixed batch dimension can only take one image at a time
+        self.max_batch = max_batch if not isinstance(model_input.shape[0], int) else model_input.shape[0]
+        self.max_wait = max_wait
+
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
+        self._queue = Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True, name='classifier-batcher')
+        self._worker.start()
+
+    def _cached(self, digest):
+        with self._cache_lock:
+            result = self._cache.get(digest)
+            if result is not None:
+                self._cache.move_to_end(digest)
+            return result
+
+    def _remember(self, digest, result):
+        with self._cache_lock:
+            self._cache[digest] = result
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self.max_batch:
+                    batch.append(self._queue.get(timeout=self.max_wait))
+            except Empty:
+                pass
+            try:
+                inputs = np.stack([tensor for tensor, _ in batch])
+                probs = softmax(self.session.run(None, {self.input_name: inputs})[0])
+                for (_, future), row in zip(batch, probs):
+                    future.set_result(row)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def submit(self, tensor):
+        future = Future()
+        self._queue.put((tensor, future))
+        return future
+
+    def classify(self, data, timeout=30):
+        """Classify raw image bytes; returns (label, confidence, probabilities)."""
+        digest = image_digest(data)
+        probs = self._cached(digest)
+        if probs is None:
+            probs = self.submit(decode(data, self.input_size)).result(timeout=timeout)
+            self._remember(digest, probs)
+        best = int(np.argmax(probs))
+        return WASTE_TYPES[best], float(probs[best]), dict(zip(WASTE_TYPES, probs.tolist()))
+
+
+def bulk_items(uploaded_files):
+    """Expand uploads (images and zip archives) into (count, iterator of (name, bytes)).
+
+    Zip members are read one at a time, so only the images currently in the
+    pipeline are held in memory.
+    """
+    sources = []
+    total = 0
+    for upload in uploaded_files:
+        if upload.name.lower().endswith('.zip'):
+            archive = zipfile.ZipFile(upload)
+            members = [m for m in archive.infolist()
+                       if not m.is_dir() and m.filename.lower().endswith(IMAGE_EXTENSIONS)]
+            sources.append((archive, members))
+            total += len(members)
+        else:
+            sources.append((None, [upload]))
+            total += 1
+
+    def items():
+        for archive, members in sources:
+            for member in members:
+                if archive is None:
+                    yield member.name, member.getvalue()
+                else:
+                    yield member.filename, archive.read(member)
+            if archive is not None:
+                archive.close()
+    return total, items()
+
+
+def classify_stream(classifier, items, workers=BULK_WORKERS, max_in_flight=BULK_MAX_IN_FLIGHT):
+    """Pipeline decode -> resize -> classify over a thread pool.
+
+    Yields (name, label, confidence, error) in input order. At most
+    ``max_in_flight`` images are pending at any time regardless of how many
+    are uploaded; the workers' concurrent requests are what fill the
+    classifier's micro-batches.
+    """
+    def work(data):
+        label, confidence, _ = classifier.classify(data)
+        return label, confidence
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bulk-classify') as pool:
+        for name, data in items:
+            pending.append((name, pool.submit(work, data)))
+            del data
+            while len(pending) >= max_in_flight:
+                yield _collect(*pending.popleft())
+        while pending:
+            yield _collect(*pending.popleft())
+
+
+def _collect(name, future):
+    try:
+        label, confidence = future.result()
+        return name, label, confidence, ''
+    except Exception as e:
+        return name, '', float('nan'), str(e)
@@ -0,0 +1,407 @@
+import bisect
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from db import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedule_rules (
+    id INTEGER PRIMARY KEY,
+    ward TEXT NOT NULL,
+    waste_type TEXT NOT NULL,
+    weekdays INTEGER NOT NULL CHECK (weekdays BETWEEN 1 AND 127),
+    every_weeks INTEGER NOT NULL DEFAULT 1 CHECK (every_weeks >= 1),
+    start_time TEXT NOT NULL,
+    valid_from TEXT NOT NULL,
+    valid_until TEXT
+);
+
+CREATE TABLE IF NOT EXISTS schedule_holidays (
+    date TEXT NOT NULL,
+    ward TEXT NOT NULL DEFAULT '',
+    name TEXT NOT NULL,
+    shift_days INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (date, ward)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS schedule_exceptions (
+    id INTEGER PRIMARY KEY,
+    ward TEXT NOT NULL,
+    waste_type TEXT NOT NULL,
+    date TEXT NOT NULL,
+    kind TEXT NOT NULL CHECK (kind IN ('cancel', 'extra')),
+    start_time TEXT,
+    note TEXT NOT NULL DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS ward_addresses (
+    address_key TEXT PRIMARY KEY,
+    ward TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS schedule_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO schedule_version (id, version) VALUES (1, 0);
+"""
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+# Days ahead precomputed per ward; next_pickup looks no further than this
+CALENDAR_DAYS = 60
+# How often a process checks whether another one changed the rules
+REFRESH_SECONDS = 60
+# Addresses per insert transaction when bulk loading
+ADDRESS_BATCH_SIZE = 10_000
+
+Pickup = namedtuple('Pickup', ['date', 'minute', 'waste_type', 'note'])
+
+
+def weekday_mask(days):
+    # ['Monday', 'Thursday'] -> bit mask with bit 0 for Monday
+    return sum(1 << DAYS.index(day) for day in days)
+
+
+def parse_time(text):
+    hours, minutes = text.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def format_time(minute):
+    return datetime(2000, 1, 1, minute // 60, minute % 60).strftime('%I:%M %p').lstrip('0')
+
+
+def address_key(address):
+    return ' '.join(address.casefold().replace(',', ' ').split())
+
+
+class IntervalIndex:
+    """Static index of closed integer intervals answering overlap queries.
+
+    Intervals are sorted by start alongside a running maximum of their
+    ends, so a query bisects to the last interval starting inside the range
+    and walks back only while an earlier interval could still reach it.
+    """
+
+    def __init__(self, intervals):
+        # intervals: (start, end, value) with start <= end
+        intervals = sorted(intervals, key=lambda interval: interval[0])
+        self._starts = [start for start, _, _ in intervals]
+        self._intervals = intervals
+        self._reach = []
+        reach = None
+        for _, end, _ in intervals:
+            reach = end if reach is None else max(reach, end)
+            self._reach.append(reach)
+
+    def __len__(self):
+        return len(self._intervals)
+
+    def overlapping(self, start, end):
+        # Values of intervals sharing at least one point with [start, end]
+        found = []
+        i = bisect.bisect_right(self._starts, end) - 1
+        while i >= 0 and self._reach[i] >= start:
+            if self._intervals[i][1] >= start:
+                found.append(self._intervals[i][2])
+            i -= 1
+        found.reverse()
+        return found
+
+
+class WardCalendar:
+    """Pickups of one ward over a fixed window, with a per-day jump table.
+
+    ``first[d]`` is the position of the first pickup on or after day ``d``
+    of the window, so finding the next pickup skips straight to its day and
+    only steps over the few earlier pickups of that same day.
+    """
+
+    def __init__(self, start, days, pickups):
+        self.start = start.toordinal()
+        self.days = days
+        self.pickups = pickups
+        ordinals = [pickup.date.toordinal() for pickup in pickups]
+        self.first = [bisect.bisect_left(ordinals, self.start + d) for d in range(days + 1)]
+
+    def covers(self, day):
+        # Only the first half of the window, so a next pickup weeks away is still inside it
+        return 0 <= day.toordinal() - self.start < self.days // 2
+
+    def next_pickup(self, now):
+        offset = now.date().toordinal() - self.start
+        minute = now.hour * 60 + now.minute
+        i = self.first[offset]
+        while i < len(self.pickups) and self.pickups[i].date == now.date() and self.pickups[i].minute < minute:
+            i += 1
+        return self.pickups[i] if i < len(self.pickups) else None
+
+    def on(self, day):
+        offset = day.toordinal() - self.start
+        return self.pickups[self.first[offset]:self.first[offset + 1]]
+
+
+class CollectionSchedule:
+    """Recurring collection rules per ward and waste type.
+
+    A rule collects one waste type in one ward on a set of weekdays, every
+    ``every_weeks`` weeks counted from ``valid_from``, at a fixed local time.
+    Holidays cancel or postpone the pickups falling on them, city-wide or
+    for one ward, and dated exceptions cancel a pickup or add an extra one.
+
+    ``pickups`` expands the rules for any date range, looking rules up in
+    an interval index of their validity. For the next ``CALENDAR_DAYS`` days
+    every ward's pickups are also precomputed into a ``WardCalendar``, so
+    ``next_pickup`` does not depend on the number of rules or addresses.
+    Addresses map to wards through a bulk-loaded table held in a dict.
+    """
+
+    def __init__(self, db=None, calendar_days=CALENDAR_DAYS):
+        self.db = db or Database()
+        self.db.ensure_schema(SCHEMA)
+        self.calendar_days = calendar_days
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = 0.0
+        self._addresses = None
+        self._load()
+
+    def __len__(self):
+        return sum(len(rules) for rules in self._rules.values())
+
+    @property
+    def wards(self):
+        return sorted(self._rules)
+
+    # Rules, holidays and exceptions
+
+    def add_rule(self, ward, waste_type, weekdays, start_time, every_weeks=1, valid_from=None, valid_until=None):
+        # weekdays: day names or a bit mask with bit 0 for Monday; dates are ISO strings or dates
+        mask = weekdays if isinstance(weekdays, int) else weekday_mask(weekdays)
+        parse_time(start_time)
+        with self._write() as conn:
+            return conn.execute(
+                "INSERT INTO schedule_rules (ward, waste_type, weekdays, every_weeks, start_time, valid_from, valid_until) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (ward, waste_type, mask, every_weeks, start_time, str(valid_from or date.today()),
+                 None if valid_until is None else str(valid_until)),
+            ).lastrowid
+
+    def end_rule(self, rule_id, last_day):
+        # Rules are retired rather than deleted, so past pickups still expand
+        with self._write() as conn:
+            conn.execute("UPDATE schedule_rules SET valid_until = ? WHERE id = ?", (str(last_day), rule_id))
+
+    def add_holiday(self, day, name, shift_days=0, ward=''):
+        # shift_days=0 cancels the day's pickups; otherwise they move that many days later
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO schedule_holidays (date, ward, name, shift_days) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (date, ward) DO UPDATE SET name = excluded.name, shift_days = excluded.shift_days",
+                (str(day), ward, name, shift_days),
+            )
+
+    def cancel_pickup(self, ward, waste_type, day, note=''):
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO schedule_exceptions (ward, waste_type, date, kind, note) VALUES (?, ?, ?, 'cancel', ?)",
+                (ward, waste_type, str(day), note),
+            )
+
+    def add_extra_pickup(self, ward, waste_type, day, start_time, note=''):
+        parse_time(start_time)
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO schedule_exceptions (ward, waste_type, date, kind, start_time, note) "
+                "VALUES (?, ?, ?, 'extra', ?, ?)",
+                (ward, waste_type, str(day), start_time, note),
+            )
+
+    def holidays(self, start, end):
+        # (date, ward, name, shift_days) in [start, end], ward '' for city-wide
+        return sorted((day, ward, name, shift) for (ward, day), (name, shift) in self._holidays.items()
+                      if start <= day <= end)
+
+    # Addresses
+
+    def load_addresses(self, rows, batch_size=ADDRESS_BATCH_SIZE):
+        """Bulk load ``(address, ward)`` pairs, replacing earlier entries for the same address."""
+        batch, count = [], 0
+        for address, ward in rows:
+            batch.append((address_key(address), ward))
+            if len(batch) >= batch_size:
+                with self.db.transaction() as conn:
+                    self._insert_addresses(conn, batch)
+                count, batch = count + len(batch), []
+        # The last batch bumps the version, so every process rereads the table
+        with self._write() as conn:
+            self._insert_addresses(conn, batch)
+        return count + len(batch)
+
+    @staticmethod
+    def _insert_addresses(conn, batch):
+        conn.executemany(
+            "INSERT INTO ward_addresses (address_key, ward) VALUES (?, ?) "
+            "ON CONFLICT (address_key) DO UPDATE SET ward = excluded.ward",
+            batch,
+        )
+
+    def ward_for_address(self, address, default=None):
+        # Exact match on the normalised address first, then a ward named in it
+        self._refresh()
+        if self._addresses is None:
+            with self._lock:
+                if self._addresses is None:
+                    with self.db.connection() as conn:
+                        self._addresses = dict(conn.execute("SELECT address_key, ward FROM ward_addresses"))
+        key = address_key(address or '')
+        ward = self._addresses.get(key)
+        if ward is None:
+            ward = next((w for w in self._rules if f" {address_key(w)} " in f" {key} "), default)
+        return ward
+
+    # Queries
+
+    def pickups(self, ward, start, end, waste_type=None):
+        """Pickups in ``ward`` from ``start`` to ``end`` (dates, inclusive), in time order."""
+        self._refresh()
+        return self._expand(ward, start, end, waste_type)
+
+    def next_pickup(self, ward, now=None, waste_type=None):
+        # The first pickup at or after ``now`` (local time) within CALENDAR_DAYS, or None
+        self._refresh()
+        now = now or datetime.now()
+        calendar = self._calendar(ward, waste_type, now.date())
+        if calendar is not None:
+            return calendar.next_pickup(now)
+        # Outside the precomputed window: expand the rules directly
+        minute = now.hour * 60 + now.minute
+        upcoming = self._expand(ward, now.date(), now.date() + timedelta(days=self.calendar_days - 1), waste_type)
+        return next((p for p in upcoming if p.date > now.date() or p.minute >= minute), None)
+
+    def next_pickup_for_address(self, address, now=None, waste_type=None):
+        ward = self.ward_for_address(address)
+        return None if ward is None else self.next_pickup(ward, now, waste_type)
+
+    def day_pickups(self, day):
+        # {ward: pickups on ``day``} for the wards collecting that day
+        self._refresh()
+        by_ward = {}
+        for ward in self._rules:
+            calendar = self._calendar(ward, None, day)
+            pickups = calendar.on(day) if calendar else self._expand(ward, day, day)
+            if pickups:
+                by_ward[ward] = pickups
+        return by_ward
+
+    # Expansion
+
+    def _expand(self, ward, start, end, waste_type=None):
+        # Holidays can push a pickup from before ``start`` into the range, so rules are expanded from earlier
+        first, last = start.toordinal() - self._max_shift, end.toordinal()
+        rules = self._rules.get(ward)
+        pickups = []
+        for rule in (rules.overlapping(first, last) if rules else ()):
+            if waste_type is not None and rule['waste_type'] != waste_type:
+                continue
+            # Week numbers count from the Monday of the week the rule starts in
+            anchor = rule['from'] - date.fromordinal(rule['from']).weekday()
+            for ordinal in range(max(first, rule['from']), min(last, rule['until']) + 1):
+                if not rule['weekdays'] >> date.fromordinal(ordinal).weekday() & 1:
+                    continue
+                if (ordinal - anchor) // 7 % rule['every_weeks']:
+                    continue
+                day, note = date.fromordinal(ordinal), ''
+                holiday = self._holidays.get((ward, day)) or self._holidays.get(('', day))
+                if holiday:
+                    name, shift = holiday
+                    if not shift:
+                        continue
+                    day, note = day + timedelta(days=shift), f"moved from {day:%d/%m} for {name}"
+                if start <= day <= end:
+                    pickups.append(Pickup(day, rule['minute'], rule['waste_type'], note))
+
+        for day, exceptions in self._exceptions.get(ward, {}).items():
+            if not start <= day <= end:
+                continue
+            for kind, exception_type, minute, note in exceptions:
+                if waste_type is not None and exception_type != waste_type:
+                    continue
+                if kind == 'cancel':
+                    pickups = [p for p in pickups if not (p.date == day and p.waste_type == exception_type)]
+                else:
+                    pickups.append(Pickup(day, minute, exception_type, note))
+        pickups.sort(key=lambda pickup: (pickup.date, pickup.minute, pickup.waste_type))
+        return pickups
+
+    def _calendar(self, ward, waste_type, day):
+        # The ward's precomputed calendar if it covers ``day``; rebuilt once the window has moved on
+        calendars = self._calendars
+        calendar = calendars.get((ward, waste_type))
+        if calendar is not None and calendar.covers(day):
+            return calendar
+        if ward not in self._rules:
+            return None
+        today = date.today()
+        if not today <= day < today + timedelta(days=self.calendar_days // 2):
+            return None
+        with self._lock:
+            calendar = WardCalendar(today, self.calendar_days,
+                                    self._expand(ward, today, today + timedelta(days=self.calendar_days - 1), waste_type))
+            self._calendars = {**self._calendars, (ward, waste_type): calendar}
+        return calendar
+
+    # Loading
+
+    @contextmanager
+    def _write(self):
+        # Every change bumps the version, so other processes reload within REFRESH_SECONDS
+        with self.db.transaction() as conn:
+            conn.execute("UPDATE schedule_version SET version = version + 1 WHERE id = 1")
+            yield conn
+        self._load()
+
+    def _refresh(self):
+        now = time.monotonic()
+        if now - self._checked_at < REFRESH_SECONDS:
+            return
+        self._checked_at = now
+        with self.db.connection() as conn:
+            version = conn.execute("SELECT version FROM schedule_version WHERE id = 1").fetchone()[0]
+        if version != self._version:
+            self._load()
+
+    def _load(self):
+        with self.db.connection() as conn:
+            version = conn.execute("SELECT version FROM schedule_version WHERE id = 1").fetchone()[0]
+            rules = conn.execute("SELECT * FROM schedule_rules").fetchall()
+            holidays = conn.execute("SELECT date, ward, name, shift_days FROM schedule_holidays").fetchall()
+            exceptions = conn.execute(
+                "SELECT ward, waste_type, date, kind, start_time, note FROM schedule_exceptions ORDER BY id"
+            ).fetchall()
+
+        by_ward = {}
+        for row in rules:
+            start = date.fromisoformat(row['valid_from']).toordinal()
+            end = date.fromisoformat(row['valid_until']).toordinal() if row['valid_until'] else date.max.toordinal()
+            by_ward.setdefault(row['ward'], []).append((start, end, {
+                'waste_type': row['waste_type'], 'weekdays': row['weekdays'], 'every_weeks': row['every_weeks'],
+                'minute': parse_time(row['start_time']), 'from': start, 'until': end,
+            }))
+        by_day = {}
+        for ward, waste_type, day, kind, start_time, note in exceptions:
+            by_day.setdefault(ward, {}).setdefault(date.fromisoformat(day), []).append(
+                (kind, waste_type, parse_time(start_time) if start_time else None, note))
+
+        with self._lock:
+            self._rules = {ward: IntervalIndex(intervals) for ward, intervals in by_ward.items()}
+            self._holidays = {(ward, date.fromisoformat(day)): (name, shift) for day, ward, name, shift in holidays}
+            self._exceptions = by_day
+            self._max_shift = max((shift for _, shift in self._holidays.values()), default=0)
+            self._calendars = {}
+            self._addresses = None
+            self._version = version
+            self._checked_at = time.monotonic()
@@ -0,0 +1,11 @@
+import os
+
+# Root for everything the app persists (telemetry, caches, databases)
+DATA_DIR = os.environ.get(
+    'SWMS_DATA_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+)
+
+# Seed empty stores with the Bhavnagar demo data (bins, wards, schedule, collections).
+# Off by default so a deployment never mixes synthetic records into its database.
+DEMO_DATA = os.environ.get('SWMS_DEMO_DATA', '') == '1'
@@ -0,0 +1,612 @@
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from analytics import WASTE_TYPES, CollectionAnalytics
+from bin_store import BinStore, to_epoch
+from charts import CHART_WIDTH_PX, point_budget, prepare_series
+from collection_schedule import CollectionSchedule, format_time
+from config import DEMO_DATA
+from forecasting import FillForecaster, forecast_frame
+from geo import GridIndex, SpatialIndex, read_points
+from leaderboard import Leaderboard
+from metrics import timed
+from fleet import FleetTracker, PositionSimulator, UDPPositionListener
+from notifier import NotificationWorker
+from resources import get_accounts, get_database, get_notifications
+from routing import plan_routes, route_summary
+from tickets import KINDS, PRIORITIES, STATUSES, TicketStore
+
+# plotly and the classifier (PIL, onnxruntime) are imported inside the functions
+# that use them, so pages without charts or image uploads never load them
+
+# Per-dataset cache settings: (ttl in seconds, max cached entries)
+CACHE_POLICY = {
+    'bins': (60, 8),
+    'trucks': (30, 4),
+    'routes': (60, 4),
+    'forecast': (60, 4),
+    'schedule': (3600, 4),
+    'activity': (600, 256),
+    'analytics': (300, 16),
+    'reports': (120, 16),
+}
+
+# Demo bins used to seed an empty telemetry store when config.DEMO_DATA is on
+DEMO_BINS = [
+    {'bin_id': 'BIN001', 'location': 'Gyanmanjari University', 'lat': 21.7513, 'lon': 72.1052, 'fill': 25},
+    {'bin_id': 'BIN002', 'location': 'Takhteshwar Temple', 'lat': 21.7617, 'lon': 72.1437, 'fill': 67},
+    {'bin_id': 'BIN003', 'location': 'Darbargadh', 'lat': 21.7724, 'lon': 72.1508, 'fill': 89},
+    {'bin_id': 'BIN004', 'location': 'Bhavnagar Port', 'lat': 21.7466, 'lon': 72.2197, 'fill': 45},
+    {'bin_id': 'BIN005', 'location': 'Nilambag Palace', 'lat': 21.7697, 'lon': 72.1424, 'fill': 23},
+]
+
+# Readings replayed into the forecaster on startup
+FORECAST_WARMUP_DAYS = 7
+# Bins forecast to overflow within this many hours raise an alert and are collected early
+OVERFLOW_ALERT_HOURS = 24
+
+# Chart ranges offered on the admin dashboard, in days; longer ranges read
+# coarser rollups and every series is downsampled to the chart's point budget
+CHART_RANGES = {'Last 7 days': 7, 'Last 30 days': 30, 'Last 90 days': 90, 'Last year': 365}
+HOURLY_MAX_DAYS = 90
+# Engagement chart bars counted from the points ledger: activity -> GLOBs over the entry's reason
+ENGAGEMENT_LEDGER_REASONS = {
+    'Games Played': ('Recycling quiz', 'Lucky spinner'),
+    'Rewards Redeemed': ('Redeemed *',),
+    'AI Classifications': ('AI sorting',),
+}
+
+# Wards used for demo collection records (seeded only when config.DEMO_DATA is on)
+DEMO_WARDS = ['Takhteshwar', 'Vadva', 'Kaliyabid', 'Chitra', 'Krishnanagar', 'Bortalav']
+
+# Collection rules seeded for every demo ward: (waste type, weekdays, start time).
+# Recyclables alternate between two day sets from ward to ward, so one truck serves neighbours.
+DEMO_RULES = [
+    ('Organic', ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'], '08:00'),
+    ('Recyclable', (['Monday', 'Wednesday', 'Friday'], ['Tuesday', 'Thursday', 'Saturday']), '10:00'),
+    ('Hazardous', ['Saturday'], '14:00'),
+]
+# Fixed-date public holidays (MM-DD); their pickups move to the next day
+DEMO_HOLIDAYS = {'01-26': 'Republic Day', '08-15': 'Independence Day', '10-02': 'Gandhi Jayanti'}
+# Ward assumed for addresses that match no known ward; without demo data they have none
+DEFAULT_WARD = DEMO_WARDS[0] if DEMO_DATA else None
+# Demo ward boundaries: DEMO_WARDS laid out row by row over this box (south, west, north, east)
+DEMO_WARD_BOX = (21.735, 72.095, 21.790, 72.230)
+DEMO_WARD_COLUMNS = 3
+# Residents within this distance of a bin get its full alerts
+BIN_ALERT_RADIUS_KM = 1.0
+# Nearby bins listed on the schedule page
+NEARBY_BINS = 3
+# Days shown on the schedule page
+SCHEDULE_DAYS = 7
+# Local hour after which tomorrow's pickup reminder goes out
+PICKUP_REMINDER_HOUR = 18
+
+# Municipal depot every demo truck is dispatched from
+DEPOT = (21.7645, 72.1519)
+
+# Depot-side start positions of the demo fleet
+DEMO_TRUCKS = {
+    'TRK001': (21.7513, 72.1052),
+    'TRK002': (21.7617, 72.1437),
+    'TRK003': (21.7724, 72.1508),
+    'TRK004': (21.7466, 72.2197),
+}
+
+# Bin fill classification: levels below each threshold fall in that status
+BIN_STATUSES = np.array(['Empty', 'Half', 'Full'])
+BIN_STATUS_THRESHOLDS = [40, 80]
+
+# Loaders registered per dataset so invalidate() can clear them together
+_LOADERS = {name: [] for name in CACHE_POLICY}
+
+
+def cached(dataset, kind='loader'):
+    # kind labels the timings of cache misses: 'loader' for frames, 'chart' for figures
+    ttl, max_entries = CACHE_POLICY[dataset]
+
+    def decorator(func):
+        loader = st.cache_data(ttl=ttl, max_entries=max_entries, show_spinner=False)(timed(kind)(func))
+        _LOADERS[dataset].append(loader)
+        return loader
+    return decorator
+
+
+def invalidate(*datasets):
+    # Drop cached results for the given datasets (all of them when none given)
+    for name in datasets or tuple(_LOADERS):
+        for loader in _LOADERS[name]:
+            loader.clear()
+
+
+def classify_fill_levels(fill_levels):
+    return BIN_STATUSES[np.digitize(np.asarray(fill_levels), BIN_STATUS_THRESHOLDS)]
+
+
+@st.cache_resource
+def get_bin_store():
+    store = BinStore()
+    if DEMO_DATA and len(store) == 0:
+        store.register_bins(DEMO_BINS)
+        # A day of hourly readings ramping up to each demo bin's current level
+        now = int(time.time())
+        hours = np.arange(-24, 1)
+        ids = [b['bin_id'] for b in DEMO_BINS for _ in hours]
+        fills = [b['fill'] * (h + 30) / 30 for b in DEMO_BINS for h in hours]
+        stamps = [now + h * 3600 for _ in DEMO_BINS for h in hours]
+        store.append(ids, fills, stamps)
+    return store
+
+
+@st.cache_resource
+def get_forecaster():
+    store = get_bin_store()
+    forecaster = FillForecaster(len(store))
+    rows = store.readings(int(time.time()) - FORECAST_WARMUP_DAYS * 86400)
+    forecaster.update(rows['bin'], rows['ts'], rows['fill'])
+    return forecaster
+
+
+def record_bin_readings(bin_ids, fill_levels, timestamps=None):
+    store = get_bin_store()
+    if timestamps is None:
+        timestamps = [int(time.time())] * len(bin_ids)
+    timestamps = [to_epoch(t) for t in timestamps]
+    count = store.append(bin_ids, fill_levels, timestamps)
+    get_forecaster().update(store.bin_positions(bin_ids), timestamps, fill_levels)
+    invalidate('bins', 'routes', 'forecast')
+    return count
+
+
+@cached('forecast')
+def load_fill_forecast():
+    return forecast_frame(get_forecaster(), get_bin_store().bins, now=time.time())
+
+
+def register_bins(source):
+    # Bulk-register bins from GeoJSON Point features or a CSV file with bin_id, location, lat and lon
+    get_bin_store().register_bins(
+        {'bin_id': p['bin_id'], 'location': p.get('location', ''), 'lat': p['lat'], 'lon': p['lon']}
+        for p in read_points(source)
+    )
+    invalidate('bins', 'routes', 'forecast')
+
+
+@cached('bins')
+def load_bin_status():
+    bin_data = get_bin_store().latest()
+    bin_data['Status'] = classify_fill_levels(bin_data['Fill_Level'].to_numpy())
+    return bin_data
+
+
+@st.cache_resource
+def get_fleet():
+    # Live positions come from UDP when SWMS_GPS_UDP_PORT is set, otherwise
+    # from the built-in simulator (SWMS_SIM_TRUCKS adds synthetic trucks)
+    tracker = FleetTracker()
+    udp_port = os.environ.get('SWMS_GPS_UDP_PORT')
+    if udp_port:
+        UDPPositionListener(tracker, port=int(udp_port)).start()
+    else:
+        start_positions = dict(DEMO_TRUCKS)
+        rng = np.random.default_rng(0)
+        for i in range(int(os.environ.get('SWMS_SIM_TRUCKS', 0))):
+            start_positions[f'SIM{i:04d}'] = (21.7645 + rng.normal(0, 0.02), 72.1519 + rng.normal(0, 0.02))
+        simulator = PositionSimulator(tracker, start_positions)
+        # First fixes synchronously so the fleet is populated on the first render
+        simulator.tick()
+        simulator.start()
+    return tracker
+
+
+def pickup_reminder_events(spatial, schedule, accounts, service, now=None):
+    # Tomorrow's collections, announced once the evening before to the users of each collecting ward
+    now = now or datetime.now()
+    if now.hour < PICKUP_REMINDER_HOUR:
+        return []
+    tomorrow = now.date() + timedelta(days=1)
+    due = {ward: pickups for ward, pickups in schedule.day_pickups(tomorrow).items()
+           if not service.published(f"pickup:{ward}:{tomorrow.isoformat()}")}
+    if not due:
+        return []
+    users = {}
+    for user_id, address in accounts.addresses().items():
+        users.setdefault(address_ward(address, spatial, schedule), []).append(user_id)
+    return [{'topic': 'pickup_reminders', 'kind': 'info', 'title': "Pickup Tomorrow",
+             'message': f"{tomorrow:%A}'s collections in {ward}: "
+                        + ", ".join(f"{p.waste_type} at {format_time(p.minute)}" for p in pickups),
+             'dedup_key': f"pickup:{ward}:{tomorrow.isoformat()}", 'user_ids': users[ward]}
+            for ward, pickups in due.items() if ward in users]
+
+
+def overflow_alert_events(forecaster, store, spatial, schedule, accounts, service, now=None):
+    # One alert per bin and day while the bin is forecast to overflow, sent to the residents around it
+    now = now or time.time()
+    forecast = forecast_frame(forecaster, store.bins, now=now)
+    due = forecast[forecast['Hours_To_Full'] <= OVERFLOW_ALERT_HOURS]
+    day = datetime.fromtimestamp(now).date().isoformat()
+    due = due[[not service.published(f"bin_full:{bin_id}:{day}") for bin_id in due['Bin_ID']]]
+    if due.empty:
+        return []
+    residents = Residents(accounts.addresses(), spatial, schedule)
+    positions = store.bin_positions(due['Bin_ID'])
+    return [{'topic': 'bin_alerts', 'kind': 'warning', 'title': "Bin Full Alert",
+             'message': f"Bin {a.Bin_ID} at {a.Location} near you is {a.Fill_Level:.0f}% full"
+                        + (" and needs emptying now" if a.Hours_To_Full == 0
+                           else f" and expected to overflow in about {max(1, round(a.Hours_To_Full))} h"),
+             'dedup_key': f"bin_full:{a.Bin_ID}:{day}",
+             'user_ids': residents.near(store.bins[pos].get('lat'), store.bins[pos].get('lon'))}
+            for a, pos in zip(due.itertuples(), positions)]
+
+
+class Residents:
+    """Where users live: geocoded addresses in a grid index, the rest by ward only."""
+
+    def __init__(self, addresses, spatial, schedule):
+        located, self._by_ward = [], {}
+        for user_id, address in addresses.items():
+            point = spatial.locate(address)
+            if point is None:
+                self._by_ward.setdefault(address_ward(address, spatial, schedule), []).append(user_id)
+            else:
+                located.append((user_id, *point))
+        self._ids = [user_id for user_id, _, _ in located]
+        self._index = GridIndex([lat for _, lat, _ in located], [lon for _, _, lon in located])
+        self._spatial = spatial
+
+    def near(self, lat, lon, radius_km=BIN_ALERT_RADIUS_KM):
+        # Geocoded users within the radius, plus users without coordinates in the same ward
+        if lat is None or lon is None:
+            return []
+        nearby = [self._ids[i] for i, _ in self._index.within(lat, lon, radius_km)]
+        return nearby + self._by_ward.get(self._spatial.ward_at(lat, lon), [])
+
+
+@st.cache_resource
+def get_notification_worker():
+    # Sources get the forecaster and store directly: the worker thread has no script context
+    forecaster, store, schedule = get_forecaster(), get_bin_store(), get_schedule()
+    spatial, accounts, service = get_spatial_index(), get_accounts(), get_notifications()
+    worker = NotificationWorker(service, [
+        lambda: pickup_reminder_events(spatial, schedule, accounts, service),
+        lambda: overflow_alert_events(forecaster, store, spatial, schedule, accounts, service),
+    ])
+    worker.start()
+    return worker
+
+
+@st.cache_resource
+def get_schedule():
+    schedule = CollectionSchedule(get_database())
+    if DEMO_DATA and len(schedule) == 0:
+        start = date.today().replace(month=1, day=1)
+        for i, ward in enumerate(DEMO_WARDS):
+            for waste_type, weekdays, start_time in DEMO_RULES:
+                if isinstance(weekdays, tuple):
+                    weekdays = weekdays[i % len(weekdays)]
+                schedule.add_rule(ward, waste_type, weekdays, start_time, valid_from=start)
+        for year in (start.year, start.year + 1):
+            for day, name in DEMO_HOLIDAYS.items():
+                schedule.add_holiday(f"{year}-{day}", name, shift_days=1)
+    return schedule
+
+
+@st.cache_resource
+def get_spatial_index():
+    spatial = SpatialIndex(get_database())
+    if DEMO_DATA and len(spatial.wards) == 0:
+        spatial.load_geojson(demo_ward_boundaries())
+    return spatial
+
+
+def demo_ward_boundaries():
+    # Rectangles tiling DEMO_WARD_BOX, standing in for surveyed ward boundaries
+    south, west, north, east = DEMO_WARD_BOX
+    rows = -(-len(DEMO_WARDS) // DEMO_WARD_COLUMNS)
+    height, width = (north - south) / rows, (east - west) / DEMO_WARD_COLUMNS
+    features = []
+    for i, ward in enumerate(DEMO_WARDS):
+        lat, lon = south + (i // DEMO_WARD_COLUMNS) * height, west + (i % DEMO_WARD_COLUMNS) * width
+        ring = [[lon, lat], [lon + width, lat], [lon + width, lat + height], [lon, lat + height], [lon, lat]]
+        features.append({'type': 'Feature', 'properties': {'ward': ward},
+                         'geometry': {'type': 'Polygon', 'coordinates': [ring]}})
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def address_ward(address, spatial, schedule):
+    # From the geocoded address when there is one, otherwise from its text
+    return spatial.ward_for_address(address) or schedule.ward_for_address(address, DEFAULT_WARD)
+
+
+def user_ward(address):
+    return address_ward(address, get_spatial_index(), get_schedule())
+
+
+def user_next_pickup(address, now=None):
+    # (the user's ward, its next Pickup or None)
+    ward = user_ward(address)
+    return ward, get_schedule().next_pickup(ward, now)
+
+
+def describe_pickup(pickup):
+    return f"{pickup.date:%d/%m} {format_time(pickup.minute)} ({pickup.waste_type})" if pickup else "-"
+
+
+def user_location(address):
+    # (lat, lon) of a geocoded address, else the centre of the user's ward
+    spatial = get_spatial_index()
+    return spatial.locate(address) or spatial.wards.centre(user_ward(address))
+
+
+@st.cache_resource
+def get_bin_index(bin_count):
+    # Keyed on the registry size so newly registered bins rebuild it
+    bins = [b for b in get_bin_store().bins[:bin_count] if b.get('lat') is not None and b.get('lon') is not None]
+    return bins, GridIndex([b['lat'] for b in bins], [b['lon'] for b in bins])
+
+
+def nearest_bins(lat, lon, k=NEARBY_BINS, max_km=float('inf')):
+    # [(bin registry entry, km)] nearest first
+    bins, index = get_bin_index(len(get_bin_store()))
+    return [(bins[i], km) for i, km in index.nearest(lat, lon, k=k, max_km=max_km)]
+
+
+def describe_location(lat, lon):
+    # "Near <closest bin's location> (0.4 km)" for a raw coordinate
+    nearest = nearest_bins(lat, lon, k=1)
+    if not nearest:
+        return f"{lat:.4f}, {lon:.4f}"
+    landmark, km = nearest[0]
+    return f"Near {landmark['location']} ({km:.1f} km)"
+
+
+@st.cache_resource
+def get_classifier():
+    # Raises classifier.ClassifierUnavailable (not cached) when the model or runtime is missing
+    from classifier import WasteClassifier
+    return WasteClassifier()
+
+
+@st.cache_resource
+def get_intent_engine():
+    # Built once per process; edits to the FAQ corpus need an app restart
+    from intents import IntentEngine
+    return IntentEngine.from_file()
+
+
+@st.cache_resource
+def get_analytics():
+    analytics = CollectionAnalytics(get_database())
+    if DEMO_DATA and analytics.is_empty():
+        # 30 days of demo collections: each ward and type collected four times a day
+        rng = np.random.default_rng(7)
+        now = int(time.time())
+        stamps = now - np.arange(30 * 4) * 6 * 3600
+        rows = pd.MultiIndex.from_product(
+            [stamps, DEMO_WARDS, WASTE_TYPES], names=['collected_at', 'ward', 'waste_type']
+        ).to_frame(index=False)
+        base = rows['waste_type'].map({'Organic': 2400.0, 'Recyclable': 1800.0, 'Hazardous': 400.0})
+        rows['weight_kg'] = base * rng.uniform(0.6, 1.4, len(rows))
+        analytics.record(rows)
+    return analytics
+
+
+def record_collections(records):
+    count = get_analytics().record(records)
+    invalidate('analytics')
+    return count
+
+
+@cached('analytics')
+def load_admin_metrics():
+    today = datetime.now(timezone.utc)
+    yesterday = today - timedelta(days=1)
+    users, new_users = get_accounts().user_counts(today.strftime('%Y-%m-%d'))
+    waste_today, rate_today = get_analytics().day_summary(today)
+    waste_yesterday, rate_yesterday = get_analytics().day_summary(yesterday)
+    return {
+        'users': users,
+        'new_users': new_users,
+        'waste_today_kg': waste_today,
+        'waste_change': (waste_today - waste_yesterday) / waste_yesterday if waste_yesterday else 0.0,
+        'recycling_rate': rate_today,
+        'recycling_rate_change': rate_today - rate_yesterday,
+    }
+
+
+@st.cache_resource
+def get_leaderboard():
+    return Leaderboard(get_accounts())
+
+
+def load_leaderboard(n=10):
+    board = get_leaderboard()
+    top = board.top(n)
+    names = get_accounts().display_names(user_id for _, user_id, _ in top)
+    return pd.DataFrame(
+        [(position, names.get(user_id, ''), points) for position, user_id, points in top],
+        columns=['Rank', 'Name', 'Points'],
+    )
+
+
+@cached('schedule')
+def load_schedule(ward, start):
+    return schedule_table(get_schedule().pickups(ward, start, start + timedelta(days=SCHEDULE_DAYS - 1)), start)
+
+
+def schedule_table(pickups, start, days=SCHEDULE_DAYS):
+    """One row per day from ``start``, with each waste type's pickup time or 'Off'.
+
+    The usual waste types always get a column; any other type a rule
+    collects (e-waste, garden waste) gets one after them.
+    """
+    pickups = list(pickups)
+    days = [start + timedelta(days=d) for d in range(days)]
+    extra = sorted({p.waste_type for p in pickups} - set(WASTE_TYPES))
+    table = pd.DataFrame({'Day': [f"{day:%A}" for day in days], 'Date': [f"{day:%d/%m}" for day in days],
+                          **{waste_type: 'Off' for waste_type in WASTE_TYPES + extra}})
+    for pickup in pickups:
+        row = (pickup.date - start).days
+        text = format_time(pickup.minute) + (f" ({pickup.note})" if pickup.note else "")
+        current = table.at[row, pickup.waste_type]
+        table.at[row, pickup.waste_type] = text if current == 'Off' else f"{current}, {text}"
+    return table
+
+
+@cached('trucks')
+def load_truck_data():
+    # Truck roster; live positions are served by get_fleet()
+    return pd.DataFrame({
+        'Truck_ID': ['TRK001', 'TRK002', 'TRK003', 'TRK004'],
+        'Driver': ['Rajesh Patel', 'Amit Shah', 'Kiran Modi', 'Suresh Joshi'],
+        'Location': ['Near Gyanmanjari University', 'Takhteshwar Temple Area', 'Darbargadh Circle', 'Bhavnagar Port'],
+        'Status': ['Collecting', 'En Route', 'Collecting', 'Returning'],
+        'Capacity_kg': [1000.0, 1000.0, 1000.0, 1000.0],
+        'Depot_Lat': [DEPOT[0]] * 4,
+        'Depot_Lon': [DEPOT[1]] * 4
+    })
+
+
+@cached('routes')
+def load_route_plan():
+    bins = load_bin_status().merge(load_fill_forecast()[['Bin_ID', 'Hours_To_Full']], on='Bin_ID', how='left')
+    return plan_routes(bins, load_truck_data(), horizon_hours=OVERFLOW_ALERT_HOURS)
+
+
+@cached('routes')
+def load_truck_etas():
+    trucks = load_truck_data()
+    summary = route_summary(load_route_plan(), trucks)
+    eta = summary['Next_ETA_min'].map(lambda m: '—' if pd.isna(m) else f"{max(1, round(m))} min")
+    return trucks.assign(ETA=eta.to_numpy(), Stops=summary['Stops'].astype(int).to_numpy())
+
+
+@cached('activity')
+def load_activity_data(user_key):
+    return pd.DataFrame({
+        'Date': pd.date_range(start='2024-01-01', periods=30, freq='D'),
+        'Waste_Collected': np.random.randint(2, 15, 30),
+        'Points_Earned': np.random.randint(5, 25, 30)
+    })
+
+
+@cached('activity', kind='chart')
+def activity_figure(user_key, width_px=CHART_WIDTH_PX):
+    import plotly.express as px
+    activity = load_activity_data(user_key)
+    target_points = point_budget(activity['Date'].max() - activity['Date'].min() + timedelta(days=1),
+                                 timedelta(days=1), width_px)
+    series = prepare_series(activity, 'Date', ['Waste_Collected', 'Points_Earned'], target_points)
+    return px.line(series, x='Date', y='Value', color='Series', title="Monthly Waste Collection & Points Trend")
+
+
+@cached('analytics')
+def load_waste_data(days=30, grain='daily'):
+    start = datetime.now(timezone.utc) - timedelta(days=days - 1)
+    totals = get_analytics().totals_by_type(grain, start) / 1000.0
+    totals.index = pd.to_datetime(totals.index)
+    return totals.rename_axis('Date').reset_index()
+
+
+@cached('analytics')
+def load_waste_series(days=30, width_px=CHART_WIDTH_PX):
+    # Downsampled per range and chart width, so each combination is prepared once. Hourly
+    # collections spike around pickup times, so they keep each bucket's extremes
+    if days <= HOURLY_MAX_DAYS:
+        target_points = point_budget(timedelta(days=days), timedelta(hours=1), width_px)
+        return prepare_series(load_waste_data(days, 'hourly'), 'Date', WASTE_TYPES, target_points, method='minmax')
+    target_points = point_budget(timedelta(days=days), timedelta(days=1), width_px)
+    return prepare_series(load_waste_data(days, 'daily'), 'Date', WASTE_TYPES, target_points)
+
+
+@cached('analytics', kind='chart')
+def waste_figure(days=30, width_px=CHART_WIDTH_PX):
+    import plotly.express as px
+    title = "Hourly Waste Collection by Type" if days <= HOURLY_MAX_DAYS else "Daily Waste Collection by Type"
+    fig = px.line(load_waste_series(days, width_px), x='Date', y='Value', color='Series', title=title)
+    fig.update_yaxes(title="Tons")
+    return fig
+
+
+@cached('analytics', kind='chart')
+def ward_figure():
+    import plotly.express as px
+    month = get_analytics().rollup('monthly', datetime.now(timezone.utc), datetime.now(timezone.utc))
+    by_ward = month.groupby(['Ward', 'Waste_Type'], as_index=False)['Weight_kg'].sum()
+    by_ward['Tons'] = by_ward['Weight_kg'] / 1000.0
+    return px.bar(by_ward, x='Ward', y='Tons', color='Waste_Type', title="Waste Collected by Ward (This Month)")
+
+
+@cached('analytics')
+def load_engagement_data():
+    # Reports from the ticket store; the rest from the reasons points were credited or spent for
+    counts = get_accounts().ledger_counts(p for patterns in ENGAGEMENT_LEDGER_REASONS.values() for p in patterns)
+    return pd.DataFrame({
+        'Activity': ['Reports Filed', *ENGAGEMENT_LEDGER_REASONS],
+        'Count': [get_tickets().report_count(),
+                  *(sum(counts[p] for p in patterns) for patterns in ENGAGEMENT_LEDGER_REASONS.values())],
+    })
+
+
+@cached('analytics', kind='chart')
+def engagement_figure():
+    import plotly.express as px
+    return px.bar(load_engagement_data(), x='Activity', y='Count', title="User Engagement Metrics")
+
+
+@st.cache_resource
+def get_tickets():
+    # After get_accounts(), whose users table ticket reporters reference
+    get_accounts()
+    return TicketStore(get_database())
+
+
+def file_ticket(kind, user, description=''):
+    # Bin issues from a geocoded address are filed against the nearest bin, so neighbours share a
+    # ticket; anything else (or an address only placed by its ward) is deduplicated per user
+    address = user.get('address', '')
+    location = get_spatial_index().locate(address) if KINDS[kind][2] else None
+    nearest = nearest_bins(*location, k=1, max_km=BIN_ALERT_RADIUS_KM) if location else []
+    ticket_id, created = get_tickets().report(kind, user['id'], user_ward(address),
+                                              bin_id=nearest[0][0]['bin_id'] if nearest else None,
+                                              description=description)
+    invalidate('reports')
+    return ticket_id, created
+
+
+def update_ticket(ticket_id, status, user_id):
+    # Only admins may change a ticket (accounts.NotAuthorized otherwise); everyone who reported it hears
+    get_accounts().require_admin(user_id)
+    tickets = get_tickets()
+    reporters = tickets.set_status(ticket_id, status)
+    label = KINDS[tickets.get(ticket_id)['kind']][0].lower()
+    get_notifications().publish(
+        'service_requests', f"Ticket #{ticket_id} {STATUSES[status].lower()}",
+        f"Your {label} report is now {STATUSES[status].lower()}.",
+        kind='success' if status == 'resolved' else 'info', user_ids=reporters,
+    )
+    invalidate('reports')
+
+
+@cached('reports')
+def load_ticket_page(status, ward=None, priority=None, after=None):
+    # (one page of the ticket queue as a frame, cursor of the next page or None)
+    tickets, cursor = get_tickets().page(status, ward=ward, priority=priority, after=after)
+    frame = pd.DataFrame(tickets, columns=['id', 'kind', 'priority', 'ward', 'bin_id', 'reports', 'status',
+                                           'description', 'created_at'])
+    return pd.DataFrame({
+        'Ticket': frame['id'],
+        'Issue': frame['kind'].map(lambda kind: KINDS[kind][0]),
+        'Priority': frame['priority'].map(PRIORITIES),
+        'Ward': frame['ward'],
+        'Bin': frame['bin_id'].fillna('-'),
+        'Reports': frame['reports'],
+        'Status': frame['status'].map(STATUSES),
+        'Opened': pd.to_datetime(frame['created_at'], unit='s', utc=True).dt.strftime('%Y-%m-%d %H:%M'),
+        'Details': frame['description'],
+    }), cursor
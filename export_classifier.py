@@ -0,0 +1,92 @@
+"""Export a waste classifier to the ONNX file the AI sorting pages load.
+
+Takes a torchvision model fine-tuned on the WASTE_TYPES classes (a
+checkpoint saved with ``torch.save(model.state_dict(), path)``) and writes
+it to MODEL_PATH, or to SWMS_MODEL_PATH when that is set:
+
+    python export_classifier.py --checkpoint waste_mobilenet.pt
+    python export_classifier.py --checkpoint waste_resnet.pt --arch resnet18 --output /srv/models/waste.onnx
+
+``--placeholder`` instead exports the ImageNet backbone with an untrained
+WASTE_TYPES head. Its predictions are meaningless; it only lets a
+development checkout exercise the classification pages end to end.
+
+Needs torch and torchvision, which the app itself does not.
+"""
+import argparse
+import os
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from classifier import INPUT_SIZE, MODEL_PATH, WASTE_TYPES, WasteClassifier
+
+ARCHITECTURES = {
+    # torchvision constructor, ImageNet weights, attribute path of the final linear layer
+    'mobilenet_v3_small': ('mobilenet_v3_small', 'MobileNet_V3_Small_Weights', ('classifier', 3)),
+    'resnet18': ('resnet18', 'ResNet18_Weights', ('fc',)),
+    'efficientnet_b0': ('efficientnet_b0', 'EfficientNet_B0_Weights', ('classifier', 1)),
+}
+OPSET = 17
+
+
+def build_model(arch, checkpoint=None):
+    import torch
+    import torchvision
+
+    constructor, weights, head_path = ARCHITECTURES[arch]
+    model = getattr(torchvision.models, constructor)(
+        weights=None if checkpoint else getattr(torchvision.models, weights).DEFAULT)
+    # Swap the ImageNet head for one with an output per waste type
+    parent = model
+    for step in head_path[:-1]:
+        parent = getattr(parent, step)
+    last = head_path[-1]
+    head = parent[last] if isinstance(last, int) else getattr(parent, last)
+    new_head = torch.nn.Linear(head.in_features, len(WASTE_TYPES))
+    if isinstance(last, int):
+        parent[last] = new_head
+    else:
+        setattr(parent, last, new_head)
+    if checkpoint:
+        model.load_state_dict(torch.load(checkpoint, map_location='cpu'))
+    return model.eval()
+
+
+def export(model, output):
+    import torch
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    # A dynamic batch dimension lets the classifier micro-batch concurrent uploads
+    torch.onnx.export(
+        model, torch.zeros(1, 3, INPUT_SIZE, INPUT_SIZE), output,
+        input_names=['image'], output_names=['logits'],
+        dynamic_axes={'image': {0: 'batch'}, 'logits': {0: 'batch'}}, opset_version=OPSET,
+    )
+
+
+def check(output):
+    # Loads the file the way the app does and classifies a blank image
+    classifier = WasteClassifier(output)
+    buffer = BytesIO()
+    Image.fromarray(np.zeros((INPUT_SIZE, INPUT_SIZE, 3), dtype=np.uint8)).save(buffer, format='PNG')
+    label, confidence, _ = classifier.classify(buffer.getvalue())
+    print(f"{output}: batch size up to {classifier.max_batch}, blank image -> {label} ({confidence:.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--checkpoint', help='state_dict of a model fine-tuned on the waste types')
+    source.add_argument('--placeholder', action='store_true', help='untrained head, for development only')
+    parser.add_argument('--arch', choices=ARCHITECTURES, default='mobilenet_v3_small')
+    parser.add_argument('--output', default=MODEL_PATH)
+    args = parser.parse_args()
+
+    export(build_model(args.arch, args.checkpoint), args.output)
+    check(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+import socket
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# One hour of history per truck at 5-second reporting
+DEFAULT_CAPACITY = 720
+
+
+class FleetTracker:
+    """Per-truck ring buffers of GPS fixes.
+
+    All trucks share three 2-D arrays (truck row x slot) so a batch of fixes
+    from the whole fleet is written with a handful of NumPy operations.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._rows = {}
+        self.truck_ids = []
+        self._ts = np.zeros((0, capacity), dtype=np.float64)
+        self._lat = np.zeros((0, capacity), dtype=np.float64)
+        self._lon = np.zeros((0, capacity), dtype=np.float64)
+        self._count = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.truck_ids)
+
+    def _row_positions(self, truck_ids):
+        # Caller holds the lock; unknown trucks get a new row
+        rows = np.empty(len(truck_ids), dtype=np.int64)
+        for i, truck_id in enumerate(truck_ids):
+            row = self._rows.get(truck_id)
+            if row is None:
+                row = self._rows[truck_id] = len(self.truck_ids)
+                self.truck_ids.append(truck_id)
+            rows[i] = row
+        if len(self.truck_ids) > len(self._count):
+            self._grow(max(len(self.truck_ids), 2 * len(self._count)))
+        return rows
+
+    def _grow(self, n_rows):
+        extra = n_rows - len(self._count)
+        pad = np.zeros((extra, self.capacity))
+        self._ts = np.vstack([self._ts, pad])
+        self._lat = np.vstack([self._lat, pad])
+        self._lon = np.vstack([self._lon, pad])
+        self._count = np.concatenate([self._count, np.zeros(extra, dtype=np.int64)])
+
+    def ingest(self, truck_ids, lats, lons, timestamps=None):
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        if timestamps is None:
+            ts = np.full(len(lats), time.time())
+        else:
+            ts = np.asarray(timestamps, dtype=np.float64)
+        if not (len(truck_ids) == len(lats) == len(lons) == len(ts)):
+            raise ValueError("truck_ids, lats, lons and timestamps must have the same length")
+        if len(ts) == 0:
+            return 0
+
+        with self._lock:
+            rows = self._row_positions(truck_ids)
+            # Several fixes for one truck in a batch go to consecutive slots,
+            # in the order they arrived
+            order = np.argsort(rows, kind='stable')
+            sorted_rows = rows[order]
+            group_start = np.r_[0, np.flatnonzero(sorted_rows[1:] != sorted_rows[:-1]) + 1]
+            rank = np.arange(len(rows)) - np.repeat(group_start, np.diff(np.r_[group_start, len(rows)]))
+            slots = (self._count[sorted_rows] + rank) % self.capacity
+            self._ts[sorted_rows, slots] = ts[order]
+            self._lat[sorted_rows, slots] = lats[order]
+            self._lon[sorted_rows, slots] = lons[order]
+            self._count += np.bincount(rows, minlength=len(self._count))
+        return len(ts)
+
+    def latest(self):
+        with self._lock:
+            n = len(self.truck_ids)
+            rows = np.flatnonzero(self._count[:n] > 0)
+            slots = (self._count[rows] - 1) % self.capacity
+            data = {
+                'Truck_ID': [self.truck_ids[r] for r in rows],
+                'Lat': self._lat[rows, slots],
+                'Lon': self._lon[rows, slots],
+                'Updated': self._ts[rows, slots],
+            }
+        positions = pd.DataFrame(data)
+        positions['Updated'] = pd.to_datetime(positions['Updated'], unit='s', utc=True)
+        return positions
+
+    def track(self, truck_id, limit=None):
+        # Buffered fixes for one truck, oldest first
+        with self._lock:
+            row = self._rows.get(truck_id)
+            if row is None:
+                raise KeyError(f"Unknown truck {truck_id!r}")
+            count = int(self._count[row])
+            n = min(count, self.capacity, limit or self.capacity)
+            slots = np.arange(count - n, count) % self.capacity
+            data = {
+                'Time': self._ts[row, slots],
+                'Lat': self._lat[row, slots],
+                'Lon': self._lon[row, slots],
+            }
+        track = pd.DataFrame(data)
+        track['Time'] = pd.to_datetime(track['Time'], unit='s', utc=True)
+        return track
+
+
+def parse_position(line):
+    # "<truck_id>,<lat>,<lon>[,<epoch seconds>]"
+    parts = line.strip().split(',')
+    if len(parts) not in (3, 4):
+        raise ValueError(f"Malformed position: {line!r}")
+    ts = float(parts[3]) if len(parts) == 4 else time.time()
+    return parts[0], float(parts[1]), float(parts[2]), ts
+
+
+class UDPPositionListener(threading.Thread):
+    """Receives newline-separated position datagrams and feeds a tracker in batches."""
+
+    def __init__(self, tracker, host='0.0.0.0', port=5005, flush_interval=0.5, max_batch=1024):
+        super().__init__(daemon=True, name='gps-udp-listener')
+        self.tracker = tracker
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.settimeout(flush_interval)
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        batch = []
+        last_flush = time.monotonic()
+        while not self._stop_event.is_set():
+            try:
+                payload, _ = self.sock.recvfrom(65535)
+                for line in payload.decode('utf-8', errors='replace').splitlines():
+                    try:
+                        batch.append(parse_position(line))
+                    except ValueError:
+                        continue
+            except socket.timeout:
+                pass
+            if batch and (len(batch) >= self.max_batch or time.monotonic() - last_flush >= self.flush_interval):
+                ids, lats, lons, ts = zip(*batch)
+                self.tracker.ingest(list(ids), lats, lons, ts)
+                batch = []
+                last_flush = time.monotonic()
+        self.sock.close()
+
+
+class PositionSimulator(threading.Thread):
+    """Random-walks a fleet around its start positions, standing in for real GPS units."""
+
+    def __init__(self, tracker, start_positions, interval=5.0, step=0.0008, seed=None):
+        super().__init__(daemon=True, name='gps-simulator')
+        self.tracker = tracker
+        self.truck_ids = list(start_positions)
+        coords = np.array([start_positions[t] for t in self.truck_ids], dtype=np.float64)
+        self.lat, self.lon = coords[:, 0].copy(), coords[:, 1].copy()
+        self.interval = interval
+        self.step = step
+        self.rng = np.random.default_rng(seed)
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def tick(self):
+        self.lat += self.rng.normal(0, self.step, len(self.lat))
+        self.lon += self.rng.normal(0, self.step, len(self.lon))
+        self.tracker.ingest(self.truck_ids, self.lat, self.lon)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.tick()
+            self._stop_event.wait(self.interval)
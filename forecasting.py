@@ -0,0 +1,132 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# A drop of more than this many points between readings means the bin was emptied
+EMPTIED_DROP = 15.0
+# Fits need a minimum time span to give a usable rate
+MIN_SPAN_HOURS = 0.5
+FULL_LEVEL = 100.0
+
+
+class FillForecaster:
+    """Per-bin least-squares fill-rate models, updated incrementally.
+
+    Each bin keeps the sufficient statistics of a linear fit of fill level
+    against time since it was last emptied (n, Σt, Σy, Σt², Σty), so new
+    readings are folded in with ``np.bincount`` and every bin is scored in a
+    single vectorized pass. Times are in hours relative to ``origin``.
+    """
+
+    def __init__(self, n_bins=0, origin=None):
+        self._lock = threading.Lock()
+        self.origin = origin
+        self._stats = np.zeros((5, n_bins))
+        self._first_t = np.full(n_bins, np.nan)
+        self._last_t = np.full(n_bins, np.nan)
+        self._last_fill = np.full(n_bins, np.nan)
+
+    def __len__(self):
+        return self._stats.shape[1]
+
+    def _grow(self, n_bins):
+        extra = n_bins - len(self)
+        if extra > 0:
+            self._stats = np.hstack([self._stats, np.zeros((5, extra))])
+            self._first_t = np.r_[self._first_t, np.full(extra, np.nan)]
+            self._last_t = np.r_[self._last_t, np.full(extra, np.nan)]
+            self._last_fill = np.r_[self._last_fill, np.full(extra, np.nan)]
+
+    def update(self, bin_pos, timestamps, fill_levels):
+        # bin_pos: positions in the bin registry; timestamps: epoch seconds
+        bin_pos = np.asarray(bin_pos, dtype=np.int64)
+        ts = np.asarray(timestamps, dtype=np.float64)
+        fill = np.asarray(fill_levels, dtype=np.float64)
+        if len(bin_pos) == 0:
+            return
+        with self._lock:
+            if self.origin is None:
+                self.origin = float(ts.min())
+            self._grow(int(bin_pos.max()) + 1)
+            t = (ts - self.origin) / 3600.0
+
+            order = np.lexsort((t, bin_pos))
+            pos, t, fill = bin_pos[order], t[order], fill[order]
+            group_start = np.r_[True, pos[1:] != pos[:-1]]
+
+            # Previous level for every reading: the one before it in this batch,
+            # or the last level already folded in for its bin
+            prev = np.r_[np.nan, fill[:-1]]
+            prev[group_start] = self._last_fill[pos[group_start]]
+            emptied = fill < prev - EMPTIED_DROP
+
+            # Only readings since each bin's most recent emptying count
+            idx = np.arange(len(pos))
+            reset_at = np.full(len(self), -1)
+            np.maximum.at(reset_at, pos[emptied], idx[emptied])
+            reset_bins = np.unique(pos[emptied])
+            self._stats[:, reset_bins] = 0.0
+            self._first_t[reset_bins] = np.nan
+            keep = idx >= reset_at[pos]
+            pos, t, fill = pos[keep], t[keep], fill[keep]
+
+            n = len(self)
+            self._stats += np.vstack([
+                np.bincount(pos, minlength=n),
+                np.bincount(pos, t, minlength=n),
+                np.bincount(pos, fill, minlength=n),
+                np.bincount(pos, t * t, minlength=n),
+                np.bincount(pos, t * fill, minlength=n),
+            ])
+            first = np.r_[True, pos[1:] != pos[:-1]]
+            last = np.r_[pos[1:] != pos[:-1], True]
+            unset = np.isnan(self._first_t[pos[first]])
+            self._first_t[pos[first][unset]] = t[first][unset]
+            self._last_t[pos[last]] = t[last]
+            self._last_fill[pos[last]] = fill[last]
+
+    def fill_rates(self):
+        # Percent per hour for every bin; NaN where there is not enough history
+        with self._lock:
+            n, st, sy, stt, sty = self._stats
+            span = self._last_t - self._first_t
+        denom = n * stt - st * st
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = (n * sty - st * sy) / denom
+        slope[(n < 2) | (span < MIN_SPAN_HOURS) | ~(denom > 0)] = np.nan
+        return slope
+
+    def score(self, now=None):
+        """Forecast every bin in one pass.
+
+        Returns arrays (rate, hours_to_full, last_fill) indexed by bin position.
+        Bins that are not filling get an infinite time to full.
+        """
+        rate = self.fill_rates()
+        with self._lock:
+            last_fill = self._last_fill.copy()
+            last_t = self._last_t.copy()
+            origin = self.origin
+        elapsed = 0.0
+        if now is not None and origin is not None:
+            elapsed = np.maximum((now - origin) / 3600.0 - last_t, 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            current = np.minimum(last_fill + np.where(rate > 0, rate, 0.0) * elapsed, FULL_LEVEL)
+            hours = np.where(rate > 0, (FULL_LEVEL - current) / rate, np.inf)
+        hours[np.isnan(last_fill)] = np.nan
+        hours[current >= FULL_LEVEL] = 0.0
+        return rate, hours, current
+
+
+def forecast_frame(forecaster, bins, now=None):
+    # bins: registry entries in position order (BinStore.bins)
+    rate, hours, current = forecaster.score(now)
+    n = min(len(bins), len(rate))
+    return pd.DataFrame({
+        'Bin_ID': [b['bin_id'] for b in bins[:n]],
+        'Location': [b['location'] for b in bins[:n]],
+        'Fill_Level': current[:n],
+        'Fill_Rate': rate[:n],
+        'Hours_To_Full': hours[:n],
+    })
@@ -0,0 +1,294 @@
+import csv
+import json
+import math
+import threading
+
+import numpy as np
+
+from collection_schedule import address_key
+from db import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS geo_wards (
+    name TEXT PRIMARY KEY,
+    geometry TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS geo_addresses (
+    address_key TEXT PRIMARY KEY,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+EARTH_RADIUS_KM = 6371.0088
+# Points per grid cell aimed for when sizing cells to the data: a query then
+# touches a handful of cells holding a few points each
+POINTS_PER_CELL = 4
+# Smallest cell chosen automatically: a few streets across, so a handful of
+# tightly clustered points doesn't leave a city covered in empty cells
+MIN_CELL_KM = 0.25
+# Coarser cells for ward boundaries, which span kilometres
+WARD_CELL_KM = 1.0
+# Addresses per insert transaction when bulk loading
+ADDRESS_BATCH_SIZE = 10_000
+
+
+class GridIndex:
+    """Points bucketed into a uniform grid for k-nearest and radius queries.
+
+    Coordinates are projected onto a plane tangent at the points' mean
+    latitude, which within a city is off by well under one percent, and
+    each point is filed under the square cell it falls in. A query visits
+    rings of cells around its own cell and stops once no unvisited cell can
+    hold anything closer than what it has found.
+    """
+
+    def __init__(self, lats, lons, cell_km=None):
+        # cell_km defaults to a size giving about POINTS_PER_CELL points per cell
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        self._lat0 = float(lats.mean()) if len(lats) else 0.0
+        self._x_scale = math.radians(1) * EARTH_RADIUS_KM * math.cos(math.radians(self._lat0))
+        self._y_scale = math.radians(1) * EARTH_RADIUS_KM
+        self._x, self._y = lons * self._x_scale, lats * self._y_scale
+        if cell_km is None:
+            area = np.ptp(self._x) * np.ptp(self._y) if len(lats) else 0.0
+            cell_km = max(math.sqrt(area * POINTS_PER_CELL / max(len(lats), 1)), MIN_CELL_KM)
+        self.cell_km = cell_km
+        # Queries touch a few dozen points, where plain floats beat numpy's per-call overhead
+        self._cells = {}
+        cx, cy = np.floor(self._x / cell_km).astype(np.int64), np.floor(self._y / cell_km).astype(np.int64)
+        for i, (x, y, key) in enumerate(zip(self._x.tolist(), self._y.tolist(), zip(cx.tolist(), cy.tolist()))):
+            self._cells.setdefault(key, []).append((i, x, y))
+        self._bounds = (int(cx.min()), int(cx.max()), int(cy.min()), int(cy.max())) if len(lats) else None
+
+    def __len__(self):
+        return len(self._x)
+
+    def _project(self, lat, lon):
+        return lon * self._x_scale, lat * self._y_scale
+
+    def _ring(self, cx, cy, r):
+        # Cells at Chebyshev distance r from (cx, cy) that lie within the data's bounds
+        x0, x1, y0, y1 = self._bounds
+        xs = range(max(cx - r, x0), min(cx + r, x1) + 1)
+        ys = range(max(cy - r + 1, y0), min(cy + r - 1, y1) + 1)
+        top_bottom = [(x, y) for y in {cy - r, cy + r} if y0 <= y <= y1 for x in xs]
+        sides = [(x, y) for x in {cx - r, cx + r} if x0 <= x <= x1 for y in ys] if r else []
+        return top_bottom + sides
+
+    def nearest(self, lat, lon, k=1, max_km=math.inf):
+        """Up to ``k`` (position, km) pairs closest to the point, nearest first."""
+        if self._bounds is None:
+            return []
+        x, y = self._project(lat, lon)
+        cx, cy = math.floor(x / self.cell_km), math.floor(y / self.cell_km)
+        x0, x1, y0, y1 = self._bounds
+        # Rings nearer than the data's bounds are empty, however far off the query is
+        first_ring = max(x0 - cx, cx - x1, y0 - cy, cy - y1, 0)
+        last_ring = max(abs(cx - x0), abs(cx - x1), abs(cy - y0), abs(cy - y1))
+        found = []
+        for r in range(first_ring, last_ring + 1):
+            for cell in map(self._cells.get, self._ring(cx, cy, r)):
+                if cell is not None:
+                    found.extend((math.hypot(px - x, py - y), i) for i, px, py in cell)
+            # Points in rings not yet visited are at least r cells away
+            reach = r * self.cell_km
+            if reach >= max_km:
+                break
+            if len(found) >= k:
+                found.sort()
+                if found[k - 1][0] <= reach:
+                    break
+        found.sort()
+        return [(i, d) for d, i in found[:k] if d <= max_km]
+
+    def within(self, lat, lon, radius_km):
+        """(position, km) pairs no further than ``radius_km``, nearest first."""
+        if self._bounds is None:
+            return []
+        x, y = self._project(lat, lon)
+        cx, cy = math.floor(x / self.cell_km), math.floor(y / self.cell_km)
+        r = math.ceil(radius_km / self.cell_km)
+        x0, x1, y0, y1 = self._bounds
+        found = []
+        for key in ((i, j) for i in range(max(cx - r, x0), min(cx + r, x1) + 1)
+                    for j in range(max(cy - r, y0), min(cy + r, y1) + 1)):
+            for i, px, py in self._cells.get(key, ()):
+                d = math.hypot(px - x, py - y)
+                if d <= radius_km:
+                    found.append((d, i))
+        found.sort()
+        return [(i, d) for d, i in found]
+
+
+def _rings(geometry):
+    # Every ring of a GeoJSON Polygon or MultiPolygon as (lons, lats) arrays
+    polygons = [geometry['coordinates']] if geometry['type'] == 'Polygon' else geometry['coordinates']
+    for polygon in polygons:
+        for ring in polygon:
+            coords = np.asarray(ring, dtype=np.float64)
+            yield coords[:, 0], coords[:, 1]
+
+
+def _inside(rings, lat, lon):
+    # Even-odd ray casting over all rings, so holes fall out naturally
+    crossings = 0
+    for xs, ys in rings:
+        xj, yj = np.roll(xs, 1), np.roll(ys, 1)
+        spans = (ys > lat) != (yj > lat)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crossings += np.count_nonzero(spans & (lon < (xj - xs) * (lat - ys) / (yj - ys) + xs))
+    return crossings % 2 == 1
+
+
+class WardMap:
+    """Ward boundaries answering which ward a point lies in.
+
+    Each ward is filed under the grid cells its bounding box overlaps, so a
+    lookup ray-casts only against the one or two wards near the point.
+    """
+
+    def __init__(self, wards, cell_km=WARD_CELL_KM):
+        # wards: {name: GeoJSON Polygon or MultiPolygon geometry}
+        self.names = list(wards)
+        self._rings = [list(_rings(geometry)) for geometry in wards.values()]
+        self._cell_deg = cell_km / (math.radians(1) * EARTH_RADIUS_KM)
+        self._cells = {}
+        self._centroids = {}
+        for i, (name, rings) in enumerate(zip(self.names, self._rings)):
+            lons = np.concatenate([xs for xs, _ in rings])
+            lats = np.concatenate([ys for _, ys in rings])
+            for cx in range(self._cell(lons.min()), self._cell(lons.max()) + 1):
+                for cy in range(self._cell(lats.min()), self._cell(lats.max()) + 1):
+                    self._cells.setdefault((cx, cy), []).append(i)
+            exterior_lons, exterior_lats = rings[0]
+            self._centroids[name] = (float(exterior_lats[:-1].mean()), float(exterior_lons[:-1].mean()))
+
+    def __len__(self):
+        return len(self.names)
+
+    def _cell(self, degrees):
+        return math.floor(degrees / self._cell_deg)
+
+    def ward_at(self, lat, lon):
+        for i in self._cells.get((self._cell(lon), self._cell(lat)), ()):
+            if _inside(self._rings[i], lat, lon):
+                return self.names[i]
+        return None
+
+    def centre(self, name):
+        # Mean of the outer boundary's vertices; (lat, lon) or None for an unknown ward
+        return self._centroids.get(name)
+
+
+def read_geojson(source):
+    # A GeoJSON dict, JSON text or file path, as a dict
+    if isinstance(source, dict):
+        return source
+    if source.lstrip().startswith('{'):
+        return json.loads(source)
+    with open(source, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_points(source):
+    """Point records from a CSV file with lat and lon columns, or from GeoJSON Point features.
+
+    Each record is a dict of the row's columns or the feature's properties,
+    with float ``lat`` and ``lon``.
+    """
+    if isinstance(source, str) and source.lower().endswith('.csv'):
+        with open(source, newline='', encoding='utf-8') as f:
+            return [{**row, 'lat': float(row['lat']), 'lon': float(row['lon'])} for row in csv.DictReader(f)]
+    points = []
+    for feature in read_geojson(source)['features']:
+        if feature['geometry']['type'] == 'Point':
+            lon, lat = feature['geometry']['coordinates'][:2]
+            points.append({**(feature.get('properties') or {}), 'lat': lat, 'lon': lon})
+    return points
+
+
+class SpatialIndex:
+    """Ward boundaries and geocoded addresses, bulk-loaded from GeoJSON or CSV.
+
+    Both are kept in SQLite and held in memory once loaded: boundaries as a
+    ``WardMap`` and addresses as a dict from the normalised address to its
+    coordinates. Points of interest such as bins are indexed separately with
+    ``GridIndex``, since their positions live with their own data.
+    """
+
+    def __init__(self, db=None):
+        self.db = db or Database()
+        self.db.ensure_schema(SCHEMA)
+        self._lock = threading.Lock()
+        self._load()
+
+    def load_geojson(self, source):
+        """Load a FeatureCollection (dict, JSON text or path); returns (wards, addresses) loaded.
+
+        Polygon and MultiPolygon features need a ``ward`` (or ``name``)
+        property and replace that ward's boundary; Point features with an
+        ``address`` property geocode that address. Other features are skipped.
+        """
+        data = read_geojson(source)
+        wards = [((feature.get('properties') or {}).get('ward') or feature['properties']['name'],
+                  json.dumps(feature['geometry']))
+                 for feature in data['features'] if feature['geometry']['type'] in ('Polygon', 'MultiPolygon')]
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO geo_wards (name, geometry) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET geometry = excluded.geometry",
+                wards,
+            )
+        return len(wards), self.load_addresses((p['address'], p['lat'], p['lon'])
+                                               for p in read_points(data) if p.get('address'))
+
+    def load_csv(self, path):
+        # Geocoded addresses from a CSV file with address, lat and lon columns
+        return self.load_addresses((p['address'], p['lat'], p['lon']) for p in read_points(path))
+
+    def load_addresses(self, rows, batch_size=ADDRESS_BATCH_SIZE):
+        batch, count = [], 0
+        for address, lat, lon in rows:
+            batch.append((address_key(address), lat, lon))
+            if len(batch) >= batch_size:
+                count += self._insert_addresses(batch)
+                batch = []
+        if batch:
+            count += self._insert_addresses(batch)
+        self._load()
+        return count
+
+    def _insert_addresses(self, batch):
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO geo_addresses (address_key, lat, lon) VALUES (?, ?, ?) "
+                "ON CONFLICT (address_key) DO UPDATE SET lat = excluded.lat, lon = excluded.lon",
+                batch,
+            )
+        return len(batch)
+
+    @property
+    def wards(self):
+        return self._wards
+
+    def locate(self, address):
+        # (lat, lon) of a geocoded address, or None
+        return self._addresses.get(address_key(address or ''))
+
+    def ward_at(self, lat, lon):
+        return self._wards.ward_at(lat, lon)
+
+    def ward_for_address(self, address):
+        point = self.locate(address)
+        return None if point is None else self._wards.ward_at(*point)
+
+    def _load(self):
+        with self.db.connection() as conn:
+            wards = conn.execute("SELECT name, geometry FROM geo_wards ORDER BY name").fetchall()
+            addresses = conn.execute("SELECT address_key, lat, lon FROM geo_addresses").fetchall()
+        with self._lock:
+            self._wards = WardMap({name: json.loads(geometry) for name, geometry in wards})
+            self._addresses = {key: (lat, lon) for key, lat, lon in addresses}
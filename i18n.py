@@ -0,0 +1,82 @@
+import json
+import os
+import threading
+
+LOCALES_DIR = os.environ.get(
+    'SWMS_LOCALES_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'locales')
+)
+
+# Interface languages in menu order: display name -> catalog file in LOCALES_DIR.
+# A new language is a catalog file and a line here.
+LANGUAGES = {
+    'English': 'en',
+    'Hindi': 'hi',
+    'Gujarati': 'gu',
+}
+# The source catalog; it defines the message keys and fills gaps in the others
+SOURCE_LANGUAGE = 'English'
+
+
+class Translations:
+    """One language's messages, compiled into a list indexed like the catalog keys."""
+
+    def __init__(self, index, messages):
+        self._index = index
+        self._messages = messages
+
+    def __getitem__(self, key):
+        i = self._index.get(key)
+        return key if i is None else self._messages[i]
+
+    def by_id(self, message_id):
+        # For callers that resolved ``Catalog.message_id`` once up front
+        return self._messages[message_id]
+
+
+class Catalog:
+    """Interface text for every language, loaded from JSON catalogs on demand.
+
+    The source catalog is read when the catalog is built and fixes a
+    numeric id for every key. Other languages are read the first time they
+    are asked for and compiled into lists in that id order, with untranslated
+    keys falling back to the source text, so a lookup is one dict probe and
+    one list index whatever the number of languages.
+    """
+
+    def __init__(self, locales_dir=LOCALES_DIR, languages=LANGUAGES):
+        self.locales_dir = locales_dir
+        self.languages = dict(languages)
+        self._lock = threading.Lock()
+        source = self._read(SOURCE_LANGUAGE)
+        self.keys = tuple(source)
+        self._index = {key: i for i, key in enumerate(self.keys)}
+        self._loaded = {SOURCE_LANGUAGE: Translations(self._index, list(source.values()))}
+
+    def __len__(self):
+        # Languages compiled so far
+        return len(self._loaded)
+
+    def message_id(self, key):
+        return self._index[key]
+
+    def translations(self, language):
+        translations = self._loaded.get(language)
+        if translations is None:
+            with self._lock:
+                translations = self._loaded.get(language)
+                if translations is None:
+                    translations = self._loaded[language] = self._compile(language)
+        return translations
+
+    def _compile(self, language):
+        if language not in self.languages:
+            raise KeyError(f"Unknown language: {language}")
+        messages = self._read(language)
+        fallback = self._loaded[SOURCE_LANGUAGE].by_id
+        return Translations(self._index, [messages.get(key) or fallback(i) for i, key in enumerate(self.keys)])
+
+    def _read(self, language):
+        path = os.path.join(self.locales_dir, f"{self.languages[language]}.json")
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
@@ -0,0 +1,145 @@
+import json
+import os
+import re
+import unicodedata
+from collections import deque
+
+FAQ_PATH = os.environ.get(
+    'SWMS_FAQ_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'faq.json')
+)
+
+# A trailing '*' makes a phrase a stem ("recycl*" matches "recycling"); other
+# phrases must match whole words
+STEM_MARK = '*'
+
+
+def normalize(text):
+    # Case-fold and collapse whitespace; NFC so composed and decomposed Indic text match
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFC', text).casefold()).strip()
+
+
+def _is_word_char(char):
+    # Devanagari and Gujarati vowel signs are combining marks, not letters, but still part of a word
+    return char.isalnum() or unicodedata.category(char)[0] == 'M'
+
+
+class PhraseAutomaton:
+    """Aho-Corasick automaton over a fixed set of phrases.
+
+    ``find`` reports every phrase occurring in a text in one pass over it,
+    so the cost of a lookup does not grow with the number of phrases.
+    """
+
+    def __init__(self, phrases):
+        self.phrases = list(phrases)
+        self._goto = [{}]
+        self._fail = [0]
+        # Phrase indexes ending at each state, including those reached through fail links
+        self._out = [[]]
+        for index, phrase in enumerate(self.phrases):
+            state = 0
+            for char in phrase:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = self._goto[state][char] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(index)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text):
+        # (phrase index, end offset) for every occurrence, overlapping ones included
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._out[state]:
+                yield index, end
+
+
+class IntentEngine:
+    """Ranks FAQ intents for a question in any of the corpus languages.
+
+    The corpus maps each intent to trigger phrases and answers per
+    language. Every phrase goes into one automaton when the engine is
+    built; a question then scores each intent by the phrases it contains,
+    weighted by their length in words, so "missed pickup" outranks
+    "pickup".
+    """
+
+    def __init__(self, corpus):
+        self.intents = {intent['id']: intent for intent in corpus['intents']}
+        self.default_answers = corpus['default']
+        self._order = {intent_id: i for i, intent_id in enumerate(self.intents)}
+
+        # Parallel lists indexed by phrase number
+        phrases, self._intent, self._language, self._stem, self._weight = [], [], [], [], []
+        for intent in corpus['intents']:
+            for language, language_phrases in intent['phrases'].items():
+                for phrase in language_phrases:
+                    stem = phrase.endswith(STEM_MARK)
+                    phrase = normalize(phrase.rstrip(STEM_MARK))
+                    phrases.append(phrase)
+                    self._intent.append(intent['id'])
+                    self._language.append(language)
+                    self._stem.append(stem)
+                    self._weight.append(len(phrase.split()))
+        self._automaton = PhraseAutomaton(phrases)
+
+    @classmethod
+    def from_file(cls, path=FAQ_PATH):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def rank(self, question, limit=3):
+        """Best matching intents first, as dicts with intent, score and language.
+
+        ``language`` is the language of the phrases that matched, so a
+        question asked in Hindi can be answered in Hindi whatever the
+        interface language is. Returns an empty list when nothing matches.
+        """
+        text = normalize(question)
+        matched = set()
+        for index, end in self._automaton.find(text):
+            start = end - len(self._automaton.phrases[index])
+            if start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if not self._stem[index] and end < len(text) and _is_word_char(text[end]):
+                continue
+            matched.add(index)
+
+        scores, languages = {}, {}
+        for index in matched:
+            intent_id, weight = self._intent[index], self._weight[index]
+            scores[intent_id] = scores.get(intent_id, 0) + weight
+            by_language = languages.setdefault(intent_id, {})
+            by_language[self._language[index]] = by_language.get(self._language[index], 0) + weight
+
+        ranked = sorted(scores, key=lambda intent_id: (-scores[intent_id], self._order[intent_id]))
+        return [{'intent': intent_id, 'score': scores[intent_id],
+                 'language': max(languages[intent_id], key=languages[intent_id].get)}
+                for intent_id in ranked[:limit]]
+
+    def answer(self, question, language='English', **values):
+        # Reply to the best match, filling placeholders such as {points}; the default reply is in ``language``
+        ranked = self.rank(question, limit=1)
+        if ranked:
+            answers = self.intents[ranked[0]['intent']]['answers']
+            text = answers.get(ranked[0]['language']) or answers.get(language) or answers['English']
+        else:
+            text = self.default_answers.get(language, self.default_answers['English'])
+        return text.format_map(values)
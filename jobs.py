@@ -0,0 +1,77 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Enough concurrent classify calls to fill one classifier micro-batch
+JOB_WORKERS = 16
+# Finished jobs whose result nobody collected are dropped after this long
+JOB_TTL_SECONDS = 10 * 60
+
+
+class Job:
+    def __init__(self, reveal_at):
+        self.reveal_at = reveal_at
+        self.progress = None
+        self.future = None
+        self.finished_at = None
+
+
+class JobRunner:
+    """Runs slow work off the script thread, addressed by job id.
+
+    A page submits a job, keeps the id in session state and polls
+    ``status`` on later reruns, so no script thread waits for the work.
+    ``reveal_after`` holds a finished result back for a while, standing in
+    for a sleep that only existed for effect, without occupying any thread.
+    """
+
+    def __init__(self, workers=JOB_WORKERS, ttl=JOB_TTL_SECONDS):
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def submit(self, func, *args, reveal_after=0.0, report_progress=False, **kwargs):
+        # With report_progress, func gets a ``progress(fraction, text)`` callable as a keyword argument
+        job_id = uuid.uuid4().hex
+        job = Job(time.monotonic() + reveal_after)
+        if report_progress:
+            kwargs['progress'] = lambda fraction, text=None: setattr(job, 'progress', (fraction, text))
+        with self._lock:
+            self._evict(time.monotonic())
+            self._jobs[job_id] = job
+        job.future = self._executor.submit(func, *args, **kwargs)
+        job.future.add_done_callback(lambda _: setattr(job, 'finished_at', time.monotonic()))
+        return job_id
+
+    def status(self, job_id):
+        """{'state': 'pending' | 'done' | 'failed' | 'unknown', 'result', 'error', 'progress'}."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return {'state': 'unknown', 'result': None, 'error': None, 'progress': None}
+        if not job.future.done() or time.monotonic() < job.reveal_at:
+            return {'state': 'pending', 'result': None, 'error': None, 'progress': job.progress}
+        error = job.future.exception()
+        return {'state': 'failed' if error else 'done', 'result': None if error else job.future.result(),
+                'error': error, 'progress': job.progress}
+
+    def wait(self, job_id, timeout):
+        # Status after at most ``timeout`` seconds; lets fast jobs finish within the submitting rerun
+        job = self._jobs.get(job_id)
+        if job is not None:
+            wait([job.future], timeout)
+        return self.status(job_id)
+
+    def discard(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def _evict(self, now):
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished_at is not None and now - job.finished_at > self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,208 @@
+import heapq
+import threading
+
+import numpy as np
+
+# Recycling tiers by points, highest first
+TIERS = [('gold', 500), ('silver', 200), ('bronze', 0)]
+
+
+def tier_for(points):
+    for tier, threshold in TIERS:
+        if points >= threshold:
+            return tier
+    return TIERS[-1][0]
+
+
+def tier_progress(points):
+    # (next tier or None, fraction of the way from the current tier to it)
+    for i, (tier, threshold) in enumerate(TIERS):
+        if points >= threshold:
+            if i == 0:
+                return None, 1.0
+            next_tier, next_threshold = TIERS[i - 1]
+            return next_tier, (points - threshold) / (next_threshold - threshold)
+    return TIERS[-2][0], 0.0
+
+
+class FenwickTree:
+    """Counts per point value with O(log n) prefix sums and k-th lookups."""
+
+    def __init__(self, counts):
+        counts = np.asarray(counts, dtype=np.int64)
+        self.size = len(counts)
+        # O(n) construction: push each node's total to its parent
+        tree = [0] + counts.tolist()
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                tree[parent] += tree[i]
+        self.tree = tree
+        self.total = int(counts.sum())
+
+    def add(self, value, delta):
+        i = value + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+        self.total += delta
+
+    def prefix(self, value):
+        # Number of entries with value <= ``value``
+        i = min(value + 1, self.size)
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def kth(self, k):
+        # Smallest value v such that prefix(v) >= k (1-based k)
+        pos = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and self.tree[nxt] < k:
+                pos = nxt
+                k -= self.tree[nxt]
+            step >>= 1
+        return pos
+
+
+class TieBucket:
+    """The users on one score, readable in id order.
+
+    Membership is a set and the order a min-heap of ids. Leaving only
+    updates the set; stale heap entries are skipped when read and the heap
+    is rebuilt once they outnumber the members, so joining and leaving cost
+    O(log b) amortised and the first m ids cost O(m log b).
+    """
+
+    __slots__ = ('members', 'heap')
+
+    def __init__(self, user_ids=()):
+        self.members = set(user_ids)
+        self.heap = sorted(self.members)
+
+    def __len__(self):
+        return len(self.members)
+
+    def add(self, user_id):
+        self.members.add(user_id)
+        heapq.heappush(self.heap, user_id)
+
+    def discard(self, user_id):
+        self.members.discard(user_id)
+        if len(self.heap) > 2 * len(self.members) + 16:
+            # A sorted list is a valid heap
+            self.heap = sorted(self.members)
+
+    def first(self, m):
+        # The m lowest ids; popped and pushed back, dropping stale entries on the way
+        found = []
+        while self.heap and len(found) < m:
+            user_id = heapq.heappop(self.heap)
+            if user_id in self.members and (not found or found[-1] != user_id):
+                found.append(user_id)
+        for user_id in found:
+            heapq.heappush(self.heap, user_id)
+        return found
+
+
+class Leaderboard:
+    """City-wide ranking kept current from the points ledger.
+
+    Users are counted per point value in a Fenwick tree, so a user's
+    position and the k-th best score are O(log P) lookups (P = highest
+    score), and each balance change is an O(log P) update. The users on
+    each score are a ``TieBucket``, so ``top`` reads ties in id order
+    without sorting them.
+    """
+
+    def __init__(self, accounts, initial_size=1024):
+        self.accounts = accounts
+        self._lock = threading.Lock()
+        self._points = {}
+        self._buckets = {}
+        self._last_ledger_id = 0
+        self._tree = FenwickTree(np.zeros(initial_size, dtype=np.int64))
+        self.sync()
+
+    def __len__(self):
+        return self._tree.total
+
+    def _ensure_capacity(self, value):
+        if value < self._tree.size:
+            return
+        size = self._tree.size
+        while size <= value:
+            size *= 2
+        counts = np.zeros(size, dtype=np.int64)
+        for points, users in self._buckets.items():
+            counts[points] = len(users)
+        self._tree = FenwickTree(counts)
+
+    def _set(self, user_id, points):
+        points = max(int(points), 0)
+        old = self._points.get(user_id)
+        if old == points:
+            return
+        if old is not None:
+            self._tree.add(old, -1)
+            bucket = self._buckets[old]
+            bucket.discard(user_id)
+            if not bucket:
+                del self._buckets[old]
+        self._ensure_capacity(points)
+        self._tree.add(points, 1)
+        bucket = self._buckets.get(points)
+        if bucket is None:
+            bucket = self._buckets[points] = TieBucket()
+        bucket.add(user_id)
+        self._points[user_id] = points
+
+    def sync(self):
+        # Fold in balance changes written by any worker since the last sync
+        with self._lock:
+            last_id, balances = self.accounts.balances_since(self._last_ledger_id)
+            if not self._points and balances:
+                self._bulk_load(balances)
+            else:
+                for user_id, balance in balances.items():
+                    self._set(user_id, balance)
+            self._last_ledger_id = max(self._last_ledger_id, last_id)
+
+    def _bulk_load(self, balances):
+        self._points = {user_id: max(int(points), 0) for user_id, points in balances.items()}
+        by_points = {}
+        for user_id, points in self._points.items():
+            by_points.setdefault(points, []).append(user_id)
+        self._buckets = {points: TieBucket(user_ids) for points, user_ids in by_points.items()}
+        values = np.fromiter(self._points.values(), dtype=np.int64, count=len(self._points))
+        size = self._tree.size
+        while size <= values.max():
+            size *= 2
+        self._tree = FenwickTree(np.bincount(values, minlength=size))
+
+    def position(self, user_id):
+        # 1-based rank; users with equal points share a position
+        self.sync()
+        with self._lock:
+            points = self._points.get(user_id)
+            if points is None:
+                return None
+            return self._tree.total - self._tree.prefix(points) + 1
+
+    def top(self, n=10):
+        # [(position, user_id, points)] for the best n users
+        self.sync()
+        with self._lock:
+            result = []
+            k = 1
+            while len(result) < n and k <= self._tree.total:
+                value = self._tree.kth(self._tree.total - k + 1)
+                position = self._tree.total - self._tree.prefix(value) + 1
+                users = self._buckets[value]
+                result.extend((position, user_id, value) for user_id in users.first(n - len(result)))
+                k += len(users)
+            return result
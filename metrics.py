@@ -0,0 +1,158 @@
+import json
+import os
+import threading
+import time
+from functools import wraps
+
+import numpy as np
+
+# Histogram bucket bounds in seconds (Prometheus client defaults)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Most recent durations kept per series for percentiles
+WINDOW = 2048
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """Cumulative bucket counts plus a ring buffer of recent durations."""
+
+    def __init__(self, window=WINDOW):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = np.zeros(len(BUCKETS) + 1, dtype=np.int64)
+        self._recent = np.zeros(window, dtype=np.float64)
+
+    def observe(self, seconds):
+        self._recent[self.count % len(self._recent)] = seconds
+        self.buckets[np.searchsorted(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantiles(self):
+        recent = self._recent[:min(self.count, len(self._recent))]
+        if not len(recent):
+            return dict.fromkeys(QUANTILES, 0.0)
+        return dict(zip(QUANTILES, np.quantile(recent, QUANTILES).tolist()))
+
+
+class Timings:
+    """Process-wide durations keyed by (kind, name).
+
+    Kinds used by the app: ``page`` (a full page run), ``fragment`` (a
+    fragment-only rerun), ``loader`` and ``chart`` (cache misses of data
+    loaders and figure builders).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+        self.started = time.time()
+
+    def observe(self, kind, name, seconds):
+        with self._lock:
+            series = self._series.get((kind, name))
+            if series is None:
+                series = self._series[(kind, name)] = Histogram()
+            series.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self.started = time.time()
+
+    def summary(self):
+        # One dict per series, slowest p95 first; durations in milliseconds
+        with self._lock:
+            rows = []
+            for (kind, name), series in self._series.items():
+                q = series.quantiles()
+                rows.append({
+                    'kind': kind, 'name': name, 'count': series.count,
+                    'mean_ms': series.total / series.count * 1000,
+                    'p50_ms': q[0.5] * 1000, 'p95_ms': q[0.95] * 1000, 'p99_ms': q[0.99] * 1000,
+                })
+        return sorted(rows, key=lambda r: r['p95_ms'], reverse=True)
+
+    def to_json(self):
+        return json.dumps({'pid': os.getpid(), 'started': self.started, 'exported': time.time(),
+                           'series': self.summary()}, indent=2)
+
+    def to_prometheus(self):
+        # Text exposition format, e.g. for node_exporter's textfile collector
+        lines = [
+            "# HELP swms_duration_seconds Time spent in pages, fragments, data loaders and chart builds.",
+            "# TYPE swms_duration_seconds histogram",
+        ]
+        quantile_lines = [
+            "# HELP swms_recent_duration_seconds Percentiles over the most recent runs.",
+            "# TYPE swms_recent_duration_seconds summary",
+        ]
+        with self._lock:
+            for (kind, name), series in sorted(self._series.items()):
+                labels = f'kind="{_escape(kind)}",name="{_escape(name)}"'
+                for bound, cumulative in zip(BUCKETS + ('+Inf',), np.cumsum(series.buckets).tolist()):
+                    lines.append(f'swms_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'swms_duration_seconds_sum{{{labels}}} {series.total}')
+                lines.append(f'swms_duration_seconds_count{{{labels}}} {series.count}')
+                for quantile, value in series.quantiles().items():
+                    quantile_lines.append(f'swms_recent_duration_seconds{{{labels},quantile="{quantile}"}} {value}')
+                quantile_lines.append(f'swms_recent_duration_seconds_sum{{{labels}}} {series.total}')
+                quantile_lines.append(f'swms_recent_duration_seconds_count{{{labels}}} {series.count}')
+        return "\n".join(lines + quantile_lines) + "\n"
+
+    def write(self, path):
+        # .prom files get the Prometheus text format, anything else JSON
+        text = self.to_prometheus() if path.endswith('.prom') else self.to_json()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(text)
+        os.replace(tmp, path)
+        return path
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+TIMINGS = Timings()
+
+
+class timed:
+    """Record the duration of a block or of every call to a function.
+
+        with timed('page', 'dashboard'):
+            ...
+
+        @timed('loader')
+        def load_bin_status(): ...
+
+    The duration is recorded even when the block raises, which includes
+    Streamlit's rerun and stop signals.
+    """
+
+    def __init__(self, kind, name=None, registry=None):
+        self.kind = kind
+        self.name = name
+        self.registry = registry or TIMINGS
+        self._started = []
+
+    def __enter__(self):
+        self._started.append(time.perf_counter())
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.kind, self.name, time.perf_counter() - self._started.pop())
+        return False
+
+    def __call__(self, func):
+        kind, name, registry = self.kind, self.name or func.__name__, self.registry
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.observe(kind, name, time.perf_counter() - started)
+        return wrapper
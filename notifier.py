@@ -0,0 +1,259 @@
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+from db import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notification_events (
+    id INTEGER PRIMARY KEY,
+    topic TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    title TEXT NOT NULL,
+    message TEXT NOT NULL,
+    user_id INTEGER REFERENCES users(id),
+    dedup_key TEXT UNIQUE,
+    created_at TEXT NOT NULL,
+    fanout_cursor INTEGER NOT NULL DEFAULT 0,
+    delivered_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_notification_events_pending
+    ON notification_events(id) WHERE delivered_at IS NULL;
+
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    event_id INTEGER NOT NULL REFERENCES notification_events(id) ON DELETE CASCADE,
+    read INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (user_id, event_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications(user_id, id);
+CREATE INDEX IF NOT EXISTS idx_notifications_event ON notifications(event_id);
+
+CREATE TABLE IF NOT EXISTS notification_prefs (
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    topic TEXT NOT NULL,
+    enabled INTEGER NOT NULL,
+    PRIMARY KEY (user_id, topic)
+) WITHOUT ROWID;
+"""
+
+# Subscription topics: (settings label, subscribed by default)
+TOPICS = {
+    'pickup_reminders': ('Pickup Reminders', True),
+    'bin_alerts': ('Bin Full Alerts', True),
+    'points': ('Point Notifications', True),
+    'rewards': ('Reward Alerts', True),
+    'service_requests': ('Service Request Updates', True),
+    'app_updates': ('App Updates', False),
+}
+
+# Users per fan-out transaction, so broadcasts never hold the write lock for long
+FANOUT_BATCH_SIZE = 500
+RETENTION_DAYS = 90
+
+log = logging.getLogger(__name__)
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class NotificationService:
+    """Persistent notification queue with per-user inboxes and subscriptions.
+
+    Broadcasts are queued as events and fanned out to subscribed users by
+    ``deliver_batch`` in batches of user ids, each batch its own
+    transaction. Notifications for a single user skip the queue. An event's
+    text is stored once; inbox rows only reference it.
+    """
+
+    def __init__(self, db=None):
+        self.db = db or Database()
+        self.db.ensure_schema(SCHEMA)
+        # Set when an event is queued, so a worker in this process wakes early
+        self.pending = threading.Event()
+
+    # Subscriptions
+
+    def preferences(self, user_id):
+        with self.db.connection() as conn:
+            rows = conn.execute(
+                "SELECT topic, enabled FROM notification_prefs WHERE user_id = ?", (user_id,)
+            ).fetchall()
+        stored = {row['topic']: bool(row['enabled']) for row in rows}
+        return {topic: stored.get(topic, default) for topic, (_, default) in TOPICS.items()}
+
+    def set_preference(self, user_id, topic, enabled):
+        if topic not in TOPICS:
+            raise ValueError(f"Unknown notification topic: {topic}")
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT INTO notification_prefs (user_id, topic, enabled) VALUES (?, ?, ?) "
+                "ON CONFLICT (user_id, topic) DO UPDATE SET enabled = excluded.enabled",
+                (user_id, topic, int(enabled)),
+            )
+
+    # Producers
+
+    def publish(self, topic, title, message, kind='info', dedup_key=None, user_ids=None):
+        # Queue a broadcast to every subscriber, or deliver it now to the subscribers among
+        # ``user_ids``; an event with a dedup_key already seen is dropped
+        now = _now()
+        with self.db.transaction() as conn:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO notification_events (topic, kind, title, message, dedup_key, created_at, "
+                "delivered_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (topic, kind, title, message, dedup_key, now, None if user_ids is None else now),
+            )
+        if cur.rowcount == 0:
+            return None
+        if user_ids is None:
+            self.pending.set()
+            return cur.lastrowid
+        user_ids = list(user_ids)
+        for start in range(0, len(user_ids), FANOUT_BATCH_SIZE):
+            with self.db.transaction() as conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO notifications (user_id, event_id) SELECT ?, ? WHERE COALESCE("
+                    "(SELECT enabled FROM notification_prefs WHERE user_id = ? AND topic = ?), ?)",
+                    ((user_id, cur.lastrowid, user_id, topic, int(TOPICS[topic][1]))
+                     for user_id in user_ids[start:start + FANOUT_BATCH_SIZE]),
+                )
+        return cur.lastrowid
+
+    def published(self, dedup_key):
+        with self.db.connection() as conn:
+            return conn.execute(
+                "SELECT 1 FROM notification_events WHERE dedup_key = ?", (dedup_key,)
+            ).fetchone() is not None
+
+    def notify(self, user_id, topic, title, message, kind='info'):
+        # Deliver straight to one user's inbox if they are subscribed to the topic
+        now = _now()
+        with self.db.transaction() as conn:
+            cur = conn.execute(
+                "INSERT INTO notification_events (topic, kind, title, message, user_id, created_at, delivered_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (topic, kind, title, message, user_id, now, now),
+            )
+            conn.execute(
+                "INSERT INTO notifications (user_id, event_id) SELECT ?, ? WHERE COALESCE("
+                "(SELECT enabled FROM notification_prefs WHERE user_id = ? AND topic = ?), ?)",
+                (user_id, cur.lastrowid, user_id, topic, int(TOPICS[topic][1])),
+            )
+
+    # Fan-out
+
+    def deliver_batch(self, batch_size=FANOUT_BATCH_SIZE):
+        """Fan the oldest queued event out to the next ``batch_size`` users.
+
+        Returns False once nothing is queued. The event's cursor advances in
+        the same transaction as its inbox rows, so workers in several
+        processes can share the queue without delivering twice.
+        """
+        with self.db.transaction() as conn:
+            event = conn.execute(
+                "SELECT id, topic, fanout_cursor FROM notification_events "
+                "WHERE delivered_at IS NULL ORDER BY id LIMIT 1"
+            ).fetchone()
+            if event is None:
+                return False
+            users = conn.execute(
+                "SELECT COUNT(*), MAX(id) FROM (SELECT id FROM users WHERE id > ? ORDER BY id LIMIT ?)",
+                (event['fanout_cursor'], batch_size),
+            ).fetchone()
+            if users[0]:
+                conn.execute(
+                    "INSERT OR IGNORE INTO notifications (user_id, event_id) "
+                    "SELECT u.id, ? FROM users u LEFT JOIN notification_prefs p ON p.user_id = u.id AND p.topic = ? "
+                    "WHERE u.id > ? AND u.id <= ? AND COALESCE(p.enabled, ?)",
+                    (event['id'], event['topic'], event['fanout_cursor'], users[1], int(TOPICS[event['topic']][1])),
+                )
+            conn.execute(
+                "UPDATE notification_events SET fanout_cursor = COALESCE(?, fanout_cursor), delivered_at = ? "
+                "WHERE id = ?",
+                (users[1], _now() if users[0] < batch_size else None, event['id']),
+            )
+        return True
+
+    def prune(self, days=RETENTION_DAYS):
+        # Drop delivered events older than ``days`` together with their inbox rows
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat(timespec='seconds')
+        with self.db.transaction() as conn:
+            return conn.execute(
+                "DELETE FROM notification_events WHERE delivered_at IS NOT NULL AND created_at < ?", (cutoff,)
+            ).rowcount
+
+    # Inbox
+
+    def inbox(self, user_id, limit=20, before_id=None):
+        # Newest first; pass the last id of a page as ``before_id`` for the next one
+        with self.db.connection() as conn:
+            rows = conn.execute(
+                "SELECT n.id, n.read, e.kind, e.title, e.message, e.created_at "
+                "FROM notifications n JOIN notification_events e ON e.id = n.event_id "
+                "WHERE n.user_id = ? AND n.id < ? ORDER BY n.id DESC LIMIT ?",
+                (user_id, before_id or 2 ** 63 - 1, limit),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def unread_count(self, user_id):
+        with self.db.connection() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM notifications WHERE user_id = ? AND read = 0", (user_id,)
+            ).fetchone()[0]
+
+    def mark_read(self, user_id, up_to_id):
+        with self.db.transaction() as conn:
+            conn.execute(
+                "UPDATE notifications SET read = 1 WHERE user_id = ? AND id <= ? AND read = 0", (user_id, up_to_id)
+            )
+
+    def clear(self, user_id):
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM notifications WHERE user_id = ?", (user_id,))
+
+
+class NotificationWorker(threading.Thread):
+    """Polls event sources and fans queued broadcasts out in batches.
+
+    Each source is a callable returning dicts of ``publish`` arguments; give
+    them a ``dedup_key`` so re-polling does not repeat an event.
+    """
+
+    def __init__(self, service, sources=(), interval=60.0, batch_size=FANOUT_BATCH_SIZE):
+        super().__init__(daemon=True, name='notification-worker')
+        self.service = service
+        self.sources = list(sources)
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop_event = threading.Event()
+        self._last_prune = 0.0
+
+    def stop(self):
+        self._stop_event.set()
+        self.service.pending.set()
+
+    def tick(self, now=None):
+        now = now or datetime.now(timezone.utc).timestamp()
+        for source in self.sources:
+            for event in source():
+                self.service.publish(**event)
+        while self.service.deliver_batch(self.batch_size):
+            pass
+        if now - self._last_prune >= 86400:
+            self._last_prune = now
+            self.service.prune()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.service.pending.clear()
+            try:
+                self.tick()
+            except Exception:
+                # A failing source or a locked database must not stop later deliveries
+                log.exception("Notification worker cycle failed")
+            self.service.pending.wait(self.interval)
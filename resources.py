@@ -0,0 +1,50 @@
+import streamlit as st
+
+from accounts import AccountStore
+from db import Database
+from i18n import Catalog
+from jobs import JobRunner
+from notifier import NotificationService
+from session_store import SessionStore
+
+# Shared resources the app shell and login page need. This module stays free
+# of pandas, plotly and PIL so the login page renders without importing them;
+# everything else lives in data_layer.
+
+
+@st.cache_resource
+def get_database():
+    return Database()
+
+
+@st.cache_resource
+def get_accounts():
+    return AccountStore(get_database())
+
+
+@st.cache_resource
+def get_thumbnail_cache():
+    from thumbnails import ThumbnailCache
+    return ThumbnailCache()
+
+
+@st.cache_resource
+def get_session_store():
+    return SessionStore()
+
+
+@st.cache_resource
+def get_notifications():
+    # After get_accounts(), whose users table the notification tables reference
+    get_accounts()
+    return NotificationService(get_database())
+
+
+@st.cache_resource
+def get_jobs():
+    return JobRunner()
+
+
+@st.cache_resource
+def get_catalog():
+    return Catalog()
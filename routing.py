@@ -0,0 +1,159 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Planning defaults for a dispatch cycle
+AVERAGE_SPEED_KMH = 20.0
+SERVICE_MINUTES_PER_STOP = 2.0
+NEIGHBOR_LIST_SIZE = 16
+
+_PLAN_COLUMNS = ['Truck_ID', 'Stop', 'Bin_ID', 'Lat', 'Lon', 'Load_kg', 'Distance_km', 'ETA_min']
+
+
+def haversine_matrix(lat1, lon1, lat2, lon2):
+    # Great-circle distances (km) between every point of set 1 and set 2
+    lat1, lon1 = np.radians(lat1)[:, None], np.radians(lon1)[:, None]
+    lat2, lon2 = np.radians(lat2)[None, :], np.radians(lon2)[None, :]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return (2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))).astype(np.float32)
+
+
+class DistanceMatrix:
+    """Precomputed distances between depots and bins.
+
+    Nodes ``0..n_depots-1`` are depots, the rest are bins. ``neighbors[i]``
+    lists the closest bins to node ``i`` and acts as the spatial index that
+    bounds the local search.
+    """
+
+    def __init__(self, lats, lons, n_depots, neighbor_list_size=NEIGHBOR_LIST_SIZE):
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        self.n_depots = n_depots
+        self.dist = haversine_matrix(lats, lons, lats, lons)
+        bin_dist = self.dist[:, n_depots:]
+        k = min(neighbor_list_size, bin_dist.shape[1] - 1)
+        if k > 0:
+            nearest = np.argpartition(bin_dist, k, axis=1)[:, :k + 1]
+            order = np.take_along_axis(bin_dist, nearest, axis=1).argsort(axis=1)
+            self.neighbors = np.take_along_axis(nearest, order, axis=1) + n_depots
+        else:
+            self.neighbors = np.empty((len(lats), 0), dtype=np.int64)
+
+
+def _two_opt(dist, route, deadline):
+    # route starts and ends at the depot; reverse segments while any move helps
+    route = np.asarray(route)
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for i in range(1, len(route) - 2):
+            a, b = route[i - 1], route[i]
+            c, d = route[i + 1:-1], route[i + 2:]
+            gain = dist[a, b] + dist[c, d] - dist[a, c] - dist[b, d]
+            j = int(np.argmax(gain))
+            if gain[j] > 1e-6:
+                route[i:i + j + 2] = route[i:i + j + 2][::-1].copy()
+                improved = True
+            if time.perf_counter() >= deadline:
+                break
+    return route
+
+
+def plan_routes(bins, trucks, min_fill=60.0, bin_capacity_kg=120.0,
+                speed_kmh=AVERAGE_SPEED_KMH, service_minutes=SERVICE_MINUTES_PER_STOP,
+                horizon_hours=None, time_budget=0.8):
+    """Plan collection routes for one dispatch cycle.
+
+    ``bins`` needs Bin_ID, Lat, Lon and Fill_Level columns; ``trucks`` needs
+    Truck_ID, Capacity_kg, Depot_Lat and Depot_Lon. Bins at or above
+    ``min_fill`` percent are collected, as are bins whose optional
+    Hours_To_Full forecast is within ``horizon_hours``. Returns one row per stop with the
+    cumulative distance and ETA in minutes from dispatch; bins that did not
+    fit in any truck are returned with an empty Truck_ID.
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget
+    wanted = bins['Fill_Level'] >= min_fill
+    if horizon_hours is not None and 'Hours_To_Full' in bins:
+        wanted |= bins['Hours_To_Full'] <= horizon_hours
+    due = bins[wanted & bins['Lat'].notna() & bins['Lon'].notna()].reset_index(drop=True)
+    n_depots = len(trucks)
+    if due.empty or n_depots == 0:
+        return pd.DataFrame(columns=_PLAN_COLUMNS)
+
+    matrix = DistanceMatrix(
+        np.r_[trucks['Depot_Lat'].to_numpy(), due['Lat'].to_numpy()],
+        np.r_[trucks['Depot_Lon'].to_numpy(), due['Lon'].to_numpy()],
+        n_depots,
+    )
+    dist = matrix.dist
+    demand = np.r_[np.zeros(n_depots), due['Fill_Level'].to_numpy() / 100.0 * bin_capacity_kg]
+    unvisited = np.r_[np.zeros(n_depots, dtype=bool), np.ones(len(due), dtype=bool)]
+
+    # Construction: each truck greedily takes the nearest bin that still fits,
+    # preferring its neighbor list and falling back to a full masked scan
+    routes = []
+    for depot, capacity in enumerate(trucks['Capacity_kg'].to_numpy(dtype=np.float64)):
+        route, load, current = [depot], 0.0, depot
+        while True:
+            fits = unvisited & (demand <= capacity - load)
+            candidates = matrix.neighbors[current]
+            candidates = candidates[fits[candidates]]
+            if len(candidates):
+                nxt = int(candidates[0])
+            else:
+                if not fits.any():
+                    break
+                nxt = int(np.where(fits, dist[current], np.inf).argmin())
+            route.append(nxt)
+            unvisited[nxt] = False
+            load += demand[nxt]
+            current = nxt
+        route.append(depot)
+        routes.append(route)
+
+    # Improvement: 2-opt within each route, sharing the remaining time budget
+    routes = [_two_opt(dist, r, deadline) if len(r) > 4 else np.asarray(r) for r in routes]
+
+    truck_col, stop_col, node_col, km_col, eta_col = [], [], [], [], []
+    for truck_id, route in zip(trucks['Truck_ID'], routes):
+        stops = route[1:-1]
+        cumulative = np.cumsum(dist[route[:-1], route[1:]])[:-1]
+        truck_col.append(np.full(len(stops), truck_id, dtype=object))
+        stop_col.append(np.arange(1, len(stops) + 1))
+        node_col.append(stops)
+        km_col.append(cumulative)
+        eta_col.append(cumulative / speed_kmh * 60 + service_minutes * np.arange(len(stops)))
+    missed = np.flatnonzero(unvisited)
+    truck_col.append(np.full(len(missed), '', dtype=object))
+    stop_col.append(np.zeros(len(missed), dtype=np.int64))
+    node_col.append(missed)
+    km_col.append(np.full(len(missed), np.nan))
+    eta_col.append(np.full(len(missed), np.nan))
+
+    nodes = np.concatenate(node_col).astype(np.int64)
+    picked = due.iloc[nodes - n_depots]
+    return pd.DataFrame({
+        'Truck_ID': np.concatenate(truck_col),
+        'Stop': np.concatenate(stop_col),
+        'Bin_ID': picked['Bin_ID'].to_numpy(),
+        'Lat': picked['Lat'].to_numpy(),
+        'Lon': picked['Lon'].to_numpy(),
+        'Load_kg': demand[nodes],
+        'Distance_km': np.concatenate(km_col),
+        'ETA_min': np.concatenate(eta_col),
+    })
+
+
+def route_summary(plan, trucks):
+    # Per-truck stop count, load, route distance and ETA to the first stop
+    assigned = plan[plan['Truck_ID'] != '']
+    summary = assigned.groupby('Truck_ID').agg(
+        Stops=('Stop', 'max'), Load_kg=('Load_kg', 'sum'),
+        Route_km=('Distance_km', 'max'), Next_ETA_min=('ETA_min', 'min'),
+    )
+    return summary.reindex(trucks['Truck_ID']).fillna({'Stops': 0, 'Load_kg': 0.0}).reset_index()
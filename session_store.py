@@ -0,0 +1,152 @@
+import os
+import pickle
+import shutil
+import threading
+import time
+from collections import deque
+
+from config import DATA_DIR
+
+# Longest list kept per session for each key; older entries drop off
+LIST_LIMITS = {
+    'chat_history': 50,
+}
+DEFAULT_LIST_LIMIT = 100
+# Sessions unseen for this long lose their lists and blobs
+IDLE_TTL_SECONDS = 30 * 60
+SWEEP_INTERVAL_SECONDS = 60
+
+
+class SessionStore:
+    """Per-session data kept outside ``st.session_state``.
+
+    Lists are bounded deques, large values are written as files under
+    ``<root>/<session id>/``, and sessions idle for ``idle_ttl`` seconds
+    are evicted. Keeping this data here rather than in each session's state
+    bounds what a connected but idle browser tab costs the server.
+    """
+
+    def __init__(self, root=None, idle_ttl=IDLE_TTL_SECONDS, limits=None):
+        self.root = root or os.path.join(DATA_DIR, 'sessions')
+        self.idle_ttl = idle_ttl
+        self.limits = dict(LIST_LIMITS, **(limits or {}))
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._lists = {}
+        self._last_seen = {}
+        self._last_sweep = 0.0
+
+    def session(self, session_id):
+        self.touch(session_id)
+        return SessionData(self, session_id)
+
+    def touch(self, session_id, now=None):
+        now = now or time.time()
+        with self._lock:
+            self._last_seen[session_id] = now
+            sweep = now - self._last_sweep >= SWEEP_INTERVAL_SECONDS
+            if sweep:
+                self._last_sweep = now
+        if sweep:
+            self.evict_idle(now)
+
+    def append(self, session_id, key, item):
+        with self._lock:
+            self._last_seen[session_id] = time.time()
+            lists = self._lists.setdefault(session_id, {})
+            if key not in lists:
+                lists[key] = deque(maxlen=self.limits.get(key, DEFAULT_LIST_LIMIT))
+            lists[key].append(item)
+
+    def items(self, session_id, key):
+        with self._lock:
+            return list(self._lists.get(session_id, {}).get(key, ()))
+
+    def clear(self, session_id, key):
+        with self._lock:
+            self._lists.get(session_id, {}).pop(key, None)
+
+    def blob_path(self, session_id, name):
+        return os.path.join(self.root, session_id, name)
+
+    def put_blob(self, session_id, name, data):
+        path = self.blob_path(session_id, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return path
+
+    def get_blob(self, session_id, name):
+        try:
+            with open(self.blob_path(session_id, name), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def evict_idle(self, now=None):
+        # Drop lists of idle sessions and blob directories untouched for idle_ttl
+        cutoff = (now or time.time()) - self.idle_ttl
+        with self._lock:
+            idle = [sid for sid, seen in self._last_seen.items() if seen < cutoff]
+            for session_id in idle:
+                del self._last_seen[session_id]
+                self._lists.pop(session_id, None)
+            active = set(self._last_seen)
+        # Blob directories of other app workers are removed once they go idle too
+        for entry in os.scandir(self.root):
+            if entry.is_dir() and entry.name not in active and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        return len(idle)
+
+    def usage(self):
+        # Approximate footprint per session: pickled list size in memory, blob bytes on disk
+        with self._lock:
+            sessions = {sid: (seen, {k: list(v) for k, v in self._lists.get(sid, {}).items()})
+                        for sid, seen in self._last_seen.items()}
+        now = time.time()
+        rows = []
+        for session_id, (seen, lists) in sessions.items():
+            blob_dir = os.path.join(self.root, session_id)
+            blobs = sum(e.stat().st_size for e in os.scandir(blob_dir)) if os.path.isdir(blob_dir) else 0
+            rows.append({
+                'session': session_id, 'idle_s': now - seen,
+                'items': sum(len(v) for v in lists.values()),
+                'memory_bytes': len(pickle.dumps(lists)), 'disk_bytes': blobs,
+            })
+        return sorted(rows, key=lambda r: r['memory_bytes'] + r['disk_bytes'], reverse=True)
+
+
+class SessionData:
+    """A SessionStore bound to one session id."""
+
+    def __init__(self, store, session_id):
+        self.store = store
+        self.session_id = session_id
+
+    def append(self, key, item):
+        self.store.append(self.session_id, key, item)
+
+    def items(self, key):
+        return self.store.items(self.session_id, key)
+
+    def clear(self, key):
+        self.store.clear(self.session_id, key)
+
+    def put_blob(self, name, data):
+        return self.store.put_blob(self.session_id, name, data)
+
+    def get_blob(self, name):
+        return self.store.get_blob(self.session_id, name)
+
+
+def state_size(state):
+    # Approximate bytes per session_state key; values that cannot be pickled report None
+    sizes = {}
+    for key in list(state.keys()):
+        try:
+            sizes[str(key)] = len(pickle.dumps(state[key]))
+        except Exception:
+            sizes[str(key)] = None
+    return sizes
@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Modules read their data locations at import; keep the suite away from the real data directory
+os.environ['SWMS_DATA_DIR'] = tempfile.mkdtemp(prefix='swms-tests-')
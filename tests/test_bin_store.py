@@ -0,0 +1,32 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from bin_store import SECONDS_PER_DAY, BinStore, to_epoch
+
+EPOCH = 1_700_000_000
+
+
+def test_to_epoch_accepts_ints_floats_and_datetimes():
+    assert to_epoch(EPOCH) == EPOCH
+    assert to_epoch(np.int64(EPOCH)) == EPOCH
+    assert to_epoch(EPOCH + 0.75) == EPOCH
+    assert to_epoch(np.float64(EPOCH + 0.75)) == EPOCH
+    assert to_epoch(datetime.fromtimestamp(EPOCH, timezone.utc)) == EPOCH
+    assert to_epoch(datetime.fromtimestamp(EPOCH, timezone.utc).replace(tzinfo=None)) == EPOCH
+    assert to_epoch(pd.Timestamp(EPOCH, unit='s', tz='UTC')) == EPOCH
+
+
+def test_float_timestamps_land_in_their_day(tmp_path):
+    store = BinStore(str(tmp_path))
+    store.register_bins([{'bin_id': 'BIN001', 'location': 'Test'}])
+    now = time.time()
+    store.append(['BIN001'], [42.0], timestamps=[now])
+    assert store.partitions() == [datetime.fromtimestamp(now, timezone.utc).strftime('%Y-%m-%d')]
+
+    rows = store.readings(now - SECONDS_PER_DAY)
+    assert rows['ts'].tolist() == [int(now)]
+    assert store.readings(now + 1)['ts'].size == 0
+    assert store.readings(datetime.now(timezone.utc) - timedelta(days=1))['ts'].tolist() == [int(now)]
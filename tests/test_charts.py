@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from charts import lttb_indices, minmax_indices, point_budget, prepare_series
+
+
+def reference_lttb(x, y, target):
+    # The textbook loop, one bucket and one candidate at a time, over the same bucket edges
+    n = len(x)
+    edges = np.linspace(1, n - 1, target - 1).astype(np.int64)
+    picked, a = [0], 0
+    for i in range(target - 2):
+        if i + 1 < target - 2:
+            following = range(edges[i + 1], edges[i + 2])
+            avg_x = sum(x[j] for j in following) / len(following)
+            avg_y = sum(y[j] for j in following) / len(following)
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        best, best_area = None, -1.0
+        for j in range(edges[i], edges[i + 1]):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        picked.append(best)
+        a = best
+    return picked + [n - 1]
+
+
+def reference_minmax(y, target):
+    edges = np.linspace(0, len(y), target // 2 + 1).astype(np.int64)
+    keep = set()
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        bucket = list(y[lo:hi])
+        keep.add(lo + bucket.index(min(bucket)))
+        keep.add(lo + bucket.index(max(bucket)))
+    return sorted(keep)
+
+
+def test_lttb_matches_the_reference_loop():
+    rng = np.random.default_rng(1)
+    for n, target in [(10, 3), (101, 10), (1000, 37), (5000, 600), (777, 776)]:
+        x = np.sort(rng.uniform(0, 1e6, n))
+        y = np.cumsum(rng.normal(0, 1, n))
+        picked = lttb_indices(x, y, target)
+        assert picked.tolist() == reference_lttb(x.tolist(), y.tolist(), target)
+        assert len(picked) == target and (np.diff(picked) > 0).all()
+
+
+def test_lttb_returns_every_point_when_nothing_to_drop():
+    assert lttb_indices(np.arange(5), np.arange(5), 5).tolist() == list(range(5))
+    assert lttb_indices(np.arange(5), np.arange(5), 50).tolist() == list(range(5))
+    assert lttb_indices(np.arange(5), np.arange(5), 2).tolist() == list(range(5))
+
+
+def test_minmax_matches_the_reference_loop():
+    rng = np.random.default_rng(2)
+    for n, target in [(10, 4), (101, 10), (1000, 37), (2160, 600)]:
+        y = rng.normal(0, 1, n)
+        y[rng.integers(0, n, 3)] = [50.0, -50.0, 40.0]
+        picked = minmax_indices(y, target)
+        assert picked.tolist() == reference_minmax(y.tolist(), target)
+        assert len(picked) <= target
+        assert y[picked].max() == y.max() and y[picked].min() == y.min()
+
+
+def test_point_budget_plots_short_ranges_in_full():
+    hour, day = timedelta(hours=1), timedelta(days=1)
+    assert point_budget(7 * day, hour) == 168
+    assert point_budget(90 * day, hour) == 600
+    assert point_budget(90 * day, hour, width_px=400) == 200
+    assert point_budget(30 * day, day) == 30
+
+
+def test_prepare_series_keeps_hourly_peaks():
+    stamps = pd.date_range('2026-01-01', periods=24 * 90, freq='h')
+    values = np.full(len(stamps), 100.0)
+    values[1234] = 900.0
+    frame = pd.DataFrame({'Time': stamps[::-1], 'Organic': values[::-1], 'Hazardous': values[::-1] / 10})
+    series = prepare_series(frame, 'Time', ['Organic', 'Hazardous'], 600, method='minmax')
+    assert list(series.columns) == ['Time', 'Series', 'Value']
+    organic = series[series['Series'] == 'Organic']
+    assert len(organic) <= 600 and organic['Time'].is_monotonic_increasing
+    assert organic.loc[organic['Value'].idxmax(), 'Time'] == stamps[1234]
+    assert series[series['Series'] == 'Hazardous']['Value'].max() == 90.0
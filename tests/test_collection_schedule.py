@@ -0,0 +1,116 @@
+import os
+import random
+from datetime import date, datetime, time, timedelta
+
+from collection_schedule import DAYS, CollectionSchedule, IntervalIndex, Pickup, WardCalendar
+from data_layer import schedule_table
+from db import Database
+
+MONDAY = date(2026, 3, 2)
+
+
+def make_schedule(tmp_path):
+    return CollectionSchedule(Database(os.path.join(tmp_path, 'schedule.db')))
+
+
+def test_schedule_table_has_a_column_for_every_collected_waste_type(tmp_path):
+    schedule = make_schedule(tmp_path)
+    schedule.add_rule('Vadva', 'Organic', ['Monday'], '07:00', valid_from=MONDAY)
+    schedule.add_rule('Vadva', 'E-waste', ['Wednesday'], '10:30', valid_from=MONDAY)
+    schedule.add_rule('Vadva', 'Garden', ['Wednesday'], '12:00', valid_from=MONDAY)
+
+    table = schedule_table(schedule.pickups('Vadva', MONDAY, MONDAY + timedelta(days=6)), MONDAY, days=7)
+    assert list(table.columns[-2:]) == ['E-waste', 'Garden']
+    wednesday = table[table['Day'] == 'Wednesday'].iloc[0]
+    assert wednesday['E-waste'] == '10:30 AM'
+    assert wednesday['Garden'] != 'Off'
+    assert table[table['Day'] == 'Monday'].iloc[0]['Organic'] != 'Off'
+    assert (table['Recyclable'] == 'Off').all()
+
+
+def test_interval_index_matches_a_full_scan():
+    rng = random.Random(8)
+    intervals = []
+    for value in range(300):
+        start = rng.randrange(1000)
+        # Mostly short intervals and a few long ones, like rules retired or open-ended
+        length = rng.randrange(1000) if rng.random() < 0.1 else rng.randrange(20)
+        intervals.append((start, start + length, value))
+    index = IntervalIndex(intervals)
+    assert len(index) == len(intervals)
+    in_start_order = sorted(intervals, key=lambda interval: interval[0])
+    for _ in range(300):
+        start = rng.randrange(-50, 1100)
+        end = start + rng.randrange(30)
+        assert index.overlapping(start, end) == [value for lo, hi, value in in_start_order
+                                                 if lo <= end and hi >= start]
+    assert IntervalIndex([]).overlapping(0, 10) == []
+
+
+def test_holidays_shift_or_cancel_pickups_and_exceptions_apply(tmp_path):
+    schedule = make_schedule(tmp_path)
+    schedule.add_rule('Vadva', 'Organic', ['Monday', 'Wednesday'], '08:00', valid_from=MONDAY)
+    schedule.add_rule('Vadva', 'Hazardous', ['Monday'], '14:00', every_weeks=2, valid_from=MONDAY)
+    schedule.add_rule('Chitra', 'Organic', ['Monday'], '09:00', valid_from=MONDAY)
+    schedule.add_holiday(MONDAY, 'Festival', shift_days=1)
+    schedule.add_holiday(MONDAY + timedelta(days=2), 'Ward fair', ward='Vadva')
+    schedule.cancel_pickup('Vadva', 'Organic', MONDAY + timedelta(days=9))
+    schedule.add_extra_pickup('Vadva', 'Garden', MONDAY + timedelta(days=10), '11:00', note='Tree trimming')
+
+    pickups = schedule.pickups('Vadva', MONDAY, MONDAY + timedelta(days=15))
+    # Monday moved to Tuesday, the ward's Wednesday holiday and the cancelled Wednesday dropped
+    assert [(p.date - MONDAY).days for p in pickups] == [1, 1, 7, 10, 14, 14]
+    tuesday = [p for p in pickups if p.date == MONDAY + timedelta(days=1)]
+    assert [(p.waste_type, p.note) for p in tuesday] == [('Organic', 'moved from 02/03 for Festival'),
+                                                         ('Hazardous', 'moved from 02/03 for Festival')]
+    assert [p.waste_type for p in pickups if p.date == MONDAY + timedelta(days=7)] == ['Organic']
+    assert [p.waste_type for p in pickups if p.date == MONDAY + timedelta(days=10)] == ['Garden']
+    assert [p.waste_type for p in pickups if p.date == MONDAY + timedelta(days=14)] == ['Organic', 'Hazardous']
+    # The ward holiday leaves the neighbouring ward alone; the city-wide one moves it too
+    assert [p.date for p in schedule.pickups('Chitra', MONDAY, MONDAY + timedelta(days=7))] == \
+        [MONDAY + timedelta(days=1), MONDAY + timedelta(days=7)]
+    # A pickup pushed into the range from a day before it is still listed
+    assert [p.waste_type for p in schedule.pickups('Vadva', MONDAY + timedelta(days=1),
+                                                   MONDAY + timedelta(days=1))] == ['Organic', 'Hazardous']
+
+
+def test_ward_calendar_jump_table_matches_bisection():
+    rng = random.Random(9)
+    start = MONDAY
+    pickups = sorted(Pickup(start + timedelta(days=rng.randrange(30)), rng.randrange(1440), 'Organic', '')
+                     for _ in range(80))
+    calendar = WardCalendar(start, 30, pickups)
+    for d in range(31):
+        assert calendar.first[d] == next((i for i, p in enumerate(pickups)
+                                          if p.date >= start + timedelta(days=d)), len(pickups))
+    for d in range(30):
+        day = start + timedelta(days=d)
+        assert calendar.on(day) == [p for p in pickups if p.date == day]
+        for minute in (0, 600, 1439):
+            now = datetime.combine(day, time(minute // 60, minute % 60))
+            assert calendar.next_pickup(now) == next(
+                (p for p in pickups if (p.date, p.minute) >= (day, minute)), None)
+
+
+def test_next_pickup_matches_the_expanded_rules(tmp_path):
+    schedule = make_schedule(tmp_path)
+    today = date.today()
+    rng = random.Random(10)
+    for waste_type in ('Organic', 'Recyclable', 'Hazardous'):
+        days = rng.sample(DAYS, rng.randint(1, 3))
+        schedule.add_rule('Vadva', waste_type, days, f"{rng.randrange(6, 18):02d}:{rng.choice(['00', '30'])}",
+                          every_weeks=rng.choice([1, 2]), valid_from=today - timedelta(days=20))
+    schedule.add_holiday(today + timedelta(days=3), 'Festival', shift_days=1)
+    schedule.add_holiday(today + timedelta(days=11), 'Strike')
+
+    expanded = schedule.pickups('Vadva', today, today + timedelta(days=90))
+    for offset in list(range(0, 28)) + [45, 70]:
+        for hour in (0, 9, 15, 23):
+            now = datetime.combine(today + timedelta(days=offset), time(hour))
+            minute = hour * 60
+            expected = next((p for p in expanded if (p.date, p.minute) >= (now.date(), minute)), None)
+            assert schedule.next_pickup('Vadva', now) == expected
+            kind = expected.waste_type if expected else 'Organic'
+            assert schedule.next_pickup('Vadva', now, waste_type=kind) == next(
+                (p for p in expanded if p.waste_type == kind and (p.date, p.minute) >= (now.date(), minute)), None)
+    assert schedule.next_pickup('Nowhere') is None
@@ -0,0 +1,80 @@
+import math
+
+import numpy as np
+import pytest
+
+from geo import EARTH_RADIUS_KM, GridIndex, WardMap
+
+
+def planar_km(lats, lons, lat, lon):
+    # The index's own projection: a plane tangent at the points' mean latitude
+    y_scale = math.radians(1) * EARTH_RADIUS_KM
+    x_scale = y_scale * math.cos(math.radians(np.mean(lats)))
+    return np.hypot((np.asarray(lons) - lon) * x_scale, (np.asarray(lats) - lat) * y_scale)
+
+
+def brute_nearest(lats, lons, lat, lon, k, max_km=math.inf):
+    distances = planar_km(lats, lons, lat, lon)
+    order = np.argsort(distances, kind='stable')[:k]
+    return [(int(i), float(distances[i])) for i in order if distances[i] <= max_km]
+
+
+def brute_within(lats, lons, lat, lon, radius_km):
+    distances = planar_km(lats, lons, lat, lon)
+    order = np.argsort(distances, kind='stable')
+    return [(int(i), float(distances[i])) for i in order if distances[i] <= radius_km]
+
+
+def assert_same(found, expected):
+    assert [i for i, _ in found] == [i for i, _ in expected]
+    assert [d for _, d in found] == pytest.approx([d for _, d in expected])
+
+
+@pytest.mark.parametrize('spread', [0.05, 0.002])
+def test_grid_index_matches_brute_force(spread):
+    # City-wide points, then a tight cluster that hits the minimum cell size
+    rng = np.random.default_rng(4)
+    lats = 21.76 + rng.uniform(-spread, spread, 500)
+    lons = 72.15 + rng.uniform(-spread, spread, 500)
+    index = GridIndex(lats, lons)
+    queries = [(21.76 + dy, 72.15 + dx) for dy, dx in rng.uniform(-2 * spread, 2 * spread, (40, 2))]
+    queries += [(22.5, 73.0), (21.0, 72.15)]
+    for lat, lon in queries:
+        for k in (1, 5, 600):
+            assert_same(index.nearest(lat, lon, k), brute_nearest(lats, lons, lat, lon, k))
+        assert_same(index.nearest(lat, lon, 5, max_km=1.0), brute_nearest(lats, lons, lat, lon, 5, 1.0))
+        for radius in (0.1, 0.5, 3.0):
+            assert_same(index.within(lat, lon, radius), brute_within(lats, lons, lat, lon, radius))
+
+
+def test_empty_grid_index_finds_nothing():
+    index = GridIndex([], [])
+    assert len(index) == 0
+    assert index.nearest(21.76, 72.15, 3) == []
+    assert index.within(21.76, 72.15, 5.0) == []
+
+
+def square(south, west, north, east):
+    return [[west, south], [east, south], [east, north], [west, north], [west, south]]
+
+
+def test_ward_map_honours_holes_and_multipolygons():
+    wards = {
+        # A ward with a second ward enclaved in its middle
+        'Outer': {'type': 'Polygon', 'coordinates': [square(21.70, 72.10, 21.80, 72.20),
+                                                     square(21.74, 72.14, 21.76, 72.16)]},
+        'Enclave': {'type': 'Polygon', 'coordinates': [square(21.74, 72.14, 21.76, 72.16)]},
+        'Islands': {'type': 'MultiPolygon', 'coordinates': [[square(21.70, 72.30, 21.72, 72.32)],
+                                                            [square(21.78, 72.30, 21.80, 72.32)]]},
+    }
+    ward_map = WardMap(wards)
+    assert len(ward_map) == 3
+    assert ward_map.ward_at(21.75, 72.15) == 'Enclave'
+    assert ward_map.ward_at(21.72, 72.12) == 'Outer'
+    assert ward_map.ward_at(21.75, 72.17) == 'Outer'
+    assert ward_map.ward_at(21.71, 72.31) == 'Islands'
+    assert ward_map.ward_at(21.79, 72.31) == 'Islands'
+    assert ward_map.ward_at(21.75, 72.31) is None
+    assert ward_map.ward_at(21.90, 72.15) is None
+    assert ward_map.centre('Outer') == pytest.approx((21.75, 72.15))
+    assert ward_map.centre('Nowhere') is None
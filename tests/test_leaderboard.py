@@ -0,0 +1,82 @@
+import os
+import random
+
+import numpy as np
+
+import accounts as accounts_module
+from accounts import SIGNUP_BONUS, AccountStore
+from db import Database
+from leaderboard import FenwickTree, Leaderboard, TieBucket
+
+
+def make_accounts(tmp_path, monkeypatch, users):
+    # Password hashing is irrelevant here and dominates registration time
+    monkeypatch.setattr(accounts_module, 'PBKDF2_ITERATIONS', 1)
+    accounts = AccountStore(Database(os.path.join(tmp_path, 'accounts.db')))
+    ids = [accounts.register(f"User {i}", f"user{i}@example.com", '', '', 'pw') for i in range(users)]
+    return accounts, ids
+
+
+def expected_top(balances, n):
+    ranked = sorted(balances.items(), key=lambda item: (-item[1], item[0]))[:n]
+    return [(expected_position(balances, user_id), user_id, points) for user_id, points in ranked]
+
+
+def expected_position(balances, user_id):
+    return 1 + sum(points > balances[user_id] for points in balances.values())
+
+
+def test_fenwick_prefix_and_kth_match_a_running_sum():
+    rng = np.random.default_rng(3)
+    counts = rng.integers(0, 4, 100)
+    tree = FenwickTree(counts)
+    for value, delta in zip(rng.integers(0, 100, 200), rng.integers(0, 3, 200)):
+        tree.add(int(value), int(delta))
+        counts[value] += delta
+    running = np.cumsum(counts)
+    assert tree.total == running[-1]
+    assert [tree.prefix(v) for v in range(100)] == running.tolist()
+    for k in range(1, tree.total + 1):
+        assert tree.kth(k) == int(np.searchsorted(running, k))
+
+
+def test_tie_bucket_reads_members_in_id_order_after_churn():
+    rng = random.Random(5)
+    bucket, members = TieBucket(), set()
+    for _ in range(2000):
+        user_id = rng.randrange(100)
+        if rng.random() < 0.5:
+            bucket.add(user_id)
+            members.add(user_id)
+        else:
+            bucket.discard(user_id)
+            members.discard(user_id)
+        assert len(bucket) == len(members)
+        assert bucket.first(7) == sorted(members)[:7]
+
+
+def test_positions_and_top_match_a_full_sort(tmp_path, monkeypatch):
+    accounts, ids = make_accounts(tmp_path, monkeypatch, 60)
+    rng = random.Random(11)
+    # Few distinct scores so most users share a position
+    for user_id in ids:
+        accounts.add_points(user_id, rng.choice([0, 5, 10, 20]), "Recycling quiz")
+    board = Leaderboard(accounts, initial_size=16)
+
+    for round_ in range(5):
+        balances = {user_id: accounts.balance(user_id) for user_id in ids}
+        for n in (1, 10, 25, len(ids)):
+            assert board.top(n) == expected_top(balances, n)
+        assert {user_id: board.position(user_id) for user_id in ids} == \
+            {user_id: expected_position(balances, user_id) for user_id in ids}
+
+        # Balance changes in both directions, some past the tree's initial capacity
+        for user_id in rng.sample(ids, 15):
+            delta = rng.choice([-SIGNUP_BONUS, -5, 5, 50, 2000])
+            if delta < 0:
+                accounts.redeem(user_id, min(-delta, accounts.balance(user_id)), "Redeemed Test")
+            else:
+                accounts.add_points(user_id, delta, "Recycling quiz")
+
+    assert len(board) == len(ids)
+    assert board.position(-1) is None
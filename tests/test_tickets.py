@@ -0,0 +1,114 @@
+import os
+import random
+
+import pytest
+
+from db import Database
+from tickets import DEDUP_WINDOW_HOURS, ESCALATE_EVERY, KINDS, STATUSES, TicketStore
+
+NOW = 1_780_000_000
+USERS = 40
+
+
+def make_store(tmp_path):
+    db = Database(os.path.join(tmp_path, 'tickets.db'))
+    # Reporters reference users; the accounts schema itself is not under test
+    db.ensure_schema("CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY);")
+    with db.transaction() as conn:
+        conn.executemany("INSERT INTO users (id) VALUES (?)", [(i,) for i in range(1, USERS + 1)])
+    return TicketStore(db)
+
+
+def all_tickets(store):
+    with store.db.connection() as conn:
+        return [dict(row) for row in conn.execute("SELECT * FROM tickets")]
+
+
+def walk(store, limit, **filters):
+    tickets, cursor, pages = [], None, 0
+    while True:
+        page, cursor = store.page(after=cursor, limit=limit, **filters)
+        assert len(page) <= limit
+        tickets += page
+        pages += 1
+        if cursor is None:
+            return tickets, pages
+
+
+def test_keyset_pages_match_the_full_ordered_query(tmp_path):
+    store = make_store(tmp_path)
+    rng = random.Random(12)
+    wards = ['Vadva', 'Chitra', 'Bortalav']
+    for i in range(200):
+        kind = rng.choice(list(KINDS))
+        bin_id = f"BIN{rng.randrange(40):03d}" if KINDS[kind][2] else None
+        ticket_id, _ = store.report(kind, rng.randint(1, USERS), rng.choice(wards), bin_id, now=NOW + i)
+        if rng.random() < 0.3:
+            store.set_status(ticket_id, rng.choice(list(STATUSES)), now=NOW + i)
+
+    everything = all_tickets(store)
+    for status in STATUSES:
+        for ward in (None, *wards):
+            for priority in (None, 1, 2, 3):
+                expected = sorted((t for t in everything if t['status'] == status
+                                   and ward in (None, t['ward']) and priority in (None, t['priority'])),
+                                  key=lambda t: (t['priority'], t['id']))
+                for limit in (1, 7, 500):
+                    tickets, pages = walk(store, limit, status=status, ward=ward, priority=priority)
+                    assert tickets == expected
+                    assert pages == max(1, -(-len(expected) // limit))
+
+
+def test_repeat_reports_merge_and_escalate(tmp_path):
+    store = make_store(tmp_path)
+    first, opened = store.report('missed_pickup', 1, 'Vadva', 'BIN001', now=NOW)
+    assert opened
+    start = KINDS['missed_pickup'][1]
+    for user_id in range(2, 9):
+        ticket_id, opened = store.report('missed_pickup', user_id, 'Vadva', 'BIN001',
+                                         description=f"report {user_id}", now=NOW + user_id)
+        assert (ticket_id, opened) == (first, False)
+        assert store.get(first)['priority'] == max(1, start - user_id // ESCALATE_EVERY)
+    # The same reporter again neither counts nor escalates
+    store.report('missed_pickup', 8, 'Vadva', 'BIN001', now=NOW + 9)
+    ticket = store.get(first)
+    assert ticket['reports'] == 8 and ticket['priority'] == 1
+    assert ticket['description'] == 'report 2'
+    assert store.report_count() == 8
+
+    # Another kind, another bin, and tickets without a bin are kept apart by reporter
+    assert store.report('damaged_bin', 1, 'Vadva', 'BIN001', now=NOW)[1]
+    assert store.report('missed_pickup', 1, 'Vadva', 'BIN002', now=NOW)[1]
+    service, _ = store.report('service', 1, 'Vadva', now=NOW)
+    assert store.report('service', 1, 'Vadva', now=NOW + 60) == (service, False)
+    assert store.report('service', 2, 'Vadva', now=NOW + 60)[1]
+
+    # Past the window, or once resolved, a report opens a fresh ticket
+    later = NOW + DEDUP_WINDOW_HOURS * 3600 + 1
+    assert store.report('service', 1, 'Vadva', now=later)[1]
+    assert sorted(store.set_status(first, 'resolved', now=NOW + 100)) == list(range(1, 9))
+    assert store.get(first)['resolved_at'] == NOW + 100
+    assert store.report('missed_pickup', 3, 'Vadva', 'BIN001', now=NOW + 200)[1]
+
+
+def test_escalation_matches_a_count_of_distinct_reporters(tmp_path):
+    store = make_store(tmp_path)
+    rng = random.Random(13)
+    for i in range(300):
+        store.report('bin_overflow' if rng.random() < 0.5 else 'missed_pickup', rng.randint(1, 15), 'Vadva',
+                     f"BIN{rng.randrange(5):03d}", now=NOW + i)
+    for ticket in all_tickets(store):
+        with store.db.connection() as conn:
+            distinct = conn.execute("SELECT COUNT(*) FROM ticket_reporters WHERE ticket_id = ?",
+                                    (ticket['id'],)).fetchone()[0]
+        assert ticket['reports'] == distinct
+        assert ticket['priority'] == max(1, KINDS[ticket['kind']][1] - distinct // ESCALATE_EVERY)
+
+
+def test_unknown_kind_and_status_are_rejected(tmp_path):
+    store = make_store(tmp_path)
+    with pytest.raises(ValueError):
+        store.report('graffiti', 1, 'Vadva')
+    ticket_id, _ = store.report('service', 1, 'Vadva', now=NOW)
+    with pytest.raises(ValueError):
+        store.set_status(ticket_id, 'closed')
@@ -0,0 +1,139 @@
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+from config import DATA_DIR
+
+# Longest-edge sizes produced for every upload
+DISPLAY_SIZE = 800
+AVATAR_SIZE = 200
+MODEL_SIZE = 224
+VARIANT_SIZES = (DISPLAY_SIZE, AVATAR_SIZE, MODEL_SIZE)
+# Disk budget; past it the least recently used files are deleted down to PRUNE_TO of it
+MAX_CACHE_BYTES = 512 * 2**20
+PRUNE_TO = 0.8
+
+
+class ThumbnailCache:
+    """Content-addressed store of downscaled uploads.
+
+    Every upload is decoded once and written at each size in
+    ``VARIANT_SIZES`` as ``<root>/<aa>/<sha256>_<size>.jpg``; later requests
+    for the same bytes are answered from disk without decoding again.
+    Different uploads are decoded in parallel; only requests for the same
+    bytes wait for each other. A hit refreshes the file's mtime, and once
+    the cache outgrows ``max_bytes`` the files unused the longest go first.
+    """
+
+    def __init__(self, root=None, sizes=VARIANT_SIZES, max_bytes=MAX_CACHE_BYTES):
+        self.root = root or os.path.join(DATA_DIR, 'thumbnails')
+        self.sizes = tuple(sizes)
+        self.max_bytes = max_bytes
+        os.makedirs(self.root, exist_ok=True)
+        # Guards the per-digest lock table and the size total
+        self._lock = threading.Lock()
+        self._digest_locks = {}
+        self._pruning = threading.Lock()
+        self._bytes = sum(size for _, size, _ in self._files())
+
+    def path(self, digest, size):
+        return os.path.join(self.root, digest[:2], f"{digest}_{size}.jpg")
+
+    def get(self, data, size):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest, size)
+        try:
+            os.utime(path)
+            return path
+        except FileNotFoundError:
+            pass
+        with self._digest_lock(digest):
+            if not os.path.exists(path):
+                written = self._write_variants(data, digest, set(self.sizes) | {size})
+                with self._lock:
+                    self._bytes += written
+                    over = self._bytes > self.max_bytes
+                if over:
+                    self.prune()
+        return path
+
+    @contextmanager
+    def _digest_lock(self, digest):
+        # One lock per digest being written, dropped once nobody waits on it
+        with self._lock:
+            lock, users = self._digest_locks.get(digest, (None, 0))
+            lock = lock or threading.Lock()
+            self._digest_locks[digest] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                users = self._digest_locks[digest][1] - 1
+                if users:
+                    self._digest_locks[digest] = (lock, users)
+                else:
+                    del self._digest_locks[digest]
+
+    def _files(self):
+        # (mtime, bytes, path) of every cached file
+        for shard in os.scandir(self.root):
+            if shard.is_dir():
+                for entry in os.scandir(shard.path):
+                    if entry.name.endswith('.jpg'):
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        yield stat.st_mtime, stat.st_size, entry.path
+
+    def prune(self, target=None):
+        """Delete the least recently used files until the cache fits ``target`` bytes.
+
+        Defaults to PRUNE_TO of ``max_bytes``; returns the bytes freed. A
+        prune already running in another thread makes this a no-op.
+        """
+        if not self._pruning.acquire(blocking=False):
+            return 0
+        try:
+            target = self.max_bytes * PRUNE_TO if target is None else target
+            files = sorted(self._files())
+            total = sum(size for _, size, _ in files)
+            freed = 0
+            for _, size, path in files:
+                if total - freed <= target:
+                    break
+                try:
+                    os.remove(path)
+                    freed += size
+                except FileNotFoundError:
+                    pass
+            with self._lock:
+                self._bytes = total - freed
+            return freed
+        finally:
+            self._pruning.release()
+
+    def _write_variants(self, data, digest, sizes):
+        image = Image.open(BytesIO(data))
+        # JPEG decodes at 1/2, 1/4 or 1/8 scale when that still covers the largest size
+        largest = max(sizes)
+        image.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        os.makedirs(os.path.dirname(self.path(digest, largest)), exist_ok=True)
+        written = 0
+        for size in sorted(sizes, reverse=True):
+            # Each variant is reduced from the previous, larger one
+            image.thumbnail((size, size), Image.LANCZOS, reducing_gap=3.0)
+            target = self.path(digest, size)
+            tmp = f"{target}.{os.getpid()}.tmp"
+            image.save(tmp, 'JPEG', quality=85, optimize=True)
+            written += os.path.getsize(tmp)
+            os.replace(tmp, target)
+        return written
@@ -0,0 +1,168 @@
+import time
+
+from db import Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'open',
+    priority INTEGER NOT NULL,
+    ward TEXT NOT NULL,
+    bin_id TEXT,
+    dedup_key TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    reports INTEGER NOT NULL DEFAULT 1,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    resolved_at INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_tickets_queue ON tickets(status, priority, id);
+CREATE INDEX IF NOT EXISTS idx_tickets_ward ON tickets(ward, status, priority, id);
+CREATE INDEX IF NOT EXISTS idx_tickets_dedup ON tickets(dedup_key, kind, created_at);
+
+CREATE TABLE IF NOT EXISTS ticket_reporters (
+    ticket_id INTEGER NOT NULL REFERENCES tickets(id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL REFERENCES users(id),
+    reported_at INTEGER NOT NULL,
+    PRIMARY KEY (ticket_id, user_id)
+) WITHOUT ROWID;
+"""
+
+# Ticket kinds: (label, starting priority, filed against a bin)
+KINDS = {
+    'missed_pickup': ('Missed Pickup', 2, True),
+    'service': ('Additional Service', 3, False),
+    'bin_overflow': ('Bin Overflow', 1, True),
+    'damaged_bin': ('Damaged Bin', 2, True),
+}
+PRIORITIES = {1: 'High', 2: 'Normal', 3: 'Low'}
+STATUSES = {'open': 'Open', 'in_progress': 'In Progress', 'resolved': 'Resolved'}
+ACTIVE_STATUSES = ('open', 'in_progress')
+
+# Repeat reports of the same bin (or by the same user, for tickets without a
+# bin) within this window add to the unresolved ticket instead of opening one
+DEDUP_WINDOW_HOURS = 24
+# Every this many reporters on one ticket raise its priority a step
+ESCALATE_EVERY = 3
+PAGE_SIZE = 25
+
+
+class TicketStore:
+    """Missed-pickup and service tickets with an indexed work queue.
+
+    Tickets are ordered by priority and then age. ``page`` reads that order
+    through the status (or ward and status) index with a keyset cursor, so
+    paging costs the same however many resolved tickets have piled up.
+    Reports of a bin that already has an unresolved ticket from the last
+    ``DEDUP_WINDOW_HOURS`` are merged into it, and each merged reporter is
+    remembered so all of them hear when it is resolved.
+    """
+
+    def __init__(self, db=None):
+        self.db = db or Database()
+        self.db.ensure_schema(SCHEMA)
+
+    def report(self, kind, user_id, ward, bin_id=None, description='', now=None):
+        """File a report; returns (ticket id, True if a new ticket was opened)."""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown ticket kind: {kind}")
+        now = int(now or time.time())
+        dedup_key = f"bin:{bin_id}" if bin_id else f"user:{user_id}"
+        with self.db.transaction() as conn:
+            existing = conn.execute(
+                "SELECT id, priority, reports FROM tickets WHERE dedup_key = ? AND kind = ? AND created_at >= ? "
+                "AND status IN ('open', 'in_progress') ORDER BY id DESC LIMIT 1",
+                (dedup_key, kind, now - DEDUP_WINDOW_HOURS * 3600),
+            ).fetchone()
+            if existing is None:
+                ticket_id = conn.execute(
+                    "INSERT INTO tickets (kind, priority, ward, bin_id, dedup_key, description, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (kind, KINDS[kind][1], ward, bin_id, dedup_key, description, now, now),
+                ).lastrowid
+                conn.execute("INSERT INTO ticket_reporters (ticket_id, user_id, reported_at) VALUES (?, ?, ?)",
+                             (ticket_id, user_id, now))
+                return ticket_id, True
+
+            ticket_id = existing['id']
+            added = conn.execute(
+                "INSERT OR IGNORE INTO ticket_reporters (ticket_id, user_id, reported_at) VALUES (?, ?, ?)",
+                (ticket_id, user_id, now),
+            ).rowcount
+            if added:
+                reports = existing['reports'] + 1
+                priority = max(1, existing['priority'] - (reports % ESCALATE_EVERY == 0))
+                conn.execute(
+                    "UPDATE tickets SET reports = ?, priority = ?, updated_at = ?, "
+                    "description = CASE WHEN description = '' THEN ? ELSE description END WHERE id = ?",
+                    (reports, priority, now, description, ticket_id),
+                )
+            return ticket_id, False
+
+    def set_status(self, ticket_id, status, now=None):
+        # Returns the ids of everyone who reported the ticket
+        if status not in STATUSES:
+            raise ValueError(f"Unknown ticket status: {status}")
+        now = int(now or time.time())
+        with self.db.transaction() as conn:
+            conn.execute(
+                "UPDATE tickets SET status = ?, updated_at = ?, resolved_at = ? WHERE id = ?",
+                (status, now, now if status == 'resolved' else None, ticket_id),
+            )
+            rows = conn.execute("SELECT user_id FROM ticket_reporters WHERE ticket_id = ?", (ticket_id,)).fetchall()
+        return [row[0] for row in rows]
+
+    def get(self, ticket_id):
+        with self.db.connection() as conn:
+            row = conn.execute("SELECT * FROM tickets WHERE id = ?", (ticket_id,)).fetchone()
+        return dict(row) if row else None
+
+    def page(self, status, ward=None, priority=None, after=None, limit=PAGE_SIZE):
+        """One page of tickets in queue order (priority, then oldest first).
+
+        ``after`` is the ``(priority, id)`` of the last ticket of the
+        previous page. Returns (tickets, cursor for the next page or None).
+        """
+        clauses, params = ["status = ?"], [status]
+        if ward is not None:
+            clauses.append("ward = ?")
+            params.append(ward)
+        if priority is not None:
+            clauses.append("priority = ?")
+            params.append(priority)
+        # The rest of the cursor's priority, then the priorities after it: two index range scans,
+        # where a single (priority, id) row-value comparison would only seek on priority
+        if after is None:
+            ranges = [([], [])]
+        else:
+            ranges = [(["priority = ?", "id > ?"], list(after))]
+            if priority is None:
+                ranges.append((["priority > ?"], [after[0]]))
+        rows = []
+        with self.db.connection() as conn:
+            for extra_clauses, extra_params in ranges:
+                rows += conn.execute(
+                    f"SELECT * FROM tickets WHERE {' AND '.join(clauses + extra_clauses)} "
+                    "ORDER BY priority, id LIMIT ?",
+                    (*params, *extra_params, limit + 1 - len(rows)),
+                ).fetchall()
+                if len(rows) > limit:
+                    break
+        tickets = [dict(r) for r in rows[:limit]]
+        cursor = (tickets[-1]['priority'], tickets[-1]['id']) if len(rows) > limit else None
+        return tickets, cursor
+
+    def report_count(self):
+        # Every report filed, including those merged into an existing ticket
+        with self.db.connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM ticket_reporters").fetchone()[0]
+
+    def active_counts(self, ward=None):
+        # {status: count} over the unresolved statuses; resolved history is never counted
+        with self.db.connection() as conn:
+            return {status: conn.execute(
+                "SELECT COUNT(*) FROM tickets WHERE status = ?" + (" AND ward = ?" if ward else ""),
+                (status, ward) if ward else (status,),
+            ).fetchone()[0] for status in ACTIVE_STATUSES}
@@ -0,0 +1,217 @@
+import os
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from leaderboard import tier_for
+from metrics import timed
+from resources import get_accounts, get_catalog, get_jobs, get_notifications, get_session_store, get_thumbnail_cache
+
+# Thumbnail paths remembered per session; older uploads are looked up again
+MAX_SESSION_THUMBNAILS = 16
+# How often the browser asks whether a background job has finished
+JOB_POLL_SECONDS = 0.5
+
+
+def init_session_state():
+    if 'logged_in' not in st.session_state:
+        st.session_state.logged_in = False
+    if 'user_data' not in st.session_state:
+        st.session_state.user_data = {}
+    if 'theme' not in st.session_state:
+        st.session_state.theme = 'light'
+    if 'language' not in st.session_state:
+        st.session_state.language = 'English'
+    if 'user_points' not in st.session_state:
+        st.session_state.user_points = 0
+    if 'recycling_rank' not in st.session_state:
+        st.session_state.recycling_rank = 'bronze'
+
+
+# Custom CSS for modern UI
+def load_css():
+    st.markdown("""
+    <style>
+    .main-header {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 2rem;
+        border-radius: 10px;
+        text-align: center;
+        margin-bottom: 2rem;
+        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+    }
+
+    .metric-card {
+        background: white;
+        padding: 1.5rem;
+        border-radius: 10px;
+        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        text-align: center;
+        margin-bottom: 1rem;
+        border-left: 4px solid #667eea;
+    }
+
+    .rank-badge {
+        display: inline-block;
+        padding: 0.5rem 1rem;
+        border-radius: 20px;
+        font-weight: bold;
+        color: white;
+        margin: 0.5rem;
+    }
+
+    .bronze { background: linear-gradient(45deg, #CD7F32, #A0522D); }
+    .silver { background: linear-gradient(45deg, #C0C0C0, #808080); }
+    .gold { background: linear-gradient(45deg, #FFD700, #FFA500); }
+
+    .game-card {
+        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 10px;
+        text-align: center;
+        margin: 1rem 0;
+        cursor: pointer;
+        transition: transform 0.3s ease;
+    }
+
+    .game-card:hover {
+        transform: translateY(-5px);
+    }
+
+    .notification-item {
+        background: #f8f9fa;
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 0.5rem 0;
+        border-left: 4px solid #28a745;
+    }
+
+    .truck-marker {
+        background: #28a745;
+        color: white;
+        padding: 0.5rem;
+        border-radius: 50%;
+        font-size: 1.2rem;
+    }
+
+    .bin-status {
+        display: inline-block;
+        width: 20px;
+        height: 20px;
+        border-radius: 50%;
+        margin-right: 0.5rem;
+    }
+
+    .bin-empty { background: #28a745; }
+    .bin-half { background: #ffc107; }
+    .bin-full { background: #dc3545; }
+
+    .chatbot-container {
+        background: #f8f9fa;
+        border-radius: 10px;
+        padding: 1rem;
+        margin: 1rem 0;
+    }
+
+    .reward-coupon {
+        background: linear-gradient(135deg, #ff9a9e 0%, #fecfef 100%);
+        color: #333;
+        padding: 1.5rem;
+        border-radius: 10px;
+        text-align: center;
+        margin: 1rem 0;
+        border: 2px dashed #ff6b6b;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+
+def translations():
+    # The current language's messages; hold on to it when looking up many keys in one run
+    return get_catalog().translations(st.session_state.language)
+
+
+def get_text(key):
+    return translations()[key]
+
+
+def create_header():
+    st.markdown(f"""
+    <div class="main-header">
+        <h1>🗑️ {get_text('title')}</h1>
+        <p>{get_text('subtitle')}</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+def upload_thumbnail(uploaded_file, size):
+    # Path of the downscaled upload; remembered per file so reruns skip hashing,
+    # unless the cache has since pruned the file
+    if 'thumbnails' not in st.session_state:
+        st.session_state.thumbnails = {}
+    key = (uploaded_file.file_id, size)
+    thumbnails = st.session_state.thumbnails
+    if key not in thumbnails or not os.path.exists(thumbnails[key]):
+        thumbnails[key] = get_thumbnail_cache().get(uploaded_file.getvalue(), size)
+        while len(thumbnails) > MAX_SESSION_THUMBNAILS:
+            del thumbnails[next(iter(thumbnails))]
+    return thumbnails[key]
+
+
+def session_data():
+    # Capped lists and on-disk blobs of the current session, kept outside session_state
+    ctx = get_script_run_ctx()
+    return get_session_store().session(ctx.session_id if ctx else 'bare')
+
+
+def set_user_points(points):
+    st.session_state.user_points = points
+    st.session_state.recycling_rank = tier_for(points)
+
+
+def credit_points(user_id, points, reason):
+    # Touches no session state, so background jobs can call it too; returns the new balance
+    balance = get_accounts().add_points(user_id, points, reason)
+    get_notifications().notify(user_id, 'points', "Points Earned", f"+{points} points for {reason}", kind='success')
+    return balance
+
+
+def award_points(points, reason):
+    # Credit the signed-in user's ledger and refresh the cached balance
+    set_user_points(credit_points(st.session_state.user_data['id'], points, reason))
+
+
+def job_status(state_key, text, wait=0.0):
+    """Status of the background job whose id is in ``st.session_state[state_key]``.
+
+    Returns None when there is no job, or the runner no longer knows it (a
+    finished job evicted after JOB_TTL_SECONDS, or a server restart). While
+    it is pending, a fragment polls it every JOB_POLL_SECONDS and reruns the
+    page once it finishes; a finished job's status is returned once and then
+    forgotten. ``wait`` gives fast jobs that long to finish within this
+    rerun. Call it from page code rather than from inside a fragment.
+    """
+    job_id = st.session_state.get(state_key)
+    if job_id is None:
+        return None
+    status = get_jobs().wait(job_id, wait) if wait else get_jobs().status(job_id)
+    if status['state'] == 'pending':
+        st.fragment(job_progress, run_every=JOB_POLL_SECONDS)(job_id, text)
+    else:
+        del st.session_state[state_key]
+        get_jobs().discard(job_id)
+    return None if status['state'] == 'unknown' else status
+
+
+@timed('fragment')
+def job_progress(job_id, text):
+    status = get_jobs().status(job_id)
+    if status['state'] != 'pending':
+        st.rerun()
+    fraction, label = status['progress'] or (None, None)
+    if fraction is None:
+        st.info(f"⏳ {text}")
+    else:
+        st.progress(fraction, text=label or text)